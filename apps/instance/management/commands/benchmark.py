@@ -0,0 +1,60 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import json
+
+from django.core.management import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from apps.instance.utils.benchmark import Benchmark
+
+
+class Command(BaseCommand):
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, default=2)
+        parser.add_argument('--stores', type=int, default=2)
+        parser.add_argument('--tables', type=int, default=50)
+        parser.add_argument('--fields', type=int, default=10)
+        parser.add_argument('--fk-density', type=float, default=0.1)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', type=Path, default=Path('benchmark.json'))
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_database_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            with TemporaryDirectory() as tmp_dir:
+                stash_file_path = Path(tmp_dir, 'stash.json')
+                with stash_file_path.open(mode='w') as json_file:
+                    json.dump({}, json_file)
+
+                media_dirs = {
+                    'RELATION_TABLE_SNAPSHOTS_DIR': Path(tmp_dir, 'relation_table'),
+                    'RELATION_TABLE_LAYOUTS_DIR': Path(tmp_dir, 'relation_table_layout'),
+                    'RELATION_TABLE_LOAD_ORDERS_DIR': Path(tmp_dir, 'relation_table_load_order'),
+                    'RELATION_TABLE_GRAPHS_DIR': Path(tmp_dir, 'relation_table_graph'),
+                }
+                for media_dir in media_dirs.values():
+                    media_dir.mkdir()
+
+                with override_settings(MEDIA_ROOT=tmp_dir, STASH_FILE_PATH=stash_file_path, **media_dirs):
+                    benchmark = Benchmark(
+                        projects=options['projects'],
+                        stores=options['stores'],
+                        tables=options['tables'],
+                        fields=options['fields'],
+                        fk_density=options['fk_density'],
+                        repeat=options['repeat'],
+                        seed=options['seed'],
+                    )
+                    report = benchmark.dump(path=options['output'])
+        finally:
+            connection.creation.destroy_test_db(old_database_name, verbosity=0)
+            teardown_test_environment()
+
+        for name, result in report['results'].items():
+            self.stdout.write(f'{name}: median {result["median_ms"]} ms, max {result["max_ms"]} ms')
+
+        self.stdout.write(f'results saved to {options["output"]}')
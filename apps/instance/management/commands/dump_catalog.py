@@ -0,0 +1,18 @@
+from pathlib import Path
+
+from django.core.management import BaseCommand
+
+from apps.instance.utils.catalog_dump import dump_catalog
+
+
+class Command(BaseCommand):
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', type=Path)
+
+    def handle(self, *args, **options):
+        counts = dump_catalog(path=options['path'])
+        for table_name, rows in counts.items():
+            self.stdout.write(f'{table_name}: {rows} rows')
+
+        self.stdout.write(f'catalog saved to {options["path"]}')
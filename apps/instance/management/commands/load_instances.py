@@ -1,17 +1,105 @@
+from io import StringIO
 from pathlib import Path
+import cProfile
 import json
+import pstats
 
 from django.conf import settings
-from django.core.management import BaseCommand
+from django.core.management import BaseCommand, CommandError
 
 from apps.instance.utils.instance_processor import InstanceProcessor
+from apps.instance.utils.processor_hooks import WriterProcessorHook
+from apps.instance.utils.schema_diff import SchemaDiff
+from apps.instance.utils.sharded_import import ShardedImport
+from scripts.django_models import load_django_models, parse_django_models, sync_django_models
 
 
 class Command(BaseCommand):
 
+    def add_arguments(self, parser):
+        parser.add_argument('--sync', action='store_true', help='apply only the difference with the current catalog')
+        parser.add_argument('--validate', action='store_true', help='report every error without executing')
+        parser.add_argument('--profile', action='store_true', help='report phase timings and a cProfile summary')
+        parser.add_argument('--profile-limit', type=int, default=30, help='number of cProfile rows to print')
+        parser.add_argument('--profile-output', type=Path, help='save raw cProfile stats to this file')
+        parser.add_argument('--workers', type=int, help='import independent projects and stores in parallel')
+        parser.add_argument(
+            '--django-models',
+            nargs=2,
+            metavar=('PROJECT', 'STORE'),
+            help='stream the models of this django project instead of operations.json',
+        )
+
     def handle(self, *args, **options):
+        if options['django_models']:
+            self._handle_django_models(*options['django_models'], **options)
+            return
+
         with Path(settings.BASE_DIR, 'operations.json').open() as json_file:
             data = json.load(json_file)
 
-        processor = InstanceProcessor()
-        processor.process(operations=data['operations'])
+        operations = data['operations']
+        if options['sync']:
+            schema_diff = SchemaDiff(operations=operations)
+            if schema_diff.errors:
+                self._report_errors(errors=schema_diff.errors, operations_count=len(operations))
+
+            operations = schema_diff.get_operations()
+
+        hooks = [WriterProcessorHook(write=self.stdout.write)] if options['profile'] else None
+        if options['workers']:
+            processor = ShardedImport(workers=options['workers'])
+        else:
+            processor = InstanceProcessor(hooks=hooks)
+
+        if options['validate']:
+            self._report_errors(errors=processor.validate(operations=operations), operations_count=len(operations))
+            return
+
+        self._run(processor.process, options=options, operations=operations)
+
+    def _run(self, func, options: dict, **kwargs) -> None:
+        if not options['profile']:
+            func(**kwargs)
+            return
+
+        profiler = cProfile.Profile()
+        profiler.runcall(func, **kwargs)
+        if options['profile_output']:
+            profiler.dump_stats(options['profile_output'])
+
+        stream = StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(options['profile_limit'])
+        self.stdout.write(stream.getvalue())
+
+    def _handle_django_models(self, project_name: str, store_name: str, **options):
+        workers = options['workers']
+        if options['validate']:
+            operations = parse_django_models(project_name=project_name, store_name=store_name, workers=workers)
+            self._report_errors(
+                errors=InstanceProcessor().validate(operations=operations),
+                operations_count=len(operations),
+            )
+            return
+
+        hooks = [WriterProcessorHook(write=self.stdout.write)] if options['profile'] else None
+        self._run(
+            sync_django_models if options['sync'] else load_django_models,
+            options=options,
+            project_name=project_name,
+            store_name=store_name,
+            workers=workers,
+            hooks=hooks,
+        )
+
+    def _report_errors(self, errors: list[dict], operations_count: int) -> None:
+        for error in errors:
+            caused_by = f', caused_by: {error["caused_by"]}' if error['caused_by'] else ''
+            self.stderr.write(
+                f'operation_order: {error["order"]}, model: {error["model"]}, message: {error["message"]}{caused_by}',
+            )
+
+        if errors:
+            raise CommandError(f'{len(errors)} invalid operations')
+
+        self.stdout.write(f'{operations_count} operations are valid')
@@ -0,0 +1,22 @@
+from pathlib import Path
+
+from django.core.management import BaseCommand, CommandError
+
+from apps.instance.utils.catalog_dump import CatalogDumpError, restore_catalog
+
+
+class Command(BaseCommand):
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', type=Path)
+
+    def handle(self, *args, **options):
+        try:
+            counts = restore_catalog(path=options['path'])
+        except CatalogDumpError as e:
+            raise CommandError(str(e))
+
+        for table_name, rows in counts.items():
+            self.stdout.write(f'{table_name}: {rows} rows')
+
+        self.stdout.write(f'catalog restored from {options["path"]}')
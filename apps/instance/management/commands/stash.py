@@ -18,11 +18,16 @@ class Command(BaseCommand):
                 need_actual_stash_file = True
 
         if need_actual_stash_file:
+            from apps.instance.models import RelationTableGraph
             from apps.instance.utils.graph import RelationTableGraphUtil
 
+            graphs = RelationTableGraphUtil.get_actual_graphs()
+            if not RelationTableGraph.objects.exists():
+                RelationTableGraphUtil.save_graphs(graphs=graphs)
+
             with settings.STASH_FILE_PATH.open(mode='w') as json_file:
                 stash_file_data = {
-                    'relation_table_graphs': [list(graph) for graph in RelationTableGraphUtil.get_actual_graphs()],
+                    'relation_table_graphs': [list(graph) for graph in graphs],
                     'is_actual': True,
                 }
                 json.dump(stash_file_data, json_file)
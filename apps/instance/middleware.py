@@ -0,0 +1,33 @@
+from time import perf_counter
+
+from django.db import connection
+
+from apps.instance.utils.metrics import RENDER_TIMING, RequestTimings, current_timings, metrics_registry, timing
+
+
+class InstrumentationMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        started = perf_counter()
+        try:
+            with connection.execute_wrapper(timings.execute_wrapper):
+                response = self.get_response(request)
+        finally:
+            current_timings.reset(token)
+
+        total = perf_counter() - started
+        view = request.resolver_match.view_name if request.resolver_match else 'unresolved'
+        metrics_registry.observe(view=view, timings=timings, total=total)
+        response['Server-Timing'] = timings.server_timing(total=total)
+        return response
+
+    def process_template_response(self, request, response):
+        with timing(name=RENDER_TIMING):
+            response.render()
+
+        return response
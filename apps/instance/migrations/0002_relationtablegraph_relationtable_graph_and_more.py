@@ -0,0 +1,81 @@
+# Generated by Django 5.1.15 on 2026-10-19 16:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_graphs(apps):
+    RelationTable = apps.get_model('instance', 'RelationTable')
+    RelationTableField = apps.get_model('instance', 'RelationTableField')
+
+    parents = {table_id: table_id for table_id in RelationTable.objects.values_list('id', flat=True)}
+
+    def find(table_id):
+        while table_id != parents[table_id]:
+            parents[table_id] = parents[parents[table_id]]
+            table_id = parents[table_id]
+
+        return table_id
+
+    for source_table_id, destination_table_id in RelationTableField.objects.filter(field__isnull=False).values_list(
+        'relation_table_id',
+        'field__relation_table_id',
+    ):
+        parents[find(destination_table_id)] = find(source_table_id)
+
+    graphs = {}
+    for table_id in parents:
+        graphs.setdefault(find(table_id), set()).add(table_id)
+
+    return list(graphs.values())
+
+
+def move_snapshots_to_graphs(apps, schema_editor):
+    RelationTable = apps.get_model('instance', 'RelationTable')
+    RelationTableGraph = apps.get_model('instance', 'RelationTableGraph')
+
+    snapshots = dict(RelationTable.objects.filter(snapshot__isnull=False).values_list('id', 'snapshot'))
+    for graph in build_graphs(apps):
+        graph_snapshots = [snapshots[table_id] for table_id in graph if table_id in snapshots]
+        snapshot = max(set(graph_snapshots), key=graph_snapshots.count) if graph_snapshots else None
+        graph_row = RelationTableGraph.objects.create(snapshot=snapshot)
+        RelationTable.objects.bulk_update(
+            [RelationTable(id=table_id, graph_id=graph_row.id) for table_id in graph],
+            fields=['graph'],
+            batch_size=1000,
+        )
+
+
+def move_snapshots_to_tables(apps, schema_editor):
+    RelationTable = apps.get_model('instance', 'RelationTable')
+    RelationTableGraph = apps.get_model('instance', 'RelationTableGraph')
+
+    for graph_id, snapshot in RelationTableGraph.objects.filter(snapshot__isnull=False).values_list('id', 'snapshot'):
+        RelationTable.objects.filter(graph_id=graph_id).update(snapshot=snapshot)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('instance', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelationTableGraph',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('snapshot', models.FilePathField(blank=True, null=True, path='D:\\projects\\docs_flow_backend\\media\\snapshots\\relation_table')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='relationtable',
+            name='graph',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='instance.relationtablegraph'),
+        ),
+        migrations.RunPython(move_snapshots_to_graphs, move_snapshots_to_tables),
+        migrations.RemoveField(
+            model_name='relationtable',
+            name='snapshot',
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.1.15 on 2026-10-19 16:16
+
+from pathlib import Path
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def record_current_snapshots(apps, schema_editor):
+    RelationTableGraph = apps.get_model('instance', 'RelationTableGraph')
+    RelationTableGraphSnapshot = apps.get_model('instance', 'RelationTableGraphSnapshot')
+
+    RelationTableGraphSnapshot.objects.bulk_create(
+        [
+            RelationTableGraphSnapshot(graph_id=graph_id, hash=Path(snapshot).stem)
+            for graph_id, snapshot in RelationTableGraph.objects.filter(snapshot__isnull=False).values_list(
+                'id',
+                'snapshot',
+            )
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('instance', '0002_relationtablegraph_relationtable_graph_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelationTableGraphSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hash', models.CharField(db_index=True, max_length=32)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('graph', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='instance.relationtablegraph')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['graph', '-created_at'], name='graph_snapshot_created_at')],
+            },
+        ),
+        migrations.RunPython(record_current_snapshots, migrations.RunPython.noop),
+    ]
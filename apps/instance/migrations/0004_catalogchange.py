@@ -0,0 +1,24 @@
+# Generated by Django 5.1.15 on 2026-10-19 17:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('instance', '0003_relationtablegraphsnapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('action', models.CharField(choices=[('create', 'create'), ('delete', 'delete'), ('update', 'update'), ('sync', 'sync')], max_length=16)),
+                ('model', models.CharField(max_length=32)),
+                ('name', models.CharField(blank=True, default='', max_length=1024)),
+                ('object_id', models.BigIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
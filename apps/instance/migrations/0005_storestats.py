@@ -0,0 +1,62 @@
+# Generated by Django 5.1.15 on 2026-10-19 18:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def seed_store_stats(apps, schema_editor):
+    Store = apps.get_model('instance', 'Store')
+    StoreStats = apps.get_model('instance', 'StoreStats')
+    RelationTable = apps.get_model('instance', 'RelationTable')
+    RelationTableField = apps.get_model('instance', 'RelationTableField')
+
+    stats = {store_id: StoreStats(store_id=store_id) for store_id in Store.objects.values_list('id', flat=True)}
+    for store_id, tables_count in (
+        RelationTable.objects.values('store_id')
+        .annotate(tables_count=Count('id'))
+        .values_list('store_id', 'tables_count')
+    ):
+        stats[store_id].tables_count = tables_count
+
+    for store_id, fields_count, fk_count in (
+        RelationTableField.objects.values('relation_table__store_id')
+        .annotate(fields_count=Count('id'), fk_count=Count('field_id'))
+        .values_list('relation_table__store_id', 'fields_count', 'fk_count')
+    ):
+        stats[store_id].fields_count = fields_count
+        stats[store_id].fk_count = fk_count
+
+    graphs = {}
+    for relation_table_id, store_id, graph_id in RelationTable.objects.values_list('id', 'store_id', 'graph_id'):
+        graphs.setdefault(graph_id or f'table-{relation_table_id}', []).append(store_id)
+
+    for graph_store_ids in graphs.values():
+        for store_id in set(graph_store_ids):
+            stats[store_id].components_count += 1
+            stats[store_id].largest_component_size = max(stats[store_id].largest_component_size, len(graph_store_ids))
+
+    StoreStats.objects.bulk_create(stats.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('instance', '0004_catalogchange'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoreStats',
+            fields=[
+                ('store', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to='instance.store')),
+                ('tables_count', models.IntegerField(default=0)),
+                ('fields_count', models.IntegerField(default=0)),
+                ('fk_count', models.IntegerField(default=0)),
+                ('components_count', models.IntegerField(default=0)),
+                ('largest_component_size', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(seed_store_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.15 on 2026-10-19 19:20
+
+from django.db import migrations, models
+from django.db.models import F, Max
+
+
+def seed_catalog_version(apps, schema_editor):
+    CatalogChange = apps.get_model('instance', 'CatalogChange')
+    CatalogVersion = apps.get_model('instance', 'CatalogVersion')
+
+    CatalogChange.objects.update(version=F('id'))
+    CatalogVersion.objects.create(id=1, version=CatalogChange.objects.aggregate(version=Max('id'))['version'] or 0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('instance', '0005_storestats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='catalogchange',
+            name='version',
+            field=models.BigIntegerField(null=True),
+        ),
+        migrations.RunPython(seed_catalog_version, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='catalogchange',
+            name='version',
+            field=models.BigIntegerField(unique=True),
+        ),
+    ]
@@ -33,14 +33,41 @@ class Store(models.Model):
         return self.name
 
 
-class RelationTable(models.Model):
+class RelationTableGraph(models.Model):
 
-    name = models.CharField(max_length=128)
     snapshot = models.FilePathField(
         path=str(Path(settings.MEDIA_ROOT, 'snapshots', 'relation_table')),
         blank=True,
         null=True,
     )
+
+    def __str__(self):
+        return str(self.id)
+
+
+class RelationTableGraphSnapshot(models.Model):
+
+    graph = models.ForeignKey(RelationTableGraph, on_delete=models.CASCADE)
+    hash = models.CharField(max_length=32, db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['graph', '-created_at'], name='graph_snapshot_created_at'),
+        ]
+
+    def __str__(self):
+        return self.hash
+
+    @property
+    def snapshot(self) -> str:
+        return str(Path(settings.RELATION_TABLE_SNAPSHOTS_DIR, f'{self.hash}.json'))
+
+
+class RelationTable(models.Model):
+
+    name = models.CharField(max_length=128)
+    graph = models.ForeignKey(RelationTableGraph, on_delete=models.SET_NULL, blank=True, null=True)
     store = models.ForeignKey(Store, on_delete=models.CASCADE)
 
     class Meta:
@@ -51,6 +78,10 @@ class RelationTable(models.Model):
     def __str__(self):
         return self.name
 
+    @property
+    def snapshot(self) -> str | None:
+        return self.graph.snapshot if self.graph_id else None
+
 
 class RelationTableField(models.Model):
 
@@ -70,3 +101,50 @@ class RelationTableField(models.Model):
 
     def __str__(self):
         return self.name
+
+
+class CatalogChange(models.Model):
+
+    CREATE_ACTION = 'create'
+    DELETE_ACTION = 'delete'
+    UPDATE_ACTION = 'update'
+    SYNC_ACTION = 'sync'
+
+    ACTIONS = (
+        (CREATE_ACTION, CREATE_ACTION),
+        (DELETE_ACTION, DELETE_ACTION),
+        (UPDATE_ACTION, UPDATE_ACTION),
+        (SYNC_ACTION, SYNC_ACTION),
+    )
+
+    version = models.BigIntegerField(unique=True)
+    action = models.CharField(max_length=16, choices=ACTIONS)
+    model = models.CharField(max_length=32)
+    name = models.CharField(max_length=1024, blank=True, default='')
+    object_id = models.BigIntegerField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'{self.version}: {self.action} {self.model} {self.name}'
+
+
+class CatalogVersion(models.Model):
+
+    version = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return str(self.version)
+
+
+class StoreStats(models.Model):
+
+    store = models.OneToOneField(Store, on_delete=models.CASCADE, primary_key=True)
+    tables_count = models.IntegerField(default=0)
+    fields_count = models.IntegerField(default=0)
+    fk_count = models.IntegerField(default=0)
+    components_count = models.IntegerField(default=0)
+    largest_component_size = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return str(self.store_id)
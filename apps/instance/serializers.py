@@ -1,5 +1,7 @@
 from rest_framework import serializers
 
+from apps.instance.utils.streaming import JSON_STREAM, NDJSON_STREAM
+
 
 class ProjectsListAPIResponseSerializer(serializers.Serializer):
 
@@ -15,6 +17,18 @@ class StoresListAPIResponseSerializer(serializers.Serializer):
     project_id = serializers.IntegerField(min_value=1)
 
 
+class StoreStatsListAPIResponseSerializer(serializers.Serializer):
+
+    store_id = serializers.IntegerField(min_value=1)
+    store_name = serializers.CharField()
+    tables_count = serializers.IntegerField(min_value=0)
+    fields_count = serializers.IntegerField(min_value=0)
+    fk_count = serializers.IntegerField(min_value=0)
+    components_count = serializers.IntegerField(min_value=0)
+    largest_component_size = serializers.IntegerField(min_value=0)
+    updated_at = serializers.DateTimeField()
+
+
 class RelationTablesListAPIResponseSerializer(serializers.Serializer):
 
     id = serializers.IntegerField(min_value=1)
@@ -22,6 +36,11 @@ class RelationTablesListAPIResponseSerializer(serializers.Serializer):
     store_id = serializers.IntegerField(min_value=1)
 
 
+class RelationTableGraphAPIRequestSerializer(serializers.Serializer):
+
+    stream = serializers.ChoiceField(choices=[JSON_STREAM, NDJSON_STREAM], required=False)
+
+
 class RelationTableGraphAPIResponseSerializer(serializers.Serializer):
 
     id = serializers.IntegerField(min_value=1)
@@ -35,7 +54,86 @@ class RelationTableGraphAPIResponseSerializer(serializers.Serializer):
     store_name = serializers.CharField()
 
 
+class RelationTableGraphsAPIRequestSerializer(serializers.Serializer):
+
+    relation_table_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=1000,
+    )
+
+
+class RelationTableGraphsAPIResponseSerializer(serializers.Serializer):
+
+    relation_table_ids = serializers.ListField(child=serializers.IntegerField(min_value=1))
+    fields = RelationTableGraphAPIResponseSerializer(many=True)
+
+
 class RelationTableSaveSnapshotAPIRequestSerializer(serializers.Serializer):
 
     nodes = serializers.JSONField()
     edges = serializers.JSONField(default=[])
+
+
+class RelationTableSnapshotsListAPIResponseSerializer(serializers.Serializer):
+
+    id = serializers.IntegerField(min_value=1)
+    hash = serializers.CharField()
+    created_at = serializers.DateTimeField()
+    is_current = serializers.BooleanField()
+
+
+class SearchAPIRequestSerializer(serializers.Serializer):
+
+    q = serializers.CharField()
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+
+
+class SearchAPIResponseSerializer(serializers.Serializer):
+
+    model = serializers.CharField()
+    id = serializers.IntegerField(min_value=1)
+    name = serializers.CharField()
+    relation_table_id = serializers.IntegerField(min_value=1, allow_null=True)
+
+
+class ChangesAPIRequestSerializer(serializers.Serializer):
+
+    since = serializers.IntegerField(min_value=0, default=0)
+    limit = serializers.IntegerField(min_value=1, max_value=10000, default=1000)
+
+
+class CatalogChangeSerializer(serializers.Serializer):
+
+    version = serializers.IntegerField()
+    action = serializers.CharField()
+    model = serializers.CharField()
+    name = serializers.CharField(allow_blank=True)
+    object_id = serializers.IntegerField(allow_null=True)
+    created_at = serializers.DateTimeField()
+
+
+class ChangesAPIResponseSerializer(serializers.Serializer):
+
+    version = serializers.IntegerField(min_value=0)
+    has_more = serializers.BooleanField()
+    changes = CatalogChangeSerializer(many=True)
+
+
+class OperationsValidateAPIRequestSerializer(serializers.Serializer):
+
+    operations = serializers.ListField(child=serializers.JSONField())
+    sync = serializers.BooleanField(default=False)
+
+
+class OperationErrorSerializer(serializers.Serializer):
+
+    order = serializers.IntegerField(min_value=1)
+    model = serializers.CharField(allow_null=True)
+    message = serializers.CharField()
+    caused_by = serializers.IntegerField(min_value=1, allow_null=True)
+
+
+class OperationsValidateAPIResponseSerializer(serializers.Serializer):
+
+    errors = OperationErrorSerializer(many=True)
@@ -0,0 +1,54 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.test import TestCase, override_settings
+
+from apps.instance.utils.instance_processor import InstanceProcessor
+from apps.instance.utils.search_index import search_index
+
+
+def make_catalog_operations(project_name: str = 'p', store_name: str = 's') -> list[list]:
+    store_row = f'{project_name}.stores.relation.{store_name}'
+    return [
+        [1, project_name],
+        [1, store_row],
+        [1, f'{store_row}.a'],
+        [1, f'{store_row}.a.id', {'type': 'integer', 'order': 1}],
+        [1, f'{store_row}.b'],
+        [1, f'{store_row}.b.id', {'type': 'integer', 'order': 1}],
+        [1, f'{store_row}.b.a_id', {'type': 'integer', 'order': 2, 'field': f'{project_name}.{store_name}.a.id'}],
+        [1, f'{store_row}.c'],
+        [1, f'{store_row}.c.id', {'type': 'integer', 'order': 1}],
+    ]
+
+
+class CatalogTestCase(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        media_dir = TemporaryDirectory()
+        self.addCleanup(media_dir.cleanup)
+        media_root = Path(media_dir.name)
+        directories = {
+            'RELATION_TABLE_SNAPSHOTS_DIR': Path(media_root, 'relation_table'),
+            'RELATION_TABLE_LAYOUTS_DIR': Path(media_root, 'relation_table_layout'),
+            'RELATION_TABLE_LOAD_ORDERS_DIR': Path(media_root, 'relation_table_load_order'),
+            'RELATION_TABLE_GRAPHS_DIR': Path(media_root, 'relation_table_graph'),
+        }
+        for directory in directories.values():
+            directory.mkdir()
+
+        settings_override = override_settings(
+            MEDIA_ROOT=media_root,
+            STASH_FILE_PATH=Path(media_root, 'stash.json'),
+            **directories,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        Path(media_root, 'stash.json').write_text('{}')
+        search_index.invalidate()
+        self.addCleanup(search_index.invalidate)
+
+    @staticmethod
+    def process(operations: list[list]) -> None:
+        InstanceProcessor().process(operations=operations)
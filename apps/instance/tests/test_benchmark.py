@@ -0,0 +1,39 @@
+from pathlib import Path
+import json
+
+from django.conf import settings
+
+from apps.instance.models import RelationTable, RelationTableField
+from apps.instance.tests.base import CatalogTestCase
+from apps.instance.utils.benchmark import Benchmark, make_synthetic_operations
+
+
+class BenchmarkTestCase(CatalogTestCase):
+
+    def test_synthetic_operations_are_deterministic(self):
+        operations = make_synthetic_operations(projects=1, stores=2, tables=5, fields=3, fk_density=0.5, seed=1)
+
+        self.assertEqual(
+            operations,
+            make_synthetic_operations(projects=1, stores=2, tables=5, fields=3, fk_density=0.5, seed=1),
+        )
+        self.assertEqual(len(operations), 1 + 2 * (1 + 5 * (1 + 3)))
+
+    def test_dump_reports_every_measurement(self):
+        path = Path(settings.MEDIA_ROOT, 'benchmark.json')
+        report = Benchmark(projects=1, stores=1, tables=10, fields=3, fk_density=0.5, repeat=1).dump(path=path)
+
+        self.assertEqual(RelationTable.objects.count(), 10)
+        self.assertEqual(RelationTableField.objects.count(), 30)
+        self.assertIn('instance_processor.process', report['results'])
+        for view_name in (
+            'sync',
+            'relation_table_snapshots',
+            'relation_table_snapshot',
+            'relation_table_snapshot_restore',
+            'search',
+            'changes',
+            'metrics',
+        ):
+            self.assertIn(f'view:{view_name}', report['results'])
+        self.assertEqual(json.loads(path.read_text()), report)
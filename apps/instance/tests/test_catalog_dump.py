@@ -0,0 +1,92 @@
+from io import StringIO
+import json
+import zipfile
+
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+
+from apps.instance.models import (
+    CatalogChange,
+    Project,
+    RelationTable,
+    RelationTableField,
+    RelationTableGraphSnapshot,
+    StoreStats,
+)
+from apps.instance.tests.base import CatalogTestCase, make_catalog_operations
+
+
+class CatalogDumpTestCase(CatalogTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.process(operations=make_catalog_operations())
+        self.client.post(reverse('sync'))
+        self.client.post(
+            reverse('relation_table_save_snapshot', args=[RelationTable.objects.get(name='a').id]),
+            data={'nodes': [1]},
+            content_type='application/json',
+        )
+        self.path = settings.MEDIA_ROOT / 'catalog.zip'
+
+    def test_restore_reverts_to_dump(self):
+        call_command('dump_catalog', str(self.path), stdout=StringIO())
+        fields = set(RelationTableField.objects.values_list('id', 'name', 'field_id', 'relation_table_id'))
+        self.process(operations=[[2, 'p'], [1, 'q']])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('restore_catalog', str(self.path), stdout=StringIO())
+
+        self.assertEqual(list(Project.objects.values_list('name', flat=True)), ['p'])
+        self.assertEqual(
+            set(RelationTableField.objects.values_list('id', 'name', 'field_id', 'relation_table_id')),
+            fields,
+        )
+        self.assertEqual(RelationTableGraphSnapshot.objects.count(), 1)
+        self.assertEqual(StoreStats.objects.get().fk_count, 1)
+        self.assertEqual(CatalogChange.objects.order_by('-version').first().action, CatalogChange.SYNC_ACTION)
+        with settings.STASH_FILE_PATH.open() as json_file:
+            self.assertEqual(len(json.load(json_file)['relation_table_graphs']), 2)
+
+    def test_restore_rejects_unknown_format(self):
+        with zipfile.ZipFile(self.path, mode='w') as zip_file:
+            zip_file.writestr('manifest.json', json.dumps({'format': 0}))
+
+        with self.assertRaisesMessage(CommandError, 'unsupported catalog dump format 0'):
+            call_command('restore_catalog', str(self.path), stdout=StringIO())
+
+    def test_restore_brings_snapshot_files(self):
+        call_command('dump_catalog', str(self.path), stdout=StringIO())
+        for file_path in settings.RELATION_TABLE_SNAPSHOTS_DIR.glob('*.json'):
+            file_path.unlink()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('restore_catalog', str(self.path), stdout=StringIO())
+
+        response = self.client.get(
+            reverse('relation_table_load_snapshot', args=[RelationTable.objects.get(name='a').id]),
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['nodes'], [1])
+
+    def test_restore_drops_snapshots_without_files(self):
+        call_command('dump_catalog', str(self.path), stdout=StringIO())
+        with zipfile.ZipFile(self.path) as zip_file:
+            entries = {name: zip_file.read(name) for name in zip_file.namelist() if not name.startswith('snapshots/')}
+
+        with zipfile.ZipFile(self.path, mode='w') as zip_file:
+            for name, data in entries.items():
+                zip_file.writestr(name, data)
+
+        for file_path in settings.RELATION_TABLE_SNAPSHOTS_DIR.glob('*.json'):
+            file_path.unlink()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('restore_catalog', str(self.path), stdout=StringIO())
+
+        response = self.client.get(
+            reverse('relation_table_load_snapshot', args=[RelationTable.objects.get(name='a').id]),
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(RelationTableGraphSnapshot.objects.exists())
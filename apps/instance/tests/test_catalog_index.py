@@ -0,0 +1,50 @@
+from apps.instance.models import RelationTableField
+from apps.instance.tests.base import CatalogTestCase, make_catalog_operations
+from apps.instance.utils.catalog_index import CatalogIndex
+
+
+class CatalogIndexTestCase(CatalogTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.process(operations=make_catalog_operations(project_name='p'))
+        self.process(operations=make_catalog_operations(project_name='q'))
+
+    def test_load_scoped_to_projects(self):
+        index = CatalogIndex.load(project_names=['q'])
+
+        self.assertEqual(list(index.project_ids), ['q'])
+        self.assertEqual(len(index.relation_table_field_ids), 4)
+        field_id = RelationTableField.objects.get(name='a_id', relation_table__store__project__name='q').id
+        self.assertEqual(index.relation_table_field_names[field_id], 'q.s.b.a_id')
+
+    def test_discard_returns_descendants(self):
+        index = CatalogIndex.load()
+        field_id = index.relation_table_field_ids['p.s.a.id']
+
+        discarded = index.discard_relation_table(name='p.s.a')
+
+        self.assertEqual(discarded, [('relation_table_field', 'p.s.a.id', field_id)])
+        self.assertNotIn(field_id, index.relation_table_field_names)
+        self.assertEqual(
+            sorted(model for model, _, _ in index.discard_project(name='p')),
+            [
+                'relation_store',
+                'relation_table',
+                'relation_table',
+                'relation_table_field',
+                'relation_table_field',
+                'relation_table_field',
+            ],
+        )
+        self.assertTrue(all(name.startswith('q.') for name in index.relation_table_field_ids))
+        self.assertEqual(len(index.relation_table_field_ids), 4)
+
+    def test_discarded_name_can_be_added_again(self):
+        index = CatalogIndex.load()
+        index.discard_store(name='p.s')
+        index.add_store(name='p.s', store_id=100)
+        index.add_relation_table(name='p.s.a', relation_table_id=200)
+
+        self.assertEqual(index.discard_store(name='p.s'), [('relation_table', 'p.s.a', 200)])
+        self.assertNotIn('p.s.b', index.relation_table_ids)
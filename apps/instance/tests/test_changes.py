@@ -0,0 +1,62 @@
+from django.urls import reverse
+
+from apps.instance.models import CatalogChange, StoreStats
+from apps.instance.tests.base import CatalogTestCase, make_catalog_operations
+from apps.instance.utils.catalog_changes import get_catalog_version, record_catalog_changes
+
+
+class ChangesTestCase(CatalogTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.process(operations=make_catalog_operations())
+
+    def _get_changes(self, **params):
+        response = self.client.get(reverse('changes'), data=params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_versions_are_contiguous(self):
+        versions = list(CatalogChange.objects.order_by('version').values_list('version', flat=True))
+
+        self.assertEqual(versions, list(range(1, len(versions) + 1)))
+        self.assertEqual(get_catalog_version(), versions[-1])
+
+    def test_feed_pages_by_version(self):
+        first_page = self._get_changes(limit=4)
+        second_page = self._get_changes(since=first_page['version'], limit=100)
+
+        self.assertTrue(first_page['has_more'])
+        self.assertFalse(second_page['has_more'])
+        self.assertEqual(
+            [change['name'] for change in first_page['changes'] + second_page['changes']],
+            [op[1].replace('stores.relation.', '') for op in make_catalog_operations()],
+        )
+        self.assertEqual(self._get_changes(since=second_page['version'])['changes'], [])
+
+    def test_delete_logs_children_and_nulled_fks(self):
+        version = get_catalog_version()
+        self.process(operations=[[2, 'p.stores.relation.s.a']])
+
+        changes = [
+            (change['action'], change['name']) for change in self._get_changes(since=version)['changes']
+        ]
+        self.assertEqual(
+            changes,
+            [
+                (CatalogChange.UPDATE_ACTION, 'p.s.b.a_id'),
+                (CatalogChange.DELETE_ACTION, 'p.s.a'),
+                (CatalogChange.DELETE_ACTION, 'p.s.a.id'),
+            ],
+        )
+        self.assertEqual(StoreStats.objects.get().fk_count, 0)
+
+    def test_record_catalog_changes_reserves_a_block(self):
+        version = get_catalog_version()
+        record_catalog_changes(changes=[(CatalogChange.SYNC_ACTION, 'catalog', '', None)] * 3)
+
+        self.assertEqual(get_catalog_version(), version + 3)
+        self.assertEqual(
+            list(CatalogChange.objects.filter(version__gt=version).values_list('version', flat=True)),
+            [version + 1, version + 2, version + 3],
+        )
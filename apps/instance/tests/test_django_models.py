@@ -0,0 +1,62 @@
+from copy import deepcopy
+
+from django.apps import apps
+from django.core.management import call_command
+
+from apps.instance.models import RelationTable, RelationTableField
+from apps.instance.tests.base import CatalogTestCase
+from apps.instance.utils.instance_processor import InstanceProcessor, OperationError
+from scripts.django_models import get_ordered_models, parse_django_models
+
+
+class DjangoModelsTestCase(CatalogTestCase):
+
+    def test_parallel_introspection_matches_sequential(self):
+        self.assertEqual(
+            parse_django_models(project_name='p', store_name='s', workers=2),
+            parse_django_models(project_name='p', store_name='s'),
+        )
+
+    def test_load_instances_streams_django_models(self):
+        call_command('load_instances', '--django-models', 'p', 's')
+
+        self.assertEqual(RelationTable.objects.count(), len(get_ordered_models()))
+        field = RelationTableField.objects.get(
+            relation_table__name=apps.get_model('instance', 'Store').__name__,
+            name='project_id',
+        )
+        self.assertEqual(field.field.relation_table.name, 'Project')
+
+    def test_stream_accepts_forward_fk(self):
+        InstanceProcessor().process_stream(
+            operations=[
+                [1, 'p'],
+                [1, 'p.stores.relation.s'],
+                [1, 'p.stores.relation.s.b'],
+                [1, 'p.stores.relation.s.b.a_id', {'type': 'integer', 'field': 'p.s.a.id'}],
+                [1, 'p.stores.relation.s.a'],
+                [1, 'p.stores.relation.s.a.id', {'type': 'integer'}],
+            ],
+        )
+
+        field = RelationTableField.objects.get(name='a_id')
+        self.assertEqual(field.field.relation_table.name, 'a')
+
+    def test_stream_rejects_missing_fk_like_batch_mode(self):
+        operations = [
+            [1, 'p'],
+            [1, 'p.stores.relation.s'],
+            [1, 'p.stores.relation.s.a'],
+            [1, 'p.stores.relation.s.a.id', {'type': 'integer'}],
+            [1, 'p.stores.relation.s.b'],
+            [1, 'p.stores.relation.s.b.a_id', {'type': 'integer', 'field': 'p.s.a.id'}],
+            [2, 'p.stores.relation.s.a'],
+        ]
+        with self.assertRaises(OperationError) as batch_error:
+            InstanceProcessor().process(operations=deepcopy(operations))
+
+        with self.assertRaises(OperationError) as stream_error:
+            InstanceProcessor().process_stream(operations=deepcopy(operations))
+
+        self.assertEqual(stream_error.exception.message, batch_error.exception.message)
+        self.assertFalse(RelationTable.objects.exists())
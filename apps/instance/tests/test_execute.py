@@ -0,0 +1,59 @@
+from unittest import mock
+
+from apps.instance.models import CatalogChange, Project, RelationTableField
+from apps.instance.tests.base import CatalogTestCase, make_catalog_operations
+from apps.instance.utils.instance_processor import InstanceProcessor
+
+
+class ExecuteTestCase(CatalogTestCase):
+
+    def test_batched_field_creates_keep_fks(self):
+        self.process(operations=make_catalog_operations())
+
+        self.assertEqual(RelationTableField.objects.count(), 4)
+        self.assertEqual(RelationTableField.objects.get(name='a_id').field.relation_table.name, 'a')
+
+    def test_process_is_atomic(self):
+        with mock.patch.object(InstanceProcessor, '_flush_catalog_changes', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.process(operations=make_catalog_operations())
+
+        self.assertFalse(Project.objects.exists())
+        self.assertFalse(CatalogChange.objects.exists())
+
+    def test_unnest_ids_are_mapped_by_name(self):
+        rows = [('id', 'integer', 1, None, 10), ('a_id', 'integer', 2, 5, 10), ('id', 'integer', 1, None, 11)]
+        with mock.patch('apps.instance.utils.instance_processor.connection') as connection:
+            connection.ops.quote_name = lambda name: f'"{name}"'
+            cursor = connection.cursor.return_value.__enter__.return_value
+            cursor.fetchall.return_value = [(3, 11, 'id'), (2, 10, 'a_id'), (1, 10, 'id')]
+
+            ids = InstanceProcessor._insert_relation_table_fields_unnest(rows=rows)
+
+        self.assertEqual(ids, [1, 2, 3])
+        sql, params = cursor.execute.call_args.args
+        self.assertIn('RETURNING "id", "relation_table_id", "name"', sql)
+        self.assertEqual(params[0], ['id', 'a_id', 'id'])
+
+    def test_fk_to_field_created_later_is_deferred(self):
+        self.process(
+            operations=[
+                [1, 'p'],
+                [1, 'p.stores.relation.s'],
+                [1, 'p.stores.relation.s.b'],
+                [1, 'p.stores.relation.s.b.a_id', {'type': 'integer', 'field': 'p.s.a.id'}],
+                [1, 'p.stores.relation.s.a'],
+                [1, 'p.stores.relation.s.a.id', {'type': 'integer'}],
+            ],
+        )
+
+        self.assertEqual(RelationTableField.objects.get(name='a_id').field.relation_table.name, 'a')
+
+    def test_deleted_names_drop_their_children(self):
+        self.process(operations=make_catalog_operations())
+        processor = InstanceProcessor()
+
+        processor.process(operations=[[2, 'p.stores.relation.s'], *make_catalog_operations()[1:]])
+
+        self.assertEqual(RelationTableField.objects.count(), 4)
+        self.assertEqual(processor.exist_children['p.s.b'], {'p.s.b.id', 'p.s.b.a_id'})
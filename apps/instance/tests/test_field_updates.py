@@ -0,0 +1,52 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.instance.models import RelationTableField
+from apps.instance.tests.base import CatalogTestCase, make_catalog_operations
+from apps.instance.utils.instance_processor import InstanceProcessor
+from apps.instance.utils.instance_tree import InstanceError
+
+
+class FieldUpdateTestCase(CatalogTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.process(operations=make_catalog_operations())
+
+    def test_update_changes_only_given_attrs(self):
+        self.process(operations=[[3, 'p.stores.relation.s.b.a_id', {'type': 'bigint'}]])
+
+        field = RelationTableField.objects.get(name='a_id')
+        self.assertEqual((field.type, field.order, field.field.relation_table.name), ('bigint', 2, 'a'))
+
+    def test_update_clears_fk(self):
+        self.process(operations=[[3, 'p.stores.relation.s.b.a_id', {'field': None}]])
+
+        self.assertIsNone(RelationTableField.objects.get(name='a_id').field_id)
+
+    def test_null_attrs_are_rejected(self):
+        for attrs in ({'type': None}, {'order': None}, {'type': ''}, {}):
+            with self.subTest(attrs=attrs):
+                errors = InstanceProcessor().validate(operations=[[3, 'p.stores.relation.s.b.a_id', attrs]])
+                self.assertEqual(len(errors), 1)
+
+                with self.assertRaises(InstanceError):
+                    self.process(operations=[[3, 'p.stores.relation.s.b.a_id', dict(attrs)]])
+
+    def test_create_rejects_null_order(self):
+        with self.assertRaises(InstanceError):
+            self.process(operations=[[1, 'p.stores.relation.s.c.name', {'type': 'varchar', 'order': None}]])
+
+    def test_stream_batches_updates(self):
+        with CaptureQueriesContext(connection) as queries:
+            InstanceProcessor().process_stream(
+                operations=[
+                    [3, f'p.stores.relation.s.{table_name}.id', {'type': 'bigint'}]
+                    for table_name in ('a', 'b', 'c')
+                ],
+            )
+
+        field_table = RelationTableField._meta.db_table
+        updates = [query for query in queries if query['sql'].startswith(f'UPDATE "{field_table}"')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(set(RelationTableField.objects.filter(name='id').values_list('type', flat=True)), {'bigint'})
@@ -0,0 +1,75 @@
+import json
+
+from django.urls import reverse
+
+from apps.instance.models import RelationTable
+from apps.instance.tests.base import CatalogTestCase, make_catalog_operations
+
+
+class GraphsTestCase(CatalogTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.process(operations=make_catalog_operations())
+        self.client.post(reverse('sync'))
+        self.relation_table_ids = dict(RelationTable.objects.values_list('name', 'id'))
+
+    def test_graph(self):
+        response = self.client.get(reverse('relation_table_graph', args=[self.relation_table_ids['b']]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sorted((field['table_name'], field['name']) for field in response.json()),
+            [('a', 'id'), ('b', 'a_id'), ('b', 'id')],
+        )
+
+    def test_graph_streams_match_regular_response(self):
+        url = reverse('relation_table_graph', args=[self.relation_table_ids['b']])
+        expected = self.client.get(url).json()
+
+        response = self.client.get(url, data={'stream': 'json'})
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(b''.join(response.streaming_content)), expected)
+
+        response = self.client.get(url, data={'stream': 'ndjson'})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual(
+            [json.loads(line) for line in b''.join(response.streaming_content).splitlines()],
+            expected,
+        )
+
+    def test_graph_stream_of_unknown_table_is_empty(self):
+        response = self.client.get(reverse('relation_table_graph', args=[10 ** 6]), data={'stream': 'json'})
+
+        self.assertEqual(json.loads(b''.join(response.streaming_content)), [])
+
+    def test_graph_cache_follows_catalog_changes(self):
+        url = reverse('relation_table_graph', args=[self.relation_table_ids['a']])
+        self.assertEqual(len(self.client.get(url).json()), 3)
+
+        self.process(operations=[[1, 'p.stores.relation.s.a.name', {'type': 'varchar'}]])
+
+        self.assertEqual(len(self.client.get(url).json()), 4)
+
+    def test_graphs_group_requested_tables_by_component(self):
+        response = self.client.get(
+            reverse('relation_table_graphs'),
+            data={'relation_table_ids': [self.relation_table_ids[name] for name in ('a', 'b', 'c')]},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        graphs = sorted(response.json(), key=lambda graph: graph['relation_table_ids'])
+        self.assertEqual(
+            [graph['relation_table_ids'] for graph in graphs],
+            [[self.relation_table_ids['a'], self.relation_table_ids['b']], [self.relation_table_ids['c']]],
+        )
+        self.assertEqual([len(graph['fields']) for graph in graphs], [3, 1])
+
+    def test_graphs_skip_unknown_tables(self):
+        response = self.client.get(reverse('relation_table_graphs'), data={'relation_table_ids': [10 ** 6]})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [])
+
+    def test_graphs_require_ids(self):
+        self.assertEqual(self.client.get(reverse('relation_table_graphs')).status_code, 400)
@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.urls import reverse
+
+from apps.instance.models import RelationTable
+from apps.instance.tests.base import CatalogTestCase, make_catalog_operations
+
+
+class LayoutTestCase(CatalogTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.process(operations=make_catalog_operations())
+        self.client.post(reverse('sync'))
+        self.relation_table_ids = dict(RelationTable.objects.values_list('name', 'id'))
+
+    def _get_layout(self, name):
+        return self.client.get(reverse('relation_table_layout', args=[self.relation_table_ids[name]]))
+
+    def _get_layout_file_names(self):
+        return sorted(file_path.name for file_path in settings.RELATION_TABLE_LAYOUTS_DIR.glob('*.json'))
+
+    def test_layout_places_referencing_table_after_referenced_one(self):
+        response = self._get_layout(name='b')
+
+        self.assertEqual(response.status_code, 200)
+        positions = {node['id']: node['position'] for node in response.json()['nodes']}
+        self.assertLess(positions[self.relation_table_ids['a']]['x'], positions[self.relation_table_ids['b']]['x'])
+        self.assertEqual(len(response.json()['edges']), 1)
+
+    def test_layout_is_cached(self):
+        self._get_layout(name='a')
+        file_names = self._get_layout_file_names()
+
+        self.assertEqual(self._get_layout(name='b').status_code, 200)
+        self.assertEqual(self._get_layout_file_names(), file_names)
+
+    def test_stale_layouts_are_pruned(self):
+        self._get_layout(name='a')
+        self._get_layout(name='c')
+        self.process(operations=[[1, 'p.stores.relation.s.a.name', {'type': 'varchar'}]])
+
+        self._get_layout(name='a')
+
+        self.assertEqual(len(self._get_layout_file_names()), 2)
+
+        self.process(operations=[[2, 'p.stores.relation.s.c']])
+        self.client.post(reverse('sync'))
+
+        self.assertEqual(len(self._get_layout_file_names()), 1)
@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.urls import reverse
+
+from apps.instance.models import RelationTable
+from apps.instance.tests.base import CatalogTestCase, make_catalog_operations
+from apps.instance.utils.load_order import RelationTableLoadOrderUtil
+
+
+class LoadOrderTestCase(CatalogTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.process(operations=make_catalog_operations())
+        self.client.post(reverse('sync'))
+        self.relation_table_ids = dict(RelationTable.objects.values_list('name', 'id'))
+
+    def _get_load_order(self, name):
+        return self.client.get(reverse('relation_table_load_order', args=[self.relation_table_ids[name]]))
+
+    def test_referenced_table_loads_first(self):
+        response = self._get_load_order(name='b')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['order'], [self.relation_table_ids['a'], self.relation_table_ids['b']])
+        self.assertEqual(response.json()['cycles'], [])
+
+    def test_cycles_are_grouped(self):
+        load_order = RelationTableLoadOrderUtil.compute_load_order(
+            nodes=[1, 2, 3],
+            relations=[(10, 1, 2), (11, 2, 1), (12, 3, 1)],
+        )
+
+        self.assertEqual(load_order['groups'], [[1, 2], [3]])
+        self.assertEqual(load_order['cycles'], [[1, 2]])
+        self.assertEqual(sorted(load_order['cyclic_fields']), [10, 11])
+
+    def test_stale_load_orders_are_pruned(self):
+        schema_version = self._get_load_order(name='a').json()['schema_version']
+        self.process(operations=[[1, 'p.stores.relation.s.a.b_id', {'type': 'integer', 'field': 'p.s.b.id'}]])
+
+        self.assertNotEqual(self._get_load_order(name='a').json()['schema_version'], schema_version)
+        self.assertEqual(len(list(settings.RELATION_TABLE_LOAD_ORDERS_DIR.glob('*.json'))), 1)
+
+        self.process(operations=[[2, 'p.stores.relation.s.a'], [2, 'p.stores.relation.s.b']])
+        self.client.post(reverse('sync'))
+
+        self.assertEqual(list(settings.RELATION_TABLE_LOAD_ORDERS_DIR.glob('*.json')), [])
@@ -0,0 +1,25 @@
+from django.urls import reverse
+
+from apps.instance.tests.base import CatalogTestCase, make_catalog_operations
+
+
+class MetricsTestCase(CatalogTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.process(operations=make_catalog_operations())
+
+    def test_server_timing_splits_sql_serialization_and_render(self):
+        response = self.client.get(reverse('projects'))
+
+        self.assertEqual(response.status_code, 200)
+        server_timing = {entry.split(';')[0] for entry in response['Server-Timing'].split(', ')}
+        self.assertEqual(server_timing, {'total', 'sql', 'serialization', 'render'})
+
+    def test_metrics_expose_render_histogram(self):
+        self.client.get(reverse('projects'))
+
+        response = self.client.get(reverse('metrics'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('docs_flow_render_duration_seconds_count{view="projects"}', response.content.decode())
@@ -0,0 +1,81 @@
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+
+class MigrationTestCase(TransactionTestCase):
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+        super().tearDown()
+
+    def _migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+
+class MoveSnapshotsToGraphsTestCase(MigrationTestCase):
+
+    migrate_from = [('instance', '0001_initial')]
+    migrate_to = [('instance', '0002_relationtablegraph_relationtable_graph_and_more')]
+
+    def test_tables_are_grouped_by_fk_component(self):
+        apps = self._migrate(targets=self.migrate_from)
+        Project = apps.get_model('instance', 'Project')
+        Store = apps.get_model('instance', 'Store')
+        RelationTable = apps.get_model('instance', 'RelationTable')
+        RelationTableField = apps.get_model('instance', 'RelationTableField')
+
+        store = Store.objects.create(name='s', type='relation', project=Project.objects.create(name='p'))
+        a, b, c = (
+            RelationTable.objects.create(name=name, store=store, snapshot=snapshot)
+            for name, snapshot in (('a', 'x.json'), ('b', None), ('c', 'y.json'))
+        )
+        a_id = RelationTableField.objects.create(name='id', type='integer', relation_table=a)
+        RelationTableField.objects.create(name='a_id', type='integer', relation_table=b, field=a_id)
+
+        apps = self._migrate(targets=self.migrate_to)
+        RelationTable = apps.get_model('instance', 'RelationTable')
+        tables = {table.name: table for table in RelationTable.objects.select_related('graph')}
+
+        self.assertEqual(tables['a'].graph_id, tables['b'].graph_id)
+        self.assertNotEqual(tables['a'].graph_id, tables['c'].graph_id)
+        self.assertEqual((tables['a'].graph.snapshot, tables['c'].graph.snapshot), ('x.json', 'y.json'))
+
+
+class SeedStoreStatsTestCase(MigrationTestCase):
+
+    migrate_from = [('instance', '0004_catalogchange')]
+    migrate_to = [('instance', '0005_storestats')]
+
+    def test_existing_stores_get_stats(self):
+        apps = self._migrate(targets=self.migrate_from)
+        Project = apps.get_model('instance', 'Project')
+        Store = apps.get_model('instance', 'Store')
+        RelationTable = apps.get_model('instance', 'RelationTable')
+        RelationTableGraph = apps.get_model('instance', 'RelationTableGraph')
+        RelationTableField = apps.get_model('instance', 'RelationTableField')
+
+        project = Project.objects.create(name='p')
+        store = Store.objects.create(name='s', type='relation', project=project)
+        empty_store = Store.objects.create(name='t', type='relation', project=project)
+        graph = RelationTableGraph.objects.create()
+        a, b = (RelationTable.objects.create(name=name, store=store, graph=graph) for name in ('a', 'b'))
+        RelationTable.objects.create(name='c', store=store)
+        a_id = RelationTableField.objects.create(name='id', type='integer', relation_table=a)
+        RelationTableField.objects.create(name='a_id', type='integer', relation_table=b, field=a_id)
+
+        apps = self._migrate(targets=self.migrate_to)
+        StoreStats = apps.get_model('instance', 'StoreStats')
+
+        self.assertEqual(
+            list(
+                StoreStats.objects.order_by('store_id').values_list(
+                    'store_id', 'tables_count', 'fields_count', 'fk_count', 'components_count',
+                    'largest_component_size',
+                )
+            ),
+            [(store.id, 3, 2, 1, 2, 2), (empty_store.id, 0, 0, 0, 0, 0)],
+        )
@@ -0,0 +1,71 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+
+from apps.instance.tests.base import CatalogTestCase, make_catalog_operations
+from apps.instance.utils.instance_processor import InstanceProcessor
+from apps.instance.utils.instance_tree import (
+    PROJECT_MODEL,
+    RELATION_STORE_MODEL,
+    RELATION_TABLE_FIELD_MODEL,
+    RELATION_TABLE_MODEL,
+)
+from apps.instance.utils.processor_hooks import CHECK_PHASE, EXECUTE_PHASE, PARSE_PHASE, STREAM_PHASE, ProcessorHook
+
+
+class RecordingProcessorHook(ProcessorHook):
+
+    def __init__(self):
+        self.stats = []
+
+    def phase_finished(self, stats):
+        self.stats.append(stats)
+
+
+class ProcessorHooksTestCase(CatalogTestCase):
+
+    def test_process_reports_every_phase(self):
+        hook = RecordingProcessorHook()
+        InstanceProcessor(hooks=[hook]).process(operations=make_catalog_operations())
+
+        self.assertEqual([stats.phase for stats in hook.stats], [PARSE_PHASE, CHECK_PHASE, EXECUTE_PHASE])
+        parse_stats, _, execute_stats = hook.stats
+        self.assertEqual(
+            {model: model_stats.operations for model, model_stats in parse_stats.models.items()},
+            {PROJECT_MODEL: 1, RELATION_STORE_MODEL: 1, RELATION_TABLE_MODEL: 3, RELATION_TABLE_FIELD_MODEL: 4},
+        )
+        self.assertEqual(parse_stats.queries, 0)
+        self.assertGreater(execute_stats.queries, 0)
+        self.assertLessEqual(
+            sum(model_stats.queries for model_stats in execute_stats.models.values()),
+            execute_stats.queries,
+        )
+
+    def test_process_stream_reports_stream_phase(self):
+        hook = RecordingProcessorHook()
+        InstanceProcessor(hooks=[hook]).process_stream(operations=make_catalog_operations())
+
+        self.assertEqual([stats.phase for stats in hook.stats], [STREAM_PHASE])
+        self.assertGreater(hook.stats[0].queries, 0)
+
+    def test_load_instances_profile(self):
+        stdout = StringIO()
+        with mock.patch(
+            'apps.instance.management.commands.load_instances.json.load',
+            return_value={'operations': make_catalog_operations()},
+        ), mock.patch('apps.instance.management.commands.load_instances.Path.open', mock.mock_open()):
+            call_command('load_instances', '--profile', '--profile-limit', '5', stdout=stdout)
+
+        output = stdout.getvalue()
+        for phase in (PARSE_PHASE, CHECK_PHASE, EXECUTE_PHASE):
+            self.assertIn(f'{phase}: ', output)
+        self.assertIn('cumulative', output)
+
+    def test_load_instances_profile_with_django_models(self):
+        stdout = StringIO()
+        call_command('load_instances', '--django-models', 'p', 's', '--profile', '--profile-limit', '5', stdout=stdout)
+
+        output = stdout.getvalue()
+        self.assertIn(f'{STREAM_PHASE}: ', output)
+        self.assertIn('cumulative', output)
@@ -0,0 +1,61 @@
+from apps.instance.models import RelationTable, RelationTableField
+from apps.instance.tests.base import CatalogTestCase, make_catalog_operations
+from apps.instance.utils.schema_diff import SchemaDiff
+
+
+class SchemaDiffTestCase(CatalogTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.process(operations=make_catalog_operations())
+
+    def test_unchanged_catalog_has_no_operations(self):
+        self.assertEqual(SchemaDiff(operations=make_catalog_operations()).get_operations(), [])
+
+    def test_diff_converges_to_target(self):
+        operations = [
+            op
+            for op in make_catalog_operations()
+            if op[1] not in ('p.stores.relation.s.c', 'p.stores.relation.s.c.id')
+        ]
+        operations[5] = [1, 'p.stores.relation.s.b.id', {'type': 'bigint', 'order': 1}]
+        operations.append([1, 'p.stores.relation.s.b.name', {'type': 'varchar', 'order': 3}])
+        diff_operations = SchemaDiff(operations=operations).get_operations()
+
+        self.assertEqual(
+            diff_operations,
+            [
+                [2, 'p.stores.relation.s.c'],
+                [1, 'p.stores.relation.s.b.name', {'type': 'varchar', 'order': 3}],
+                [3, 'p.stores.relation.s.b.id', {'type': 'bigint'}],
+            ],
+        )
+
+        self.process(operations=diff_operations)
+        self.assertEqual(sorted(RelationTable.objects.values_list('name', flat=True)), ['a', 'b'])
+        self.assertEqual(RelationTableField.objects.get(relation_table__name='b', name='id').type, 'bigint')
+        self.assertEqual(SchemaDiff(operations=operations).get_operations(), [])
+
+    def test_new_fields_are_ordered_by_fk(self):
+        operations = make_catalog_operations()
+        operations.extend(
+            [
+                [1, 'p.stores.relation.s.d'],
+                [1, 'p.stores.relation.s.d.e_id', {'type': 'integer', 'field': 'p.s.e.id'}],
+                [1, 'p.stores.relation.s.e'],
+                [1, 'p.stores.relation.s.e.id', {'type': 'integer'}],
+            ],
+        )
+        diff_operations = SchemaDiff(operations=operations).get_operations()
+
+        self.assertEqual(
+            [op[1] for op in diff_operations],
+            [
+                'p.stores.relation.s.d',
+                'p.stores.relation.s.e',
+                'p.stores.relation.s.e.id',
+                'p.stores.relation.s.d.e_id',
+            ],
+        )
+        self.process(operations=diff_operations)
+        self.assertEqual(RelationTableField.objects.get(name='e_id').field.relation_table.name, 'e')
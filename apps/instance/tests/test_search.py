@@ -0,0 +1,44 @@
+from django.urls import reverse
+
+from apps.instance.tests.base import CatalogTestCase, make_catalog_operations
+from apps.instance.utils.search_index import search_index
+
+
+class SearchTestCase(CatalogTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.process(operations=make_catalog_operations())
+
+    def _search(self, q):
+        response = self.client.get(reverse('search'), data={'q': q})
+        self.assertEqual(response.status_code, 200)
+        return [result['name'] for result in response.json()]
+
+    def test_exact_match_is_ranked_first(self):
+        self.assertEqual(self._search(q='a')[:2], ['p.s.a', 'p.s.b.a_id'])
+
+    def test_qualified_query(self):
+        self.assertEqual(self._search(q='b.id'), ['p.s.b.id'])
+
+    def test_refresh_adds_changes_as_sorted_runs(self):
+        self._search(q='a')
+        base_tokens = search_index._runs[0][0]
+        self.process(operations=[[1, 'p.stores.relation.s.d'], [2, 'p.stores.relation.s.b']])
+
+        self.assertEqual(self._search(q='d'), ['p.s.d'])
+        self.assertEqual(self._search(q='b'), [])
+        self.assertEqual(search_index._pending, [])
+        self.assertIs(search_index._runs[0][0], base_tokens)
+        for tokens, _ in search_index._runs:
+            self.assertEqual(tokens, sorted(tokens))
+
+    def test_runs_merge_as_they_grow(self):
+        self._search(q='a')
+        for name in ('d', 'e', 'f', 'g'):
+            self.process(operations=[[1, f'p.stores.relation.s.{name}']])
+            self._search(q=name)
+
+        run_sizes = [len(tokens) for tokens, _ in search_index._runs]
+        self.assertEqual(run_sizes, sorted(run_sizes, reverse=True))
+        self.assertEqual(self._search(q='e'), ['p.s.e'])
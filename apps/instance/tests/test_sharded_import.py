@@ -0,0 +1,58 @@
+from unittest import mock
+
+from apps.instance.models import Project, RelationTable, RelationTableField
+from apps.instance.tests.base import CatalogTestCase, make_catalog_operations
+from apps.instance.utils import sharded_import
+from apps.instance.utils.instance_tree import InstanceError
+from apps.instance.utils.sharded_import import ShardedImport
+
+
+def _make_operations() -> list[list]:
+    return [
+        *make_catalog_operations(project_name='p', store_name='s'),
+        *make_catalog_operations(project_name='q', store_name='t'),
+        [1, 'q.stores.relation.t.c.p_id', {'type': 'integer', 'field': 'p.s.a.id'}],
+    ]
+
+
+_execute_shard = sharded_import._execute_shard
+
+
+def _fail_store_t(operations, project_names):
+    if 'q' in project_names:
+        return 'boom'
+
+    return _execute_shard(operations=operations, project_names=project_names)
+
+
+class ShardedImportTestCase(CatalogTestCase):
+
+    def test_matches_sequential_import(self):
+        ShardedImport(workers=2).process(operations=_make_operations())
+
+        self.assertEqual(RelationTable.objects.count(), 6)
+        field = RelationTableField.objects.get(name='p_id')
+        self.assertEqual(field.field.relation_table.store.project.name, 'p')
+
+    def test_in_process_failure_rolls_back_everything(self):
+        with mock.patch.object(sharded_import, '_execute_shard', side_effect=_fail_store_t):
+            with self.assertRaisesMessage(InstanceError, 'stores q.t failed: boom'):
+                ShardedImport(workers=1).process(operations=_make_operations())
+
+        self.assertFalse(Project.objects.exists())
+
+    def test_parallel_failure_reports_committed_shards(self):
+        importer = ShardedImport(workers=2)
+        with mock.patch.object(sharded_import, '_execute_shard', side_effect=_fail_store_t), mock.patch.object(
+            ShardedImport,
+            '_is_parallel',
+            return_value=True,
+        ), mock.patch.object(ShardedImport, '_map', lambda self, func, *iterables: list(map(func, *iterables))):
+            with self.assertRaises(InstanceError) as error:
+                importer.process(operations=_make_operations())
+
+        self.assertEqual(
+            str(error.exception),
+            'stores q.t failed: boom; committed projects: p, q; committed stores: p.s',
+        )
+        self.assertFalse(RelationTableField.objects.filter(name='p_id').exists())
@@ -0,0 +1,81 @@
+from django.conf import settings
+from django.test import override_settings
+from django.urls import reverse
+
+from apps.instance.models import RelationTable, RelationTableGraphSnapshot
+from apps.instance.tests.base import CatalogTestCase, make_catalog_operations
+
+
+class SnapshotsTestCase(CatalogTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.process(operations=make_catalog_operations())
+        self.client.post(reverse('sync'))
+        self.relation_table_id = RelationTable.objects.get(name='a').id
+
+    def _save_snapshot(self, nodes):
+        return self.client.post(
+            reverse('relation_table_save_snapshot', args=[self.relation_table_id]),
+            data={'nodes': nodes},
+            content_type='application/json',
+        )
+
+    def _get_snapshots(self):
+        return self.client.get(reverse('relation_table_snapshots', args=[self.relation_table_id])).json()
+
+    def test_save_and_load(self):
+        self.assertEqual(self._save_snapshot(nodes=[1]).status_code, 204)
+
+        response = self.client.get(reverse('relation_table_load_snapshot', args=[self.relation_table_id]))
+
+        self.assertEqual(response.json(), {'nodes': [1], 'edges': []})
+
+    def test_history_survives_sync(self):
+        self._save_snapshot(nodes=[1])
+        self._save_snapshot(nodes=[2])
+        graph_id = RelationTable.objects.get(id=self.relation_table_id).graph_id
+
+        self.client.post(reverse('sync'))
+
+        self.assertEqual(RelationTable.objects.get(id=self.relation_table_id).graph_id, graph_id)
+        self.assertEqual(len(self._get_snapshots()), 2)
+        self.assertEqual(len(list(settings.RELATION_TABLE_SNAPSHOTS_DIR.glob('*.json'))), 2)
+        response = self.client.get(reverse('relation_table_load_snapshot', args=[self.relation_table_id]))
+        self.assertEqual(response.json(), {'nodes': [2], 'edges': []})
+
+    def test_changed_component_keeps_history_but_drops_current_snapshot(self):
+        self._save_snapshot(nodes=[1])
+        self.process(operations=[[1, 'p.stores.relation.s.c.a_id', {'type': 'integer', 'field': 'p.s.a.id'}]])
+
+        self.client.post(reverse('sync'))
+
+        snapshots = self._get_snapshots()
+        self.assertEqual([snapshot['is_current'] for snapshot in snapshots], [False])
+        self.assertEqual(
+            self.client.get(reverse('relation_table_load_snapshot', args=[self.relation_table_id])).status_code,
+            404,
+        )
+
+    def test_restore(self):
+        self._save_snapshot(nodes=[1])
+        self._save_snapshot(nodes=[2])
+        first_snapshot = self._get_snapshots()[-1]
+
+        self.client.post(reverse('relation_table_snapshot', args=[self.relation_table_id, first_snapshot['id']]))
+
+        response = self.client.get(reverse('relation_table_load_snapshot', args=[self.relation_table_id]))
+        self.assertEqual(response.json(), {'nodes': [1], 'edges': []})
+
+    @override_settings(RELATION_TABLE_SNAPSHOT_HISTORY_LIMIT=1)
+    def test_trimmed_files_are_kept_while_referenced(self):
+        self._save_snapshot(nodes=[1])
+        with self.captureOnCommitCallbacks(execute=True):
+            self._save_snapshot(nodes=[2])
+            self._save_snapshot(nodes=[1])
+
+        self.assertEqual(RelationTableGraphSnapshot.objects.count(), 1)
+        self.assertEqual(
+            {file_path.stem for file_path in settings.RELATION_TABLE_SNAPSHOTS_DIR.glob('*.json')},
+            {RelationTableGraphSnapshot.objects.get().hash},
+        )
@@ -0,0 +1,57 @@
+from django.urls import reverse
+
+from apps.instance.models import Project, StoreStats
+from apps.instance.tests.base import CatalogTestCase, make_catalog_operations
+from apps.instance.utils.graph import RelationTableGraphUtil
+from apps.instance.utils.store_stats import recompute_store_stats
+
+
+_COUNT_FIELDS = ('store__name', 'tables_count', 'fields_count', 'fk_count')
+
+
+class StoreStatsTestCase(CatalogTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.process(
+            operations=[
+                *make_catalog_operations(project_name='p', store_name='s'),
+                *make_catalog_operations(project_name='p', store_name='t')[1:],
+                [1, 'p.stores.relation.t.c.s_id', {'type': 'integer', 'field': 'p.s.c.id'}],
+            ],
+        )
+
+    def _get_counts(self):
+        return sorted(StoreStats.objects.values_list(*_COUNT_FIELDS))
+
+    def _assert_matches_recompute(self):
+        counts = self._get_counts()
+        recompute_store_stats(graphs=RelationTableGraphUtil.get_actual_graphs())
+        self.assertEqual(counts, self._get_counts())
+
+    def test_endpoint(self):
+        self.client.post(reverse('sync'))
+
+        response = self.client.get(reverse('store_stats', args=[Project.objects.get().id]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [
+                (stats['store_name'], stats['tables_count'], stats['fields_count'], stats['fk_count'])
+                for stats in sorted(response.json(), key=lambda stats: stats['store_name'])
+            ],
+            [('s', 3, 4, 1), ('t', 3, 5, 2)],
+        )
+        self.assertEqual([stats['components_count'] for stats in response.json()], [2, 2])
+
+    def test_incremental_counts_match_recompute(self):
+        self._assert_matches_recompute()
+        for operations in (
+            [[3, 'p.stores.relation.t.b.a_id', {'field': None}]],
+            [[2, 'p.stores.relation.s.c']],
+            [[2, 'p.stores.relation.t.a']],
+            [[2, 'p.stores.relation.s']],
+        ):
+            with self.subTest(operations=operations):
+                self.process(operations=operations)
+                self._assert_matches_recompute()
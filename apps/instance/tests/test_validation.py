@@ -0,0 +1,69 @@
+from django.urls import reverse
+
+from apps.instance.models import Project
+from apps.instance.tests.base import CatalogTestCase, make_catalog_operations
+from apps.instance.utils.instance_processor import InstanceProcessor
+from apps.instance.utils.sharded_import import ShardedImport
+
+
+def _make_invalid_operations() -> list[list]:
+    return [
+        [1, 'p.stores.relation.s'],
+        [1, 'p.stores.relation.s.a'],
+        [1, 'p.stores.relation.s.a.id', {'type': 'integer'}],
+        [1, 'q'],
+        [1, 'q.stores.relation.s'],
+        [1, 'q.stores.relation.s.b'],
+        [1, 'q.stores.relation.s.b.a_id', {'type': 'integer', 'field': 'p.s.a.id'}],
+        [1, 'q.stores.relation.s.b.c_id', {'type': 'integer', 'field': 'q.s.c.id'}],
+        [7, 'q.stores.relation.s.d'],
+    ]
+
+
+class ValidationTestCase(CatalogTestCase):
+
+    def test_reports_every_error_with_its_cause(self):
+        errors = InstanceProcessor().validate(operations=_make_invalid_operations())
+
+        self.assertEqual(
+            [(error['order'], error['caused_by']) for error in errors],
+            [(1, None), (2, 1), (3, 1), (7, 1), (8, None), (9, None)],
+        )
+        self.assertEqual(errors[0]['message'], 'project with name p not exists')
+        self.assertEqual(errors[-1]['model'], None)
+        self.assertFalse(Project.objects.exists())
+
+    def test_valid_operations_have_no_errors(self):
+        self.assertEqual(InstanceProcessor().validate(operations=make_catalog_operations()), [])
+
+    def test_sharded_validation_matches_processor(self):
+        operations = _make_invalid_operations()[:-1]
+
+        self.assertEqual(
+            ShardedImport(workers=1).validate(operations=_make_invalid_operations()[:-1]),
+            InstanceProcessor().validate(operations=operations),
+        )
+
+    def test_operations_validate_api(self):
+        response = self.client.post(
+            reverse('operations_validate'),
+            data={'operations': _make_invalid_operations()},
+            content_type='application/json',
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['errors'][1]['caused_by'], 1)
+
+    def test_operations_validate_api_reports_malformed_sync_operations(self):
+        response = self.client.post(
+            reverse('operations_validate'),
+            data={
+                'operations': [5, [1], [1, 'p.stores.relation.s.a.id', [1]], [1, 'p']],
+                'sync': True,
+            },
+            content_type='application/json',
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([error['order'] for error in response.json()['errors']], [1, 2, 3])
+        self.assertEqual(response.json()['errors'][2]['message'], 'attrs must be object or null')
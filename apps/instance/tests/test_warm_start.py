@@ -0,0 +1,52 @@
+from unittest import mock
+
+from django.conf import settings
+from django.test import override_settings
+from django.urls import reverse
+
+from apps.instance.models import RelationTable
+from apps.instance.tests.base import CatalogTestCase, make_catalog_operations
+from apps.instance.utils.warm_start import WarmStart, warm_start_on_boot
+
+
+class WarmStartTestCase(CatalogTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.process(operations=make_catalog_operations())
+        self.client.post(reverse('sync'))
+
+    def test_warm_start_persists_layouts_and_graph_responses(self):
+        report = WarmStart(time_budget=60).run()
+
+        self.assertEqual((report['graphs'], report['layouts'], report['graph_responses']), (2, 2, 2))
+        self.assertTrue(report['search_index'])
+        self.assertFalse(report['exhausted'])
+        self.assertEqual(len(list(settings.RELATION_TABLE_LAYOUTS_DIR.glob('*.json'))), 2)
+        self.assertEqual(len(list(settings.RELATION_TABLE_GRAPHS_DIR.glob('*.json'))), 2)
+
+        relation_table_id = RelationTable.objects.get(name='b').id
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('relation_table_graph', args=[relation_table_id]))
+
+        self.assertEqual(len(response.json()), 3)
+
+    def test_exhausted_budget_stops_before_each_step(self):
+        report = WarmStart(time_budget=0).run()
+
+        self.assertEqual((report['search_index'], report['layouts'], report['graph_responses']), (False, 0, 0))
+        self.assertTrue(report['exhausted'])
+
+    @override_settings(WARM_START_ON_BOOT=False)
+    def test_boot_hook_is_disabled_by_default(self):
+        warm_start_on_boot()
+
+        self.assertEqual(list(settings.RELATION_TABLE_LAYOUTS_DIR.glob('*.json')), [])
+
+    @override_settings(WARM_START_ON_BOOT=True, WARM_START_TIME_BUDGET=60)
+    def test_boot_hook_closes_its_connections(self):
+        with mock.patch('apps.instance.utils.warm_start.connections') as connections:
+            warm_start_on_boot()
+
+        connections.close_all.assert_called_once_with()
+        self.assertEqual(len(list(settings.RELATION_TABLE_GRAPHS_DIR.glob('*.json'))), 2)
@@ -3,22 +3,44 @@ from django.urls import path
 from apps.instance.views import (
     ProjectsListAPI,
     StoresListAPI,
+    StoreStatsListAPI,
     RelationTablesListAPI,
     RelationTableGraphAPI,
+    RelationTableGraphsAPI,
+    RelationTableLayoutAPI,
+    RelationTableLoadOrderAPI,
     RelationTableLoadSnapshotAPI,
     RelationTableSaveSnapshotAPI,
+    RelationTableSnapshotsListAPI,
+    RelationTableSnapshotAPI,
+    SearchAPI,
+    ChangesAPI,
     SyncAPI,
+    OperationsValidateAPI,
+    MetricsAPI,
 )
 
 urlpatterns = [
     path('v1/projects/', ProjectsListAPI.as_view(), name='projects'),
     path('v1/projects/<int:project_id>/stores/', StoresListAPI.as_view(), name='stores'),
+    path('v1/projects/<int:project_id>/stats/', StoreStatsListAPI.as_view(), name='store_stats'),
     path('v1/stores/<int:store_id>/relation_tables/', RelationTablesListAPI.as_view(), name='relation_tables'),
     path(
         'v1/relation_tables/<int:relation_table_id>/graph/',
         RelationTableGraphAPI.as_view(),
         name='relation_table_graph',
     ),
+    path('v1/relation_tables/graphs/', RelationTableGraphsAPI.as_view(), name='relation_table_graphs'),
+    path(
+        'v1/relation_tables/<int:relation_table_id>/layout/',
+        RelationTableLayoutAPI.as_view(),
+        name='relation_table_layout',
+    ),
+    path(
+        'v1/relation_tables/<int:relation_table_id>/load_order/',
+        RelationTableLoadOrderAPI.as_view(),
+        name='relation_table_load_order',
+    ),
     path(
         'v1/relation_tables/<int:relation_table_id>/load_snapshot/',
         RelationTableLoadSnapshotAPI.as_view(),
@@ -29,5 +51,19 @@ urlpatterns = [
         RelationTableSaveSnapshotAPI.as_view(),
         name='relation_table_save_snapshot',
     ),
+    path(
+        'v1/relation_tables/<int:relation_table_id>/snapshots/',
+        RelationTableSnapshotsListAPI.as_view(),
+        name='relation_table_snapshots',
+    ),
+    path(
+        'v1/relation_tables/<int:relation_table_id>/snapshots/<int:snapshot_id>/',
+        RelationTableSnapshotAPI.as_view(),
+        name='relation_table_snapshot',
+    ),
+    path('v1/search/', SearchAPI.as_view(), name='search'),
+    path('v1/changes/', ChangesAPI.as_view(), name='changes'),
     path('v1/sync/', SyncAPI.as_view(), name='sync'),
+    path('v1/operations/validate/', OperationsValidateAPI.as_view(), name='operations_validate'),
+    path('v1/metrics/', MetricsAPI.as_view(), name='metrics'),
 ]
@@ -0,0 +1,210 @@
+from pathlib import Path
+from random import Random
+from statistics import mean, median
+from time import perf_counter
+from typing import Callable
+import json
+
+from django.db.models import Count
+from django.test import Client
+from django.urls import reverse
+
+from apps.instance.models import Project, Store, RelationTable, RelationTableGraphSnapshot
+from apps.instance.utils.graph import RelationTableGraphUtil
+from apps.instance.utils.instance_processor import InstanceProcessor
+
+
+def make_synthetic_operations(
+    projects: int,
+    stores: int,
+    tables: int,
+    fields: int,
+    fk_density: float,
+    seed: int = 0,
+) -> list[list]:
+    random = Random(seed)
+    operations = []
+    for project_number in range(projects):
+        project_name = f'project_{project_number}'
+        operations.append([1, project_name])
+        for store_number in range(stores):
+            store_name = f'store_{store_number}'
+            store_row = f'{project_name}.stores.relation.{store_name}'
+            operations.append([1, store_row])
+            for table_number in range(tables):
+                table_name = f'table_{table_number}'
+                operations.append([1, f'{store_row}.{table_name}'])
+                operations.append([1, f'{store_row}.{table_name}.id', {'type': 'integer', 'order': 1}])
+                for field_number in range(1, fields):
+                    attrs = {'type': 'integer', 'order': field_number + 1}
+                    if table_number and random.random() < fk_density:
+                        attrs['field'] = f'{project_name}.{store_name}.table_{random.randrange(table_number)}.id'
+
+                    operations.append([1, f'{store_row}.{table_name}.field_{field_number}', attrs])
+
+    return operations
+
+
+def measure(func: Callable, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        started = perf_counter()
+        func()
+        timings.append((perf_counter() - started) * 1000)
+
+    return {
+        'repeat': repeat,
+        'min_ms': round(min(timings), 3),
+        'mean_ms': round(mean(timings), 3),
+        'median_ms': round(median(timings), 3),
+        'max_ms': round(max(timings), 3),
+    }
+
+
+class Benchmark:
+
+    def __init__(
+        self,
+        projects: int,
+        stores: int,
+        tables: int,
+        fields: int,
+        fk_density: float,
+        repeat: int,
+        seed: int = 0,
+    ):
+        self.scale = {
+            'projects': projects,
+            'stores': stores,
+            'tables': tables,
+            'fields': fields,
+            'fk_density': fk_density,
+            'seed': seed,
+        }
+        self.repeat = repeat
+        self.client = Client()
+        self.results: dict[str, dict] = {}
+
+    def _measure(self, name: str, func: Callable, repeat: int = None) -> None:
+        self.results[name] = measure(func=func, repeat=repeat or self.repeat)
+
+    def _measure_view(self, name: str, method: str, url: str, data: dict = None) -> None:
+        def _request():
+            if method == 'post':
+                response = self.client.post(url, data=data or {}, content_type='application/json')
+            else:
+                response = self.client.get(url)
+
+            if response.status_code >= 400:
+                raise AssertionError(f'{url} responded with {response.status_code}')
+
+        self._measure(name=f'view:{name}', func=_request)
+
+    def run(self) -> dict:
+        operations = make_synthetic_operations(**self.scale)
+        self._measure(
+            name='instance_processor.process',
+            func=lambda: InstanceProcessor().process(operations=operations),
+            repeat=1,
+        )
+        self._measure(name='graph.get_actual_graphs', func=RelationTableGraphUtil.get_actual_graphs)
+        self._measure_view(name='sync', method='post', url=reverse('sync'))
+
+        graphs = RelationTableGraphUtil.get_graphs()
+        largest_graph = max(graphs, key=len) if graphs else set()
+        relation_table_id = min(largest_graph) if largest_graph else RelationTable.objects.values('id').first()['id']
+        self._measure(
+            name='graph.get_graph',
+            func=lambda: RelationTableGraphUtil.get_graph(relation_table_id=relation_table_id),
+        )
+
+        project_id = Project.objects.values_list('id', flat=True).first()
+        store_id = (
+            Store.objects.annotate(tables_count=Count('relationtable'))
+            .order_by('-tables_count')
+            .values_list('id', flat=True)
+            .first()
+        )
+        self._measure_view(name='projects', method='get', url=reverse('projects'))
+        self._measure_view(name='stores', method='get', url=reverse('stores', args=[project_id]))
+        self._measure_view(name='store_stats', method='get', url=reverse('store_stats', args=[project_id]))
+        self._measure_view(name='relation_tables', method='get', url=reverse('relation_tables', args=[store_id]))
+        self._measure_view(
+            name='relation_table_graph',
+            method='get',
+            url=reverse('relation_table_graph', args=[relation_table_id]),
+        )
+        self._measure_view(
+            name='relation_table_graphs',
+            method='get',
+            url=f'{reverse("relation_table_graphs")}?'
+            + '&'.join(f'relation_table_ids={graph_table_id}' for graph_table_id in sorted(largest_graph)[:100]),
+        )
+        self._measure_view(
+            name='relation_table_layout',
+            method='get',
+            url=reverse('relation_table_layout', args=[relation_table_id]),
+        )
+        self._measure_view(
+            name='relation_table_load_order',
+            method='get',
+            url=reverse('relation_table_load_order', args=[relation_table_id]),
+        )
+        snapshot = {
+            'nodes': [{'id': table_id, 'position': {'x': 0, 'y': 0}} for table_id in sorted(largest_graph)],
+            'edges': [],
+        }
+        self._measure_view(
+            name='relation_table_save_snapshot',
+            method='post',
+            url=reverse('relation_table_save_snapshot', args=[relation_table_id]),
+            data=snapshot,
+        )
+        self._measure_view(
+            name='relation_table_load_snapshot',
+            method='get',
+            url=reverse('relation_table_load_snapshot', args=[relation_table_id]),
+        )
+        self._measure_view(
+            name='relation_table_snapshots',
+            method='get',
+            url=reverse('relation_table_snapshots', args=[relation_table_id]),
+        )
+        snapshot_id = (
+            RelationTableGraphSnapshot.objects.filter(graph__relationtable__id=relation_table_id)
+            .order_by('-created_at', '-id')
+            .values_list('id', flat=True)
+            .first()
+        )
+        self._measure_view(
+            name='relation_table_snapshot',
+            method='get',
+            url=reverse('relation_table_snapshot', args=[relation_table_id, snapshot_id]),
+        )
+        self._measure_view(
+            name='relation_table_snapshot_restore',
+            method='post',
+            url=reverse('relation_table_snapshot', args=[relation_table_id, snapshot_id]),
+        )
+        self._measure_view(name='search', method='get', url=f'{reverse("search")}?q=table_1')
+        self._measure_view(name='changes', method='get', url=f'{reverse("changes")}?since=0')
+        self._measure_view(name='metrics', method='get', url=reverse('metrics'))
+        self._measure_view(
+            name='operations_validate',
+            method='post',
+            url=reverse('operations_validate'),
+            data={'operations': make_synthetic_operations(**self.scale)[:1000]},
+        )
+        return {
+            'scale': self.scale,
+            'operations': len(operations),
+            'largest_graph': len(largest_graph),
+            'results': self.results,
+        }
+
+    def dump(self, path: Path) -> dict:
+        report = self.run()
+        with path.open(mode='w') as json_file:
+            json.dump(report, json_file, indent=2)
+
+        return report
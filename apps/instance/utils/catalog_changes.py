@@ -0,0 +1,34 @@
+from typing import Iterable, Optional
+
+from django.db import transaction
+from django.db.models import F
+
+from apps.instance.models import CatalogChange, CatalogVersion
+
+
+_CATALOG_VERSION_ID = 1
+
+_BULK_BATCH_SIZE = 1000
+
+
+def get_catalog_version() -> int:
+    return CatalogVersion.objects.filter(id=_CATALOG_VERSION_ID).values_list('version', flat=True).first() or 0
+
+
+def record_catalog_changes(changes: Iterable[tuple[str, str, str, Optional[int]]]) -> None:
+    changes = list(changes)
+    if not changes:
+        return
+
+    # The counter row stays locked until commit, so versions become visible in increasing order.
+    with transaction.atomic():
+        CatalogVersion.objects.select_for_update().get_or_create(id=_CATALOG_VERSION_ID)
+        CatalogVersion.objects.filter(id=_CATALOG_VERSION_ID).update(version=F('version') + len(changes))
+        version = get_catalog_version() - len(changes)
+        CatalogChange.objects.bulk_create(
+            [
+                CatalogChange(version=version + number, action=action, model=model, name=name, object_id=object_id)
+                for number, (action, model, name, object_id) in enumerate(changes, start=1)
+            ],
+            batch_size=_BULK_BATCH_SIZE,
+        )
@@ -0,0 +1,237 @@
+from array import array
+from datetime import datetime
+from pathlib import Path
+from zipfile import ZIP_DEFLATED, ZipFile
+import json
+import sys
+
+from django.conf import settings
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from apps.instance.models import (
+    CatalogChange,
+    Project,
+    Store,
+    StoreStats,
+    RelationTableGraph,
+    RelationTableGraphSnapshot,
+    RelationTable,
+    RelationTableField,
+)
+from apps.instance.utils.catalog_changes import record_catalog_changes
+from apps.instance.utils.snapshot import restore_snapshot_files
+from apps.instance.utils.store_stats import recompute_store_stats
+
+
+FORMAT_VERSION = 1
+
+_INT_COLUMN = 'int'
+_NULLABLE_INT_COLUMN = 'nullable_int'
+_STR_COLUMN = 'str'
+_DATETIME_COLUMN = 'datetime'
+_SNAPSHOT_COLUMN = 'snapshot'
+
+_BULK_BATCH_SIZE = 2000
+
+_SNAPSHOTS_DIR = 'snapshots'
+
+_TABLES = (
+    ('project', Project, (('id', _INT_COLUMN), ('name', _STR_COLUMN))),
+    (
+        'store',
+        Store,
+        (('id', _INT_COLUMN), ('name', _STR_COLUMN), ('type', _STR_COLUMN), ('project_id', _INT_COLUMN)),
+    ),
+    ('relation_table_graph', RelationTableGraph, (('id', _INT_COLUMN), ('snapshot', _SNAPSHOT_COLUMN))),
+    (
+        'relation_table_graph_snapshot',
+        RelationTableGraphSnapshot,
+        (('id', _INT_COLUMN), ('graph_id', _INT_COLUMN), ('hash', _STR_COLUMN), ('created_at', _DATETIME_COLUMN)),
+    ),
+    (
+        'relation_table',
+        RelationTable,
+        (('id', _INT_COLUMN), ('name', _STR_COLUMN), ('store_id', _INT_COLUMN), ('graph_id', _NULLABLE_INT_COLUMN)),
+    ),
+    (
+        'relation_table_field',
+        RelationTableField,
+        (
+            ('id', _INT_COLUMN),
+            ('name', _STR_COLUMN),
+            ('type', _STR_COLUMN),
+            ('order', _INT_COLUMN),
+            ('field_id', _NULLABLE_INT_COLUMN),
+            ('relation_table_id', _INT_COLUMN),
+        ),
+    ),
+)
+
+
+class CatalogDumpError(Exception):
+    pass
+
+
+def _encode_column(kind: str, values: list) -> bytes:
+    if kind in (_INT_COLUMN, _NULLABLE_INT_COLUMN):
+        column = array('q', (value or 0 for value in values))
+        if sys.byteorder == 'big':
+            column.byteswap()
+
+        return column.tobytes()
+
+    if kind == _DATETIME_COLUMN:
+        values = [value.isoformat() for value in values]
+    elif kind == _SNAPSHOT_COLUMN:
+        values = [Path(value).stem if value else '' for value in values]
+
+    return b'\0'.join(value.encode(encoding='utf-8') for value in values)
+
+
+def _decode_column(kind: str, data: bytes, rows: int) -> list:
+    if kind in (_INT_COLUMN, _NULLABLE_INT_COLUMN):
+        column = array('q')
+        column.frombytes(data)
+        if sys.byteorder == 'big':
+            column.byteswap()
+
+        if kind == _NULLABLE_INT_COLUMN:
+            return [value or None for value in column]
+
+        return column.tolist()
+
+    values = data.decode(encoding='utf-8').split('\0') if rows else []
+    if kind == _DATETIME_COLUMN:
+        return [datetime.fromisoformat(value) for value in values]
+
+    if kind == _SNAPSHOT_COLUMN:
+        return [
+            str(Path(settings.RELATION_TABLE_SNAPSHOTS_DIR, f'{value}.json')) if value else None for value in values
+        ]
+
+    return values
+
+
+def dump_catalog(path: Path) -> dict[str, int]:
+    manifest = {'format': FORMAT_VERSION, 'tables': {}}
+    with transaction.atomic(), ZipFile(path, mode='w', compression=ZIP_DEFLATED) as zip_file:
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ')
+
+        for table_name, model, columns in _TABLES:
+            rows = list(model.objects.order_by('id').values_list(*(column for column, _ in columns)))
+            values = list(zip(*rows)) if rows else [[] for _ in columns]
+            for (column, kind), column_values in zip(columns, values):
+                zip_file.writestr(f'{table_name}/{column}', _encode_column(kind=kind, values=list(column_values)))
+
+            manifest['tables'][table_name] = {'rows': len(rows), 'columns': [list(column) for column in columns]}
+
+        manifest['snapshots'] = _dump_snapshot_files(zip_file=zip_file)
+        zip_file.writestr('manifest.json', json.dumps(manifest))
+
+    return {table_name: table['rows'] for table_name, table in manifest['tables'].items()}
+
+
+def _dump_snapshot_files(zip_file: ZipFile) -> int:
+    snapshot_hashes = set(RelationTableGraphSnapshot.objects.values_list('hash', flat=True))
+    snapshot_hashes.update(
+        Path(snapshot).stem
+        for snapshot in RelationTableGraph.objects.filter(snapshot__isnull=False).values_list('snapshot', flat=True)
+    )
+    dumped = 0
+    for snapshot_hash in sorted(snapshot_hashes):
+        file_path = Path(settings.RELATION_TABLE_SNAPSHOTS_DIR, f'{snapshot_hash}.json')
+        if file_path.exists():
+            zip_file.write(file_path, arcname=f'{_SNAPSHOTS_DIR}/{file_path.name}')
+            dumped += 1
+
+    return dumped
+
+
+def _drop_missing_snapshots(tables: dict[str, dict[str, list]], snapshot_hashes: set[str]) -> None:
+    graphs = tables['relation_table_graph']
+    graphs['snapshot'] = [
+        snapshot if snapshot and Path(snapshot).stem in snapshot_hashes else None for snapshot in graphs['snapshot']
+    ]
+    snapshots = tables['relation_table_graph_snapshot']
+    positions = [
+        position for position, snapshot_hash in enumerate(snapshots['hash']) if snapshot_hash in snapshot_hashes
+    ]
+    for column, values in snapshots.items():
+        snapshots[column] = [values[position] for position in positions]
+
+
+def _delete_catalog() -> None:
+    quote_name = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {quote_name(StoreStats._meta.db_table)}')
+        for _, model, _ in reversed(_TABLES):
+            cursor.execute(f'DELETE FROM {quote_name(model._meta.db_table)}')
+
+
+def _get_graphs(graph_ids: list[int | None], relation_table_ids: list[int]) -> list[list[int]]:
+    graphs: dict[int, list[int]] = {}
+    for graph_id, relation_table_id in zip(graph_ids, relation_table_ids):
+        graphs.setdefault(graph_id if graph_id is not None else -relation_table_id, []).append(relation_table_id)
+
+    return list(graphs.values())
+
+
+def _write_stash_file(graphs: list[list[int]]) -> None:
+    with settings.STASH_FILE_PATH.open(mode='w') as json_file:
+        json.dump({'relation_table_graphs': graphs, 'is_actual': True}, json_file)
+
+
+def restore_catalog(path: Path) -> dict[str, int]:
+    with ZipFile(path) as zip_file:
+        manifest = json.loads(zip_file.read('manifest.json'))
+        if manifest.get('format') != FORMAT_VERSION:
+            raise CatalogDumpError(f'unsupported catalog dump format {manifest.get("format")}')
+
+        tables = {}
+        for table_name, model, columns in _TABLES:
+            table = manifest['tables'][table_name]
+            if table['columns'] != [list(column) for column in columns]:
+                raise CatalogDumpError(f'unexpected columns for {table_name}')
+
+            tables[table_name] = {
+                column: _decode_column(kind=kind, data=zip_file.read(f'{table_name}/{column}'), rows=table['rows'])
+                for column, kind in columns
+            }
+
+        snapshot_files = {
+            Path(name).stem: zip_file.read(name)
+            for name in zip_file.namelist()
+            if name.startswith(f'{_SNAPSHOTS_DIR}/')
+        }
+
+    with transaction.atomic():
+        _drop_missing_snapshots(tables=tables, snapshot_hashes=restore_snapshot_files(files=snapshot_files))
+        _delete_catalog()
+        for table_name, model, columns in _TABLES:
+            table = tables[table_name]
+            objects = model.objects.bulk_create(
+                [model(**dict(zip(table, row))) for row in zip(*table.values())],
+                batch_size=_BULK_BATCH_SIZE,
+            )
+            datetime_columns = [column for column, kind in columns if kind == _DATETIME_COLUMN]
+            if datetime_columns:
+                for obj, *values in zip(objects, *(table[column] for column in datetime_columns)):
+                    for column, value in zip(datetime_columns, values):
+                        setattr(obj, column, value)
+
+                model.objects.bulk_update(objects, fields=datetime_columns, batch_size=_BULK_BATCH_SIZE)
+
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), [model for _, model, _ in _TABLES]):
+                cursor.execute(sql)
+
+        relation_tables = tables['relation_table']
+        graphs = _get_graphs(graph_ids=relation_tables['graph_id'], relation_table_ids=relation_tables['id'])
+        recompute_store_stats(graphs=graphs)
+        record_catalog_changes(changes=[(CatalogChange.SYNC_ACTION, 'catalog', '', None)])
+        transaction.on_commit(lambda: _write_stash_file(graphs=graphs))
+
+    return {table_name: manifest['tables'][table_name]['rows'] for table_name, _, _ in _TABLES}
@@ -0,0 +1,183 @@
+from typing import Iterable, Optional
+
+from apps.instance.models import Project, Store, RelationTable, RelationTableField
+from apps.instance.utils.instance_tree import (
+    RELATION_STORE_MODEL,
+    RELATION_TABLE_MODEL,
+    RELATION_TABLE_FIELD_MODEL,
+)
+
+
+class CatalogIndex:
+
+    def __init__(self):
+        self.project_ids: dict[str, int] = {}
+        self.store_ids: dict[str, int] = {}
+        self.relation_table_ids: dict[str, int] = {}
+        self.relation_table_field_ids: dict[str, int] = {}
+        self.relation_table_field_attrs: dict[str, dict] = {}
+        self.relation_table_field_names: dict[int, str] = {}
+        self._children: dict[str, set[str]] = {}
+
+    def _add_child(self, name: str) -> None:
+        self._children.setdefault(name.rsplit('.', 1)[0], set()).add(name)
+
+    def add_project(self, name: str, project_id: int) -> None:
+        self.project_ids[name] = project_id
+
+    def add_store(self, name: str, store_id: int) -> None:
+        self.store_ids[name] = store_id
+        self._add_child(name=name)
+
+    def add_relation_table(self, name: str, relation_table_id: int) -> None:
+        self.relation_table_ids[name] = relation_table_id
+        self._add_child(name=name)
+
+    def add_relation_table_field(self, name: str, relation_table_field_id: int) -> None:
+        self.relation_table_field_ids[name] = relation_table_field_id
+        self.relation_table_field_names[relation_table_field_id] = name
+        self._add_child(name=name)
+
+    @classmethod
+    def load(cls, project_names: Optional[Iterable[str]] = None, with_field_attrs: bool = False) -> 'CatalogIndex':
+        index = cls()
+        projects_qs = Project.objects.all()
+        stores_qs = Store.objects.all()
+        relation_tables_qs = RelationTable.objects.all()
+        relation_table_fields_qs = RelationTableField.objects.all()
+        if project_names is not None:
+            project_names = set(project_names)
+            projects_qs = projects_qs.filter(name__in=project_names)
+            stores_qs = stores_qs.filter(project__name__in=project_names)
+            relation_tables_qs = relation_tables_qs.filter(store__project__name__in=project_names)
+            relation_table_fields_qs = relation_table_fields_qs.filter(
+                relation_table__store__project__name__in=project_names,
+            )
+
+        project_names_by_id: dict[int, str] = {}
+        for project_id, name in projects_qs.values_list('id', 'name'):
+            project_names_by_id[project_id] = name
+            index.add_project(name=name, project_id=project_id)
+
+        store_names_by_id: dict[int, str] = {}
+        for store_id, name, project_id in stores_qs.values_list('id', 'name', 'project_id'):
+            store_name = f'{project_names_by_id[project_id]}.{name}'
+            store_names_by_id[store_id] = store_name
+            index.add_store(name=store_name, store_id=store_id)
+
+        relation_table_names_by_id: dict[int, str] = {}
+        for relation_table_id, name, store_id in relation_tables_qs.values_list('id', 'name', 'store_id'):
+            relation_table_name = f'{store_names_by_id[store_id]}.{name}'
+            relation_table_names_by_id[relation_table_id] = relation_table_name
+            index.add_relation_table(name=relation_table_name, relation_table_id=relation_table_id)
+
+        if not with_field_attrs:
+            for field_id, name, relation_table_id in relation_table_fields_qs.values_list(
+                'id',
+                'name',
+                'relation_table_id',
+            ):
+                index.add_relation_table_field(
+                    name=f'{relation_table_names_by_id[relation_table_id]}.{name}',
+                    relation_table_field_id=field_id,
+                )
+
+            return index
+
+        field_names_by_id: dict[int, str] = {}
+        fk_field_ids: dict[str, int] = {}
+        for field_id, name, field_type, order, fk_field_id, relation_table_id in relation_table_fields_qs.values_list(
+            'id',
+            'name',
+            'type',
+            'order',
+            'field_id',
+            'relation_table_id',
+        ):
+            field_name = f'{relation_table_names_by_id[relation_table_id]}.{name}'
+            field_names_by_id[field_id] = field_name
+            index.add_relation_table_field(name=field_name, relation_table_field_id=field_id)
+            index.relation_table_field_attrs[field_name] = {'type': field_type, 'order': order, 'field': None}
+            if fk_field_id is not None:
+                fk_field_ids[field_name] = fk_field_id
+
+        missing_fk_field_ids = set(fk_field_ids.values()).difference(field_names_by_id)
+        if missing_fk_field_ids:
+            field_names_by_id.update(cls._get_field_names(field_ids=missing_fk_field_ids))
+
+        for field_name, fk_field_id in fk_field_ids.items():
+            index.relation_table_field_attrs[field_name]['field'] = field_names_by_id.get(fk_field_id)
+
+        return index
+
+    def _discard_children(self, name: str, ids_by_model: tuple[tuple[str, dict[str, int]], ...]) -> list[tuple]:
+        (model, ids), *child_ids_by_model = ids_by_model
+        discarded = []
+        for child_name in self._children.pop(name, ()):
+            child_id = ids.pop(child_name, None)
+            if child_id is None:
+                continue
+
+            discarded.append((model, child_name, child_id))
+            if model == RELATION_TABLE_FIELD_MODEL:
+                self.relation_table_field_names.pop(child_id, None)
+                self.relation_table_field_attrs.pop(child_name, None)
+            else:
+                discarded.extend(self._discard_children(name=child_name, ids_by_model=tuple(child_ids_by_model)))
+
+        return discarded
+
+    def _discard_from_parent(self, name: str) -> None:
+        siblings = self._children.get(name.rsplit('.', 1)[0])
+        if siblings is not None:
+            siblings.discard(name)
+
+    def discard_project(self, name: str) -> list[tuple[str, str, int]]:
+        self.project_ids.pop(name, None)
+        return self._discard_children(
+            name=name,
+            ids_by_model=(
+                (RELATION_STORE_MODEL, self.store_ids),
+                (RELATION_TABLE_MODEL, self.relation_table_ids),
+                (RELATION_TABLE_FIELD_MODEL, self.relation_table_field_ids),
+            ),
+        )
+
+    def discard_store(self, name: str) -> list[tuple[str, str, int]]:
+        self.store_ids.pop(name, None)
+        self._discard_from_parent(name=name)
+        return self._discard_children(
+            name=name,
+            ids_by_model=(
+                (RELATION_TABLE_MODEL, self.relation_table_ids),
+                (RELATION_TABLE_FIELD_MODEL, self.relation_table_field_ids),
+            ),
+        )
+
+    def discard_relation_table(self, name: str) -> list[tuple[str, str, int]]:
+        self.relation_table_ids.pop(name, None)
+        self._discard_from_parent(name=name)
+        return self._discard_children(
+            name=name,
+            ids_by_model=((RELATION_TABLE_FIELD_MODEL, self.relation_table_field_ids),),
+        )
+
+    def discard_relation_table_field(self, name: str) -> None:
+        relation_table_field_id = self.relation_table_field_ids.pop(name, None)
+        self.relation_table_field_names.pop(relation_table_field_id, None)
+        self.relation_table_field_attrs.pop(name, None)
+        self._discard_from_parent(name=name)
+
+    @staticmethod
+    def _get_field_names(field_ids: Iterable[int]) -> dict[int, str]:
+        queryset = RelationTableField.objects.filter(id__in=field_ids).values_list(
+            'id',
+            'name',
+            'relation_table__name',
+            'relation_table__store__name',
+            'relation_table__store__project__name',
+        )
+        return {
+            field_id: f'{project_name}.{store_name}.{relation_table_name}.{name}'
+            for field_id, name, relation_table_name, store_name, project_name in queryset
+        }
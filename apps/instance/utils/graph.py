@@ -1,56 +1,164 @@
+from typing import Iterable, Optional
 import json
 
 from django.conf import settings
+from django.db import connection, transaction
+
+from apps.instance.utils.metrics import FILE_IO_TIMING, timing
+
+
+_BULK_BATCH_SIZE = 1000
+
+_graphs_cache: Optional[tuple[tuple, list[set[int]], dict[int, int]]] = None
 
 
 class RelationTableGraphUtil:
 
     @staticmethod
-    def get_actual_graphs() -> list[set[int]]:
-        from apps.instance.models import RelationTableField
+    def get_graph_key(graph: set[int]) -> str:
+        return str(min(graph))
+
+    @staticmethod
+    def build_graphs(
+        relation_table_ids: Iterable[int],
+        relations: Iterable[tuple[int, Optional[int]]],
+    ) -> list[set[int]]:
+        parents: dict[int, int] = {relation_table_id: relation_table_id for relation_table_id in relation_table_ids}
+
+        def _find(table_id: int) -> int:
+            root = parents.setdefault(table_id, table_id)
+            while root != parents[root]:
+                root = parents[root]
+
+            while table_id != root:
+                parents[table_id], table_id = root, parents[table_id]
+
+            return root
 
-        relations = RelationTableField.objects.values_list('relation_table_id', 'field__relation_table_id')
-        table_id_pairs = set()
         for source_table_id, destination_table_id in relations:
-            if destination_table_id is None:
-                destination_table_id = source_table_id
+            source_root = _find(source_table_id)
+            if destination_table_id is not None:
+                destination_root = _find(destination_table_id)
+                if source_root != destination_root:
+                    parents[destination_root] = source_root
 
-            table_id_pairs.add((source_table_id, destination_table_id))
+        graphs: dict[int, set[int]] = {}
+        for table_id in list(parents):
+            graphs.setdefault(_find(table_id), set()).add(table_id)
 
-        vertexes: dict[int, set[int]] = {}
-        for source_table_id, destination_table_id in table_id_pairs:
-            vertexes.setdefault(source_table_id, {source_table_id}).add(destination_table_id)
-            vertexes.setdefault(destination_table_id, {destination_table_id}).add(source_table_id)
+        return list(graphs.values())
 
-        graphs = []
-        for dependencies in vertexes.values():
-            if not graphs:
-                graphs.append(dependencies)
-                continue
+    @classmethod
+    def get_actual_graphs(cls) -> list[set[int]]:
+        from apps.instance.models import RelationTable, RelationTableField
 
-            need_new_graph = True
-            for graph in graphs:
-                if graph.intersection(dependencies):
-                    graph.update(dependencies)
-                    need_new_graph = False
-                    break
+        return cls.build_graphs(
+            relation_table_ids=RelationTable.objects.values_list('id', flat=True),
+            relations=RelationTableField.objects.filter(field__isnull=False)
+            .values_list('relation_table_id', 'field__relation_table_id')
+            .distinct(),
+        )
 
-            if need_new_graph:
-                graphs.append(dependencies)
+    @staticmethod
+    def _match_graph_rows(graphs: list[set[int]], graph_ids: dict[int, Optional[int]]) -> list[Optional[int]]:
+        matched_graph_ids: list[Optional[int]] = [None] * len(graphs)
+        claimed_graph_ids: set[int] = set()
+        for graph_number in sorted(range(len(graphs)), key=lambda number: -len(graphs[number])):
+            counts: dict[int, int] = {}
+            for table_id in graphs[graph_number]:
+                graph_id = graph_ids.get(table_id)
+                if graph_id is not None and graph_id not in claimed_graph_ids:
+                    counts[graph_id] = counts.get(graph_id, 0) + 1
 
-        return graphs
+            if counts:
+                graph_id = max(counts, key=lambda candidate_id: (counts[candidate_id], -candidate_id))
+                matched_graph_ids[graph_number] = graph_id
+                claimed_graph_ids.add(graph_id)
+
+        return matched_graph_ids
+
+    @classmethod
+    def save_graphs(cls, graphs: list[set[int]]) -> None:
+        from apps.instance.models import RelationTable, RelationTableGraph
+
+        with transaction.atomic():
+            graph_ids = dict(RelationTable.objects.values_list('id', 'graph_id'))
+            members: dict[int, set[int]] = {}
+            for table_id, graph_id in graph_ids.items():
+                if graph_id is not None:
+                    members.setdefault(graph_id, set()).add(table_id)
+
+            matched_graph_ids = cls._match_graph_rows(graphs=graphs, graph_ids=graph_ids)
+            RelationTableGraph.objects.exclude(id__in=[graph_id for graph_id in matched_graph_ids if graph_id]).delete()
+            RelationTableGraph.objects.filter(
+                id__in=[
+                    graph_id
+                    for graph_id, graph in zip(matched_graph_ids, graphs)
+                    if graph_id is not None and members[graph_id] != graph
+                ],
+            ).update(snapshot=None)
+
+            new_graph_rows = [RelationTableGraph() for graph_id in matched_graph_ids if graph_id is None]
+            if connection.features.can_return_rows_from_bulk_insert:
+                RelationTableGraph.objects.bulk_create(new_graph_rows, batch_size=_BULK_BATCH_SIZE)
+            else:
+                for graph_row in new_graph_rows:
+                    graph_row.save(force_insert=True)
+
+            new_graph_ids = iter(graph_row.id for graph_row in new_graph_rows)
+            matched_graph_ids = [graph_id or next(new_graph_ids) for graph_id in matched_graph_ids]
+            RelationTable.objects.bulk_update(
+                [
+                    RelationTable(id=table_id, graph_id=graph_id)
+                    for graph_id, graph in zip(matched_graph_ids, graphs)
+                    for table_id in graph
+                    if graph_ids.get(table_id) != graph_id
+                ],
+                fields=['graph'],
+                batch_size=_BULK_BATCH_SIZE,
+            )
 
     @staticmethod
-    def get_graphs() -> list[set[int]]:
-        with settings.STASH_FILE_PATH.open() as json_file:
-            graphs = json.load(json_file)
+    def _get_graphs_cache() -> tuple[list[set[int]], dict[int, int]]:
+        global _graphs_cache
+
+        stat = settings.STASH_FILE_PATH.stat()
+        cache_key = (str(settings.STASH_FILE_PATH), stat.st_mtime_ns, stat.st_size)
+        if _graphs_cache is None or _graphs_cache[0] != cache_key:
+            with timing(name=FILE_IO_TIMING), settings.STASH_FILE_PATH.open() as json_file:
+                data = json.load(json_file)
+
+            graphs = [set(graph) for graph in data['relation_table_graphs']]
+            graph_numbers = {
+                relation_table_id: graph_number
+                for graph_number, graph in enumerate(graphs)
+                for relation_table_id in graph
+            }
+            _graphs_cache = (cache_key, graphs, graph_numbers)
 
-        return [set(graph) for graph in graphs['relation_table_graphs']]
+        return _graphs_cache[1], _graphs_cache[2]
 
     @classmethod
-    def get_graph(cls, relation_table_id: int) -> set[int]:
-        for graph in cls.get_graphs():
-            if relation_table_id in graph:
-                return graph
+    def get_graphs(cls) -> list[set[int]]:
+        graphs, _ = cls._get_graphs_cache()
+        return graphs
+
+    @classmethod
+    def get_graphs_by_relation_table_ids(cls, relation_table_ids: Iterable[int]) -> list[tuple[list[int], set[int]]]:
+        graphs, graph_numbers = cls._get_graphs_cache()
+        requested_relation_table_ids: dict[int, list[int]] = {}
+        for relation_table_id in sorted(set(relation_table_ids)):
+            graph_number = graph_numbers.get(relation_table_id)
+            if graph_number is not None:
+                requested_relation_table_ids.setdefault(graph_number, []).append(relation_table_id)
 
-        return set()
+        return [
+            (graph_relation_table_ids, graphs[graph_number])
+            for graph_number, graph_relation_table_ids in requested_relation_table_ids.items()
+        ]
+
+    @classmethod
+    def get_graph(cls, relation_table_id: int) -> set[int]:
+        graphs, graph_numbers = cls._get_graphs_cache()
+        graph_number = graph_numbers.get(relation_table_id)
+        return graphs[graph_number] if graph_number is not None else set()
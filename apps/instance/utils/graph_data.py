@@ -0,0 +1,43 @@
+from typing import Iterable
+
+from django.db.models import F, QuerySet
+
+from apps.instance.models import RelationTableField
+from apps.instance.serializers import RelationTableGraphAPIResponseSerializer
+from apps.instance.utils.catalog_changes import get_catalog_version
+from apps.instance.utils.graph import RelationTableGraphUtil
+from apps.instance.utils.json_cache import JsonFileCache
+from apps.instance.utils.metrics import SERIALIZATION_TIMING, timing
+
+
+relation_table_graph_cache = JsonFileCache(directory_setting='RELATION_TABLE_GRAPHS_DIR')
+
+
+def get_relation_table_fields_qs(relation_table_ids: Iterable[int]) -> QuerySet:
+    return (
+        RelationTableField.objects.filter(relation_table_id__in=relation_table_ids)
+        .annotate(
+            table_id=F('relation_table_id'),
+            table_name=F('relation_table__name'),
+            store_id=F('relation_table__store_id'),
+            store_name=F('relation_table__store__name'),
+        )
+        .order_by('table_name', 'order')
+    )
+
+
+def get_relation_table_graph_data(graph: set[int]) -> list:
+    if not graph:
+        return []
+
+    graph_key = RelationTableGraphUtil.get_graph_key(graph=graph)
+    version = str(get_catalog_version())
+    data = relation_table_graph_cache.get(key=graph_key, version=version)
+    if data is None:
+        relation_table_fields = list(get_relation_table_fields_qs(relation_table_ids=graph))
+        with timing(name=SERIALIZATION_TIMING):
+            data = RelationTableGraphAPIResponseSerializer(instance=relation_table_fields, many=True).data
+
+        relation_table_graph_cache.set(key=graph_key, version=version, data=data)
+
+    return data
@@ -1,7 +1,14 @@
+from contextlib import contextmanager, nullcontext
 from copy import copy
-from typing import Optional
+from time import perf_counter
+from typing import ContextManager, Iterable, Iterator, Optional
 
-from apps.instance.models import Project, Store, RelationTable, RelationTableField
+from django.db import connection, transaction
+from django.db.models import Count, QuerySet
+
+from apps.instance.models import CatalogChange, Project, Store, StoreStats, RelationTable, RelationTableField
+from apps.instance.utils.catalog_changes import record_catalog_changes
+from apps.instance.utils.catalog_index import CatalogIndex
 from apps.instance.utils.instance_tree import (
     instance_tree,
     PROJECT_MODEL,
@@ -9,11 +16,35 @@ from apps.instance.utils.instance_tree import (
     RELATION_TABLE_MODEL,
     RELATION_TABLE_FIELD_MODEL,
     InstanceType,
+    InstanceError,
+)
+from apps.instance.utils.processor_hooks import (
+    PARSE_PHASE,
+    CHECK_PHASE,
+    EXECUTE_PHASE,
+    STREAM_PHASE,
+    PhaseStats,
+    ProcessorHook,
 )
+from apps.instance.utils.store_stats import StoreStatsDeltas
 
 
 _CREATE_OPERATION = 1
 _DELETE_OPERATION = 2
+_UPDATE_OPERATION = 3
+
+_OPERATIONS = (_CREATE_OPERATION, _DELETE_OPERATION, _UPDATE_OPERATION)
+
+_CHANGE_ACTIONS = {
+    _CREATE_OPERATION: CatalogChange.CREATE_ACTION,
+    _DELETE_OPERATION: CatalogChange.DELETE_ACTION,
+    _UPDATE_OPERATION: CatalogChange.UPDATE_ACTION,
+}
+
+_BULK_BATCH_SIZE = 1000
+_UNNEST_BATCH_SIZE = 10000
+
+_NULL_CONTEXT = nullcontext()
 
 
 class Operation:
@@ -31,107 +62,311 @@ class Operation:
 class OperationError(Exception):
 
     def __init__(self, operation: Operation, message: str):
+        self.order = operation.order
+        self.model = operation.model
+        self.detail = message
         self.message = (
             f'operation_order: {operation.order}, model: {operation.model}, message: {message}'
         )
         super().__init__(self.message)
 
+    def as_dict(self) -> dict:
+        return {'order': self.order, 'model': self.model, 'message': self.detail, 'caused_by': None}
+
 
 class InstanceProcessor:
 
+    def __init__(self, hooks: Optional[list[ProcessorHook]] = None, catalog_index: Optional[CatalogIndex] = None):
+        self.hooks = hooks or []
+        if catalog_index is not None:
+            self._catalog_index = catalog_index
+
+        self._phase_stats: Optional[PhaseStats] = None
+        self._catalog_changes: list[tuple[str, str, str, Optional[int]]] = []
+        self._store_stats_deltas = StoreStatsDeltas()
+
+    @contextmanager
+    def _phase(self, name: str) -> Iterator[Optional[PhaseStats]]:
+        if not self.hooks:
+            yield None
+            return
+
+        self._phase_stats = PhaseStats(phase=name)
+        started = perf_counter()
+        try:
+            with connection.execute_wrapper(self._phase_stats.execute_wrapper):
+                yield self._phase_stats
+        finally:
+            stats, self._phase_stats = self._phase_stats, None
+            stats.duration = perf_counter() - started
+
+        for hook in self.hooks:
+            hook.phase_finished(stats=stats)
+
+    def _track(self, model: str, operations: int = 1) -> ContextManager:
+        if self._phase_stats is None:
+            return _NULL_CONTEXT
+
+        return self._phase_stats.track(model=model, operations=operations)
+
     def process(self, operations: list[list[int, str, Optional[None | dict]]], stages: Optional[int] = 3):
-        parsed_operations = self.parse(operations=operations)
-        self.check_operations(operations=parsed_operations)
-        self.execute(operations=parsed_operations)
+        with self._phase(name=PARSE_PHASE) as stats:
+            parsed_operations = self.parse(operations=operations)
+            if stats is not None:
+                for operation in parsed_operations:
+                    stats.add(model=operation.model)
+
+        with self._phase(name=CHECK_PHASE):
+            parsed_operations = self.check_operations(operations=parsed_operations)
+
+        with self._phase(name=EXECUTE_PHASE), transaction.atomic():
+            self.execute(operations=parsed_operations)
+            self._flush_catalog_changes()
+            self._store_stats_deltas.flush()
+
+    def process_stream(self, operations: Iterable[list[int, str, Optional[None | dict]]]) -> None:
+        fk_operations: list[Operation] = []
+        deferred_operations: list[Operation] = []
+        with self._phase(name=STREAM_PHASE), transaction.atomic():
+            self.execute(
+                operations=self._iter_checked_operations(
+                    operations=operations,
+                    fk_operations=fk_operations,
+                    deferred_operations=deferred_operations,
+                ),
+            )
+            for operation in fk_operations:
+                with self._track(model=operation.model, operations=0):
+                    self._check_operation_fk_field(operation=operation)
+
+            deferred_operations = self._get_live_operations(operations=deferred_operations)
+            if deferred_operations:
+                self.execute(operations=deferred_operations)
+
+            self._flush_catalog_changes()
+            self._store_stats_deltas.flush()
+
+    def _iter_checked_operations(
+        self,
+        operations: Iterable[list[int, str, Optional[None | dict]]],
+        fk_operations: list[Operation],
+        deferred_operations: list[Operation],
+    ) -> Iterator[Operation]:
+        for operation in self.iter_parse(operations=operations):
+            with self._track(model=operation.model, operations=0):
+                self._check_operation(operation=operation)
+
+            if self._split_fk_field(
+                operation=operation,
+                fk_operations=fk_operations,
+                deferred_operations=deferred_operations,
+            ):
+                yield operation
+
+    def _split_fk_field(
+        self,
+        operation: Operation,
+        fk_operations: list[Operation],
+        deferred_operations: list[Operation],
+    ) -> bool:
+        fk_field = operation.attrs.get('field') if operation.model == RELATION_TABLE_FIELD_MODEL else None
+        if not fk_field:
+            return True
+
+        fk_operation = copy(operation)
+        fk_operation.op_code = _UPDATE_OPERATION
+        fk_operation.attrs = {'name': operation.attrs['name'], 'field': fk_field}
+        fk_operations.append(fk_operation)
+        if fk_field in self.exist_relation_table_field_names:
+            return True
+
+        deferred_operations.append(fk_operation)
+        operation.attrs = {attr_name: value for attr_name, value in operation.attrs.items() if attr_name != 'field'}
+        return operation.op_code != _UPDATE_OPERATION or len(operation.attrs) > 1
+
+    def _get_live_operations(self, operations: list[Operation]) -> list[Operation]:
+        return [
+            operation for operation in operations if operation.attrs['name'] in self.exist_relation_table_field_names
+        ]
+
+    def _flush_catalog_changes(self) -> None:
+        changes, self._catalog_changes = self._catalog_changes, []
+        record_catalog_changes(changes=changes)
+
+    def _null_fks(self, relation_table_fields_qs: QuerySet) -> None:
+        for field_id, store_id, name, relation_table_name, store_name, project_name in (
+            relation_table_fields_qs.values_list(
+                'id',
+                'relation_table__store_id',
+                'name',
+                'relation_table__name',
+                'relation_table__store__name',
+                'relation_table__store__project__name',
+            )
+        ):
+            full_name = f'{project_name}.{store_name}.{relation_table_name}.{name}'
+            attrs = self.catalog_index.relation_table_field_attrs.get(full_name)
+            if attrs is not None:
+                attrs['field'] = None
+
+            self._store_stats_deltas.add_fks(store_id=store_id, delta=-1)
+            self._catalog_changes.append((CatalogChange.UPDATE_ACTION, RELATION_TABLE_FIELD_MODEL, full_name, field_id))
+
+    def _record_child_deletes(self, children: list[tuple[str, str, int]]) -> None:
+        self._catalog_changes.extend(
+            (CatalogChange.DELETE_ACTION, model, name, object_id) for model, name, object_id in children
+        )
+
+    @classmethod
+    def parse(cls, operations: list[list[int, str, Optional[None | dict]]]) -> list[Operation]:
+        return list(cls.iter_parse(operations=operations))
+
+    @classmethod
+    def iter_parse(cls, operations: Iterable[list[int, str, Optional[None | dict]]]) -> Iterator[Operation]:
+        for order, op in enumerate(operations, start=1):
+            yield cls._parse_operation(order=order, op=op)
 
     @staticmethod
-    def parse(operations: list[list[int, str, Optional[None | dict]]]) -> list[Operation]:
+    def _parse_operation(order: int, op: list[int, str, Optional[None | dict]]) -> Operation:
+        if not isinstance(op, (list, tuple)) or len(op) < 2 or len(op) > 3:
+            raise InstanceError('operation must be [op_code, row, attrs?]')
+
+        if op[0] not in _OPERATIONS:
+            raise InstanceError(f'unexpected op_code {op[0]}')
+
+        if not isinstance(op[1], str):
+            raise InstanceError('row must be string')
+
+        attrs = op[2] if len(op) == 3 else None
+        if attrs is not None and not isinstance(attrs, dict):
+            raise InstanceError('attrs must be object or null')
+
+        return Operation(
+            order=order,
+            op_code=op[0],
+            instance_type=instance_tree.parse(row=op[1], attrs=attrs, partial=op[0] == _UPDATE_OPERATION),
+        )
+
+    def validate(self, operations: Iterable[list[int, str, Optional[None | dict]]]) -> list[dict]:
+        errors: list[dict] = []
         parsed_operations: list[Operation] = []
         for order, op in enumerate(operations, start=1):
-            if len(op) < 2 or len(op) > 3:
-                raise
+            try:
+                parsed_operations.append(self._parse_operation(order=order, op=op))
+            except InstanceError as e:
+                errors.append({'order': order, 'model': None, 'message': str(e), 'caused_by': None})
+
+        failed_orders: dict[str, int] = {}
+        for operation in parsed_operations:
+            try:
+                self._check_operation(operation=operation)
+            except OperationError as e:
+                errors.append(self._get_validation_error(error=e, operation=operation, failed_orders=failed_orders))
+
+        for operation in parsed_operations:
+            try:
+                self._check_operation_fk_field(operation=operation)
+            except OperationError as e:
+                errors.append(self._get_validation_error(error=e, operation=operation, failed_orders=failed_orders))
+
+        return sorted(errors, key=lambda error: error['order'])
 
-            if op[0] != _CREATE_OPERATION and op[0] != _DELETE_OPERATION:
-                raise
+    @staticmethod
+    def _get_validation_error(error: OperationError, operation: Operation, failed_orders: dict[str, int]) -> dict:
+        names = [operation.attrs['name']]
+        if operation.model == RELATION_TABLE_FIELD_MODEL and operation.attrs.get('field'):
+            names.append(operation.attrs['field'])
+
+        caused_by = None
+        for name in names:
+            parts = name.split('.')
+            for length in range(1, len(parts) + 1):
+                failed_order = failed_orders.get('.'.join(parts[:length]))
+                if failed_order is not None and failed_order != operation.order:
+                    caused_by = min(failed_order, caused_by or failed_order)
+
+        failed_orders.setdefault(operation.attrs['name'], caused_by or operation.order)
+        return {**error.as_dict(), 'caused_by': caused_by}
 
-            attrs = op[2] if len(op) == 3 else None
-            operation = Operation(
-                order=order,
-                op_code=op[0],
-                instance_type=instance_tree.parse(row=op[1], attrs=attrs),
-            )
-            parsed_operations.append(operation)
+    @property
+    def catalog_index(self) -> CatalogIndex:
+        if not hasattr(self, '_catalog_index'):
+            self._catalog_index = CatalogIndex.load()
 
-        return parsed_operations
+        return self._catalog_index
 
     @property
     def exist_project_names(self):
         if not hasattr(self, '_exist_project_names'):
-            self._exist_project_names = set(Project.objects.values_list('name', flat=True))
+            self._exist_project_names = set(self.catalog_index.project_ids)
 
         return self._exist_project_names
 
     @property
     def exist_store_names(self):
         if not hasattr(self, '_exist_store_names'):
-            queryset = Store.objects.values('name', 'project__name')
-            self._exist_store_names = {f'{store["project__name"]}.{store["name"]}' for store in queryset}
+            self._exist_store_names = set(self.catalog_index.store_ids)
 
         return self._exist_store_names
 
     @property
     def exist_relation_table_names(self):
         if not hasattr(self, '_exist_relation_table_names'):
-            queryset = RelationTable.objects.values('name', 'store__name', 'store__project__name')
-            self._exist_relation_table_names = {
-                f'{table["store__project__name"]}.{table["store__name"]}.{table["name"]}'
-                for table in queryset
-            }
+            self._exist_relation_table_names = set(self.catalog_index.relation_table_ids)
 
         return self._exist_relation_table_names
 
     @property
     def exist_relation_table_field_names(self):
         if not hasattr(self, '_exist_relation_table_field_names'):
-            queryset = RelationTableField.objects.values(
-                'name',
-                'relation_table__name',
-                'relation_table__store__name',
-                'relation_table__store__project__name',
-            )
-            self._exist_relation_table_field_names = {
-                (
-                    f'{field["relation_table__store__project__name"]}.{field["relation_table__store__name"]}.'
-                    f'{field["relation_table__name"]}.{field["name"]}'
-                )
-                for field in queryset
-            }
+            self._exist_relation_table_field_names = set(self.catalog_index.relation_table_field_ids)
 
         return self._exist_relation_table_field_names
 
+    @property
+    def exist_children(self) -> dict[str, set[str]]:
+        if not hasattr(self, '_exist_children'):
+            self._exist_children = {}
+            for names in (
+                self.exist_store_names,
+                self.exist_relation_table_names,
+                self.exist_relation_table_field_names,
+            ):
+                for name in names:
+                    self._exist_children.setdefault(name.rsplit('.', 1)[0], set()).add(name)
+
+        return self._exist_children
+
+    def _add_exist_name(self, names: set[str], name: str) -> None:
+        names.add(name)
+        self.exist_children.setdefault(name.rsplit('.', 1)[0], set()).add(name)
+
+    def _remove_exist_name(self, names: set[str], name: str) -> None:
+        names.remove(name)
+        siblings = self.exist_children.get(name.rsplit('.', 1)[0])
+        if siblings is not None:
+            siblings.discard(name)
+
     def _delete_project_name(self, project_name: str):
-        for store_name in copy(self.exist_store_names):
-            if store_name.startswith(project_name):
-                self._delete_store_name(store_name=store_name)
+        for store_name in self.exist_children.pop(project_name, ()):
+            self._delete_store_name(store_name=store_name)
 
         self.exist_project_names.remove(project_name)
 
     def _delete_store_name(self, store_name: str):
-        for relation_table_name in copy(self.exist_relation_table_names):
-            if relation_table_name.startswith(store_name):
-                self._delete_relation_table_name(relation_table_name=relation_table_name)
+        for relation_table_name in self.exist_children.pop(store_name, ()):
+            self._delete_relation_table_name(relation_table_name=relation_table_name)
 
-        self.exist_store_names.remove(store_name)
+        self._remove_exist_name(names=self.exist_store_names, name=store_name)
 
     def _delete_relation_table_name(self, relation_table_name: str):
-        for relation_table_field_name in copy(self.exist_relation_table_field_names):
-            if relation_table_field_name.startswith(relation_table_name):
-                self._delete_relation_table_field_name(relation_table_field_name=relation_table_field_name)
+        for relation_table_field_name in self.exist_children.pop(relation_table_name, ()):
+            self._delete_relation_table_field_name(relation_table_field_name=relation_table_field_name)
 
-        self.exist_relation_table_names.remove(relation_table_name)
+        self._remove_exist_name(names=self.exist_relation_table_names, name=relation_table_name)
 
     def _delete_relation_table_field_name(self, relation_table_field_name: str):
-        self.exist_relation_table_field_names.remove(relation_table_field_name)
+        self._remove_exist_name(names=self.exist_relation_table_field_names, name=relation_table_field_name)
 
     def _check_project_operation(self, operation: Operation):
         project_name = operation.attrs['name']
@@ -159,7 +394,7 @@ class InstanceProcessor:
             if store_name in self.exist_store_names:
                 raise OperationError(operation=operation, message=f'store with name {store_name} already exists')
 
-            self.exist_store_names.add(store_name)
+            self._add_exist_name(names=self.exist_store_names, name=store_name)
         else:
             if store_name not in self.exist_store_names:
                 raise OperationError(operation=operation, message=f'store with name {store_name} not exists')
@@ -183,7 +418,7 @@ class InstanceProcessor:
                     message=f'relation_table with name {relation_table_name} already exists',
                 )
 
-            self.exist_relation_table_names.add(relation_table_name)
+            self._add_exist_name(names=self.exist_relation_table_names, name=relation_table_name)
         else:
             if relation_table_name not in self.exist_relation_table_names:
                 raise OperationError(
@@ -220,102 +455,344 @@ class InstanceProcessor:
                     message=f'relation_table_field with name {relation_table_field_name} already exists',
                 )
 
-            self.exist_relation_table_field_names.add(relation_table_field_name)
+            self._add_exist_name(names=self.exist_relation_table_field_names, name=relation_table_field_name)
         else:
+            if relation_table_field_name not in self.exist_relation_table_field_names:
+                raise OperationError(
+                    operation=operation,
+                    message=f'relation_table_field with name {relation_table_field_name} not exists',
+                )
+
+            if operation.op_code == _UPDATE_OPERATION:
+                return
+
             self._delete_relation_table_field_name(relation_table_field_name=relation_table_field_name)
 
-    def check_operations(self, operations: list[Operation]) -> None:
-        for operation in operations:
-            if operation.model == PROJECT_MODEL:
-                self._check_project_operation(operation=operation)
-            elif operation.model == RELATION_STORE_MODEL:
-                self._check_relation_store_operation(operation=operation)
-            elif operation.model == RELATION_TABLE_MODEL:
-                self._check_relation_table_operation(operation=operation)
-            elif operation.model == RELATION_TABLE_FIELD_MODEL:
-                self._check_relation_table_field_operation(operation=operation)
+    def _check_operation(self, operation: Operation) -> None:
+        if operation.op_code == _UPDATE_OPERATION and operation.model != RELATION_TABLE_FIELD_MODEL:
+            raise OperationError(operation=operation, message='update is available only for relation_table_field')
+
+        if operation.model == PROJECT_MODEL:
+            self._check_project_operation(operation=operation)
+        elif operation.model == RELATION_STORE_MODEL:
+            self._check_relation_store_operation(operation=operation)
+        elif operation.model == RELATION_TABLE_MODEL:
+            self._check_relation_table_operation(operation=operation)
+        elif operation.model == RELATION_TABLE_FIELD_MODEL:
+            self._check_relation_table_field_operation(operation=operation)
+
+    def _check_operation_fk_field(self, operation: Operation) -> None:
+        if operation.model == RELATION_TABLE_FIELD_MODEL and operation.attrs.get('field'):
+            field = operation.attrs['field']
+            if field not in self.exist_relation_table_field_names:
+                raise OperationError(
+                    operation=operation,
+                    message=f'field with name {operation.attrs["field"]} not exists',
+                )
 
+    def check_operations(self, operations: list[Operation]) -> list[Operation]:
+        fk_operations: list[Operation] = []
+        deferred_operations: list[Operation] = []
+        checked_operations: list[Operation] = []
         for operation in operations:
-            if operation.model == RELATION_TABLE_FIELD_MODEL and operation.attrs.get('field'):
-                field = operation.attrs['field']
-                if field not in self.exist_relation_table_field_names:
-                    raise OperationError(
-                        operation=operation,
-                        message=f'field with name {operation.attrs["field"]} not exists',
-                    )
+            with self._track(model=operation.model):
+                self._check_operation(operation=operation)
 
-    @staticmethod
-    def _execute_project(operation: Operation) -> None:
+            if self._split_fk_field(
+                operation=operation,
+                fk_operations=fk_operations,
+                deferred_operations=deferred_operations,
+            ):
+                checked_operations.append(operation)
+
+        for operation in fk_operations:
+            with self._track(model=operation.model, operations=0):
+                self._check_operation_fk_field(operation=operation)
+
+        checked_operations.extend(self._get_live_operations(operations=deferred_operations))
+        return checked_operations
+
+    def _execute_project(self, operation: Operation) -> None:
+        project_name = operation.attrs['name']
         if operation.op_code == _CREATE_OPERATION:
-            Project.objects.create(**operation.attrs)
+            project_id = Project.objects.create(**operation.attrs).id
+            self.catalog_index.add_project(name=project_name, project_id=project_id)
         else:
-            Project.objects.filter(name=operation.attrs['name']).delete()
+            project_id = self.catalog_index.project_ids[project_name]
+            self._null_fks(
+                relation_table_fields_qs=RelationTableField.objects.filter(
+                    field__relation_table__store__project_id=project_id,
+                ).exclude(relation_table__store__project_id=project_id),
+            )
+            Project.objects.filter(id=project_id).delete()
 
-    @staticmethod
-    def _execute_relation_store(operation: Operation) -> None:
-        project_name, store_name = operation.attrs['name'].split('.')
+        self._catalog_changes.append((_CHANGE_ACTIONS[operation.op_code], PROJECT_MODEL, project_name, project_id))
+        if operation.op_code == _DELETE_OPERATION:
+            self._record_child_deletes(children=self.catalog_index.discard_project(name=project_name))
+
+    def _execute_relation_store(self, operation: Operation) -> None:
+        full_store_name = operation.attrs['name']
+        project_name, store_name = full_store_name.split('.')
         operation.attrs['name'] = store_name
         if operation.op_code == _CREATE_OPERATION:
-            operation.attrs['project_id'] = Project.objects.get(name=project_name).id
-            Store.objects.create(**operation.attrs)
+            operation.attrs['project_id'] = self.catalog_index.project_ids[project_name]
+            store_id = Store.objects.create(**operation.attrs).id
+            StoreStats.objects.create(store_id=store_id)
+            self.catalog_index.add_store(name=full_store_name, store_id=store_id)
         else:
-            Store.objects.filter(name=store_name, project__name=project_name).delete()
+            store_id = self.catalog_index.store_ids[full_store_name]
+            self._null_fks(
+                relation_table_fields_qs=RelationTableField.objects.filter(
+                    field__relation_table__store_id=store_id,
+                ).exclude(relation_table__store_id=store_id),
+            )
+            Store.objects.filter(id=store_id).delete()
 
-    @staticmethod
-    def _execute_relation_table(operation: Operation) -> None:
-        project_name, store_name, relation_table_name = operation.attrs['name'].split('.')
+        self._catalog_changes.append(
+            (_CHANGE_ACTIONS[operation.op_code], RELATION_STORE_MODEL, full_store_name, store_id),
+        )
+        if operation.op_code == _DELETE_OPERATION:
+            self._record_child_deletes(children=self.catalog_index.discard_store(name=full_store_name))
+
+    def _execute_relation_table(self, operation: Operation) -> None:
+        full_relation_table_name = operation.attrs['name']
+        store_name, relation_table_name = full_relation_table_name.rsplit('.', 1)
         operation.attrs['name'] = relation_table_name
+        store_id = self.catalog_index.store_ids[store_name]
         if operation.op_code == _CREATE_OPERATION:
-            operation.attrs['store_id'] = Store.objects.get(
-                name=store_name,
-                project__name=project_name,
-                type=Store.RELATION_STORE,
-            ).id
-            RelationTable.objects.create(**operation.attrs)
+            operation.attrs['store_id'] = store_id
+            relation_table_id = RelationTable.objects.create(**operation.attrs).id
+            self.catalog_index.add_relation_table(
+                name=full_relation_table_name,
+                relation_table_id=relation_table_id,
+            )
+            self._store_stats_deltas.add_tables(store_id=store_id)
         else:
-            RelationTable.objects.filter(
-                name=relation_table_name,
-                store__name=store_name,
-                store__project__name=project_name,
-            ).delete()
+            relation_table_id = self.catalog_index.relation_table_ids[full_relation_table_name]
+            counts = RelationTableField.objects.filter(relation_table_id=relation_table_id).aggregate(
+                fields_count=Count('id'),
+                fk_count=Count('field_id'),
+            )
+            self._store_stats_deltas.add_tables(store_id=store_id, delta=-1)
+            self._store_stats_deltas.add_fields(store_id=store_id, delta=-counts['fields_count'])
+            self._store_stats_deltas.add_fks(store_id=store_id, delta=-counts['fk_count'])
+            self._null_fks(
+                relation_table_fields_qs=RelationTableField.objects.filter(
+                    field__relation_table_id=relation_table_id,
+                ).exclude(relation_table_id=relation_table_id),
+            )
+            RelationTable.objects.filter(id=relation_table_id).delete()
 
-    @staticmethod
-    def _execute_relation_table_field(operation: Operation) -> None:
-        project_name, store_name, relation_table_name, relation_table_field_name = operation.attrs['name'].split('.')
+        self._catalog_changes.append(
+            (_CHANGE_ACTIONS[operation.op_code], RELATION_TABLE_MODEL, full_relation_table_name, relation_table_id),
+        )
+        if operation.op_code == _DELETE_OPERATION:
+            self._record_child_deletes(
+                children=self.catalog_index.discard_relation_table(name=full_relation_table_name),
+            )
+
+    def _execute_relation_table_field(self, operation: Operation) -> None:
+        full_relation_table_field_name = operation.attrs['name']
+        relation_table_name, relation_table_field_name = full_relation_table_field_name.rsplit('.', 1)
         operation.attrs['name'] = relation_table_field_name
+        store_id = self.catalog_index.store_ids[relation_table_name.rsplit('.', 1)[0]]
         if operation.op_code == _CREATE_OPERATION:
-            operation.attrs['relation_table_id'] = RelationTable.objects.get(
-                name=relation_table_name,
-                store__name=store_name,
-                store__project__name=project_name,
-            ).id
+            operation.attrs['relation_table_id'] = self.catalog_index.relation_table_ids[relation_table_name]
             fk_field = operation.attrs.pop('field') if operation.attrs.get('field') else None
             if fk_field is not None:
-                fk_project_name, fk_store_name, fk_relation_table_name, fk_relation_table_field_name = fk_field.split(
-                    '.',
-                )
-                operation.attrs['field_id'] = RelationTableField.objects.get(
-                    name=fk_relation_table_field_name,
-                    relation_table__name=fk_relation_table_name,
-                    relation_table__store__name=fk_store_name,
-                    relation_table__store__project__name=fk_project_name,
-                ).id
-
-            RelationTableField.objects.create(**operation.attrs)
+                operation.attrs['field_id'] = self.catalog_index.relation_table_field_ids[fk_field]
+
+            relation_table_field_id = RelationTableField.objects.create(**operation.attrs).id
+            self.catalog_index.add_relation_table_field(
+                name=full_relation_table_field_name,
+                relation_table_field_id=relation_table_field_id,
+            )
+            self._store_stats_deltas.add_fields(store_id=store_id)
+            if fk_field is not None:
+                self._store_stats_deltas.add_fks(store_id=store_id)
         else:
+            relation_table_field_id = self.catalog_index.relation_table_field_ids[full_relation_table_field_name]
+            fk_field_id = RelationTableField.objects.filter(id=relation_table_field_id).values_list(
+                'field_id',
+                flat=True,
+            ).first()
+            self._store_stats_deltas.add_fields(store_id=store_id, delta=-1)
+            if fk_field_id is not None:
+                self._store_stats_deltas.add_fks(store_id=store_id, delta=-1)
+
+            self._null_fks(
+                relation_table_fields_qs=RelationTableField.objects.filter(field_id=relation_table_field_id).exclude(
+                    id=relation_table_field_id,
+                ),
+            )
+            RelationTableField.objects.filter(id=relation_table_field_id).delete()
+            self.catalog_index.discard_relation_table_field(name=full_relation_table_field_name)
+
+        self._catalog_changes.append(
+            (
+                _CHANGE_ACTIONS[operation.op_code],
+                RELATION_TABLE_FIELD_MODEL,
+                full_relation_table_field_name,
+                relation_table_field_id,
+            ),
+        )
+
+    def _execute_relation_table_field_updates(self, operations: list[Operation]) -> None:
+        field_ids = self.catalog_index.relation_table_field_ids
+        attrs_by_field_id: dict[int, dict] = {}
+        store_ids: dict[int, int] = {}
+        for operation in operations:
+            attrs = {key: value for key, value in operation.attrs.items() if key != 'name'}
+            if 'field' in attrs:
+                fk_field = attrs.pop('field')
+                attrs['field_id'] = field_ids[fk_field] if fk_field else None
+
+            attrs_by_field_id.setdefault(field_ids[operation.attrs['name']], {}).update(attrs)
+            store_ids[field_ids[operation.attrs['name']]] = self.catalog_index.store_ids[
+                operation.attrs['name'].rsplit('.', 2)[0]
+            ]
+            self._catalog_changes.append(
+                (
+                    CatalogChange.UPDATE_ACTION,
+                    RELATION_TABLE_FIELD_MODEL,
+                    operation.attrs['name'],
+                    field_ids[operation.attrs['name']],
+                ),
+            )
+
+        fk_field_ids = dict(
             RelationTableField.objects.filter(
-                relation_table__name=relation_table_name,
-                relation_table__store__name=store_name,
-                relation_table__store__project__name=project_name,
-            ).delete()
+                id__in=[field_id for field_id, attrs in attrs_by_field_id.items() if 'field_id' in attrs],
+            ).values_list('id', 'field_id')
+        )
+        for field_id, previous_fk_field_id in fk_field_ids.items():
+            fk_delta = (attrs_by_field_id[field_id]['field_id'] is not None) - (previous_fk_field_id is not None)
+            if fk_delta:
+                self._store_stats_deltas.add_fks(store_id=store_ids[field_id], delta=fk_delta)
+
+        fields_by_attr_names: dict[tuple[str, ...], list[RelationTableField]] = {}
+        for field_id, attrs in attrs_by_field_id.items():
+            fields_by_attr_names.setdefault(tuple(sorted(attrs)), []).append(RelationTableField(id=field_id, **attrs))
+
+        for attr_names, fields in fields_by_attr_names.items():
+            RelationTableField.objects.bulk_update(fields, fields=attr_names, batch_size=_BULK_BATCH_SIZE)
+
+    def _execute_operation(self, operation: Operation) -> None:
+        if operation.op_code == _UPDATE_OPERATION:
+            self._execute_relation_table_field_updates(operations=[operation])
+        elif operation.model == PROJECT_MODEL:
+            self._execute_project(operation=operation)
+        elif operation.model == RELATION_STORE_MODEL:
+            self._execute_relation_store(operation=operation)
+        elif operation.model == RELATION_TABLE_MODEL:
+            self._execute_relation_table(operation=operation)
+        elif operation.model == RELATION_TABLE_FIELD_MODEL:
+            self._execute_relation_table_field(operation=operation)
+
+    def _get_relation_table_field_create_rows(self, operations: list[Operation]) -> list[tuple]:
+        index = self.catalog_index
+        rows = []
+        for operation in operations:
+            relation_table_name, relation_table_field_name = operation.attrs['name'].rsplit('.', 1)
+            fk_field = operation.attrs.get('field')
+            rows.append(
+                (
+                    relation_table_field_name,
+                    operation.attrs['type'],
+                    operation.attrs.get('order') or 0,
+                    index.relation_table_field_ids[fk_field] if fk_field else None,
+                    index.relation_table_ids[relation_table_name],
+                )
+            )
+
+        return rows
+
+    @staticmethod
+    def _insert_relation_table_fields_unnest(rows: list[tuple]) -> list[int]:
+        quote_name = connection.ops.quote_name
+        name_column, relation_table_column = (
+            quote_name(RelationTableField._meta.get_field(field_name).column)
+            for field_name in ('name', 'relation_table')
+        )
+        columns = ', '.join(
+            quote_name(RelationTableField._meta.get_field(field_name).column)
+            for field_name in ('name', 'type', 'order', 'field', 'relation_table')
+        )
+        sql = (
+            f'INSERT INTO {quote_name(RelationTableField._meta.db_table)} ({columns}) '
+            f'SELECT {columns} FROM UNNEST(%s::varchar[], %s::varchar[], %s::integer[], %s::bigint[], %s::bigint[]) '
+            f'AS rows ({columns}) '
+            f'RETURNING {quote_name(RelationTableField._meta.pk.column)}, {relation_table_column}, {name_column}'
+        )
+        ids_by_name: dict[tuple[int, str], int] = {}
+        with connection.cursor() as cursor:
+            for start in range(0, len(rows), _UNNEST_BATCH_SIZE):
+                cursor.execute(sql, [list(column) for column in zip(*rows[start:start + _UNNEST_BATCH_SIZE])])
+                for field_id, relation_table_id, name in cursor.fetchall():
+                    ids_by_name[(relation_table_id, name)] = field_id
+
+        return [ids_by_name[(relation_table_id, name)] for name, _, _, _, relation_table_id in rows]
+
+    def _execute_relation_table_field_creates(self, operations: list[Operation]) -> None:
+        rows = self._get_relation_table_field_create_rows(operations=operations)
+        if connection.vendor == 'postgresql':
+            ids = self._insert_relation_table_fields_unnest(rows=rows)
+        else:
+            fields = [
+                RelationTableField(
+                    name=name,
+                    type=field_type,
+                    order=order,
+                    field_id=field_id,
+                    relation_table_id=relation_table_id,
+                )
+                for name, field_type, order, field_id, relation_table_id in rows
+            ]
+            if connection.features.can_return_rows_from_bulk_insert:
+                RelationTableField.objects.bulk_create(fields, batch_size=_BULK_BATCH_SIZE)
+            else:
+                for field in fields:
+                    field.save(force_insert=True)
+
+            ids = [field.id for field in fields]
+
+        for operation, row, field_id in zip(operations, rows, ids):
+            store_id = self.catalog_index.store_ids[operation.attrs['name'].rsplit('.', 2)[0]]
+            self._store_stats_deltas.add_fields(store_id=store_id)
+            if row[3] is not None:
+                self._store_stats_deltas.add_fks(store_id=store_id)
+
+            self.catalog_index.add_relation_table_field(name=operation.attrs['name'], relation_table_field_id=field_id)
+            self._catalog_changes.append(
+                (CatalogChange.CREATE_ACTION, RELATION_TABLE_FIELD_MODEL, operation.attrs['name'], field_id),
+            )
+
+    def _execute_batch(self, operations: list[Operation]) -> None:
+        with self._track(model=RELATION_TABLE_FIELD_MODEL, operations=len(operations)):
+            if operations[0].op_code == _CREATE_OPERATION:
+                self._execute_relation_table_field_creates(operations=operations)
+            else:
+                self._execute_relation_table_field_updates(operations=operations)
 
     def execute(self, operations: list[Operation]):
+        batch: list[Operation] = []
+        batch_field_names: set[str] = set()
         for operation in operations:
-            if operation.model == PROJECT_MODEL:
-                self._execute_project(operation=operation)
-            elif operation.model == RELATION_STORE_MODEL:
-                self._execute_relation_store(operation=operation)
-            elif operation.model == RELATION_TABLE_MODEL:
-                self._execute_relation_table(operation=operation)
-            elif operation.model == RELATION_TABLE_FIELD_MODEL:
-                self._execute_relation_table_field(operation=operation)
+            if batch and (
+                operation.op_code != batch[0].op_code
+                or operation.model != RELATION_TABLE_FIELD_MODEL
+                or operation.attrs.get('field') in batch_field_names
+            ):
+                self._execute_batch(operations=batch)
+                batch, batch_field_names = [], set()
+
+            if operation.model == RELATION_TABLE_FIELD_MODEL and operation.op_code != _DELETE_OPERATION:
+                batch.append(operation)
+                batch_field_names.add(operation.attrs['name'])
+                continue
+
+            with self._track(model=operation.model):
+                self._execute_operation(operation=operation)
+
+        if batch:
+            self._execute_batch(operations=batch)
@@ -27,7 +27,7 @@ class InstanceError(Exception):
 class Instance(ABC):
 
     @abstractmethod
-    def parse(self, row: list[str], attrs: dict) -> InstanceType:
+    def parse(self, row: list[str], attrs: dict, partial: bool = False) -> InstanceType:
         raise NotImplemented
 
     @abstractmethod
@@ -40,7 +40,7 @@ class ProjectInstance(Instance):
     def __init__(self):
         self._next_instance = StoresInstance()
 
-    def parse(self, row: list[str], attrs: dict) -> InstanceType:
+    def parse(self, row: list[str], attrs: dict, partial: bool = False) -> InstanceType:
         if len(row) == 1:
             if attrs:
                 raise InstanceError('project instance: attrs must be empty or null')
@@ -49,7 +49,7 @@ class ProjectInstance(Instance):
             return InstanceType(model=PROJECT_MODEL, attrs=attrs)
 
         if row[1] == 'stores':
-            return self._next_instance.parse(row=row, attrs=attrs)
+            return self._next_instance.parse(row=row, attrs=attrs, partial=partial)
 
         raise InstanceError('unexpected value at position 2')
 
@@ -62,9 +62,9 @@ class StoresInstance(Instance):
     def __init__(self):
         self._next_instance = RelationStoreTypeInstance()
 
-    def parse(self, row: list[str], attrs: dict) -> InstanceType:
+    def parse(self, row: list[str], attrs: dict, partial: bool = False) -> InstanceType:
         if len(row) > 2 and row[2] == 'relation':
-            return self._next_instance.parse(row=row, attrs=attrs)
+            return self._next_instance.parse(row=row, attrs=attrs, partial=partial)
 
         raise InstanceError('unexpected value at position 3')
 
@@ -77,11 +77,11 @@ class RelationStoreTypeInstance(Instance):
     def __init__(self):
         self._next_instance = RelationStoreInstance()
 
-    def parse(self, row: list[str], attrs: dict) -> InstanceType:
+    def parse(self, row: list[str], attrs: dict, partial: bool = False) -> InstanceType:
         if len(row) == 3:
             raise InstanceError('expected <store_name> at position 4')
 
-        return self._next_instance.parse(row=row, attrs=attrs)
+        return self._next_instance.parse(row=row, attrs=attrs, partial=partial)
 
     def tree(self):
         return {'relation': self._next_instance.tree()}
@@ -92,7 +92,7 @@ class RelationStoreInstance(Instance):
     def __init__(self):
         self._next_instance = RelationTableInstance()
 
-    def parse(self, row: list[str], attrs: dict) -> InstanceType:
+    def parse(self, row: list[str], attrs: dict, partial: bool = False) -> InstanceType:
         if len(row) == 4:
             if attrs:
                 raise InstanceError('relation_store instance: attrs must be empty or null')
@@ -101,7 +101,7 @@ class RelationStoreInstance(Instance):
             attrs['type'] = Store.RELATION_STORE
             return InstanceType(model=RELATION_STORE_MODEL, attrs=attrs)
 
-        return self._next_instance.parse(row=row, attrs=attrs)
+        return self._next_instance.parse(row=row, attrs=attrs, partial=partial)
 
     def tree(self):
         return {'<store_name>': self._next_instance.tree()}
@@ -112,12 +112,12 @@ class RelationTableInstance(Instance):
     def __init__(self):
         self._next_instance = RelationTableFieldInstance()
 
-    def parse(self, row: list[str], attrs: dict) -> InstanceType:
+    def parse(self, row: list[str], attrs: dict, partial: bool = False) -> InstanceType:
         if len(row) == 5:
             attrs['name'] = f'{row[0]}.{row[3]}.{row[4]}'
             return InstanceType(model=RELATION_TABLE_MODEL, attrs=attrs)
 
-        return self._next_instance.parse(row=row, attrs=attrs)
+        return self._next_instance.parse(row=row, attrs=attrs, partial=partial)
 
     def tree(self):
         return {'<relation_table_name>': self._next_instance.tree()}
@@ -131,31 +131,38 @@ class RelationTableFieldInstance(Instance):
         ('order', int, False, 'number'),
     )
 
-    def parse(self, row: list[str], attrs: dict) -> InstanceType:
+    def parse(self, row: list[str], attrs: dict, partial: bool = False) -> InstanceType:
         if len(row) > 6:
-            InstanceError('unexpected value at position 7')
+            raise InstanceError('unexpected value at position 7')
 
-        self._validate_attrs(attrs=attrs)
+        self._validate_attrs(attrs=attrs, partial=partial)
         attrs['name'] = f'{row[0]}.{row[3]}.{row[4]}.{row[5]}'
         return InstanceType(model=RELATION_TABLE_FIELD_MODEL, attrs=attrs)
 
-    def _validate_attrs(self, attrs: dict):
+    def _validate_attrs(self, attrs: dict, partial: bool = False):
+        if partial and not attrs:
+            raise InstanceError('relation_table_field instance: attrs must not be empty')
+
         checked_attrs: int = 0
         for attr_name, attr_type, required, type_repr in self._available_attrs:
             attr = attrs.get(attr_name)
-            if attr:
+            if attr is None and attr_name in attrs and attr_name != 'field':
+                raise InstanceError(f'relation_table_field instance: {attr_name} must not be null')
+
+            if attr is not None:
                 if not isinstance(attr, attr_type):
                     raise InstanceError(f'relation_table_field instance: {attr_name} must be {type_repr} type')
 
-                if attr_name == 'field' and len(attr.split('.')) != 4:
+                if attr_name == 'field' and attr and len(attr.split('.')) != 4:
                     raise InstanceError(
                         f'relation_table_field instance: expected field format '
                         f'<project_name>.<store_name>.<table_name>.<field_name>',
                     )
 
+            if attr_name in attrs:
                 checked_attrs += 1
 
-            if not attr and required:
+            if not attr and required and (attr_name in attrs or not partial):
                 raise InstanceError('relation_table_field instance: available_attrs (type, field?, order?)')
 
         if checked_attrs < len(attrs):
@@ -170,13 +177,13 @@ class InstanceTree:
     def __init__(self):
         self._first_instance = ProjectInstance()
 
-    def parse(self, row: str, attrs: Optional[dict] = None) -> InstanceType:
+    def parse(self, row: str, attrs: Optional[dict] = None, partial: bool = False) -> InstanceType:
         if not row:
             raise InstanceError('value is empty')
 
         row = row.split('.')
         attrs = attrs or {}
-        return self._first_instance.parse(row=row, attrs=attrs)
+        return self._first_instance.parse(row=row, attrs=attrs, partial=partial)
 
     def tree(self):
         return self._first_instance.tree()
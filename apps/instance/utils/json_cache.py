@@ -0,0 +1,47 @@
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Iterable, Optional
+import json
+import os
+
+from django.conf import settings
+
+from apps.instance.utils.metrics import FILE_IO_TIMING, timing
+
+
+class JsonFileCache:
+
+    def __init__(self, directory_setting: str):
+        self.directory_setting = directory_setting
+
+    @property
+    def directory(self) -> Path:
+        return getattr(settings, self.directory_setting)
+
+    def _get_file_path(self, key: str, version: str) -> Path:
+        return Path(self.directory, f'{key}.{version}.json')
+
+    def get(self, key: str, version: str) -> Optional[dict | list]:
+        try:
+            with timing(name=FILE_IO_TIMING), self._get_file_path(key=key, version=version).open() as json_file:
+                return json.load(json_file)
+        except FileNotFoundError:
+            return None
+
+    def set(self, key: str, version: str, data: dict | list) -> None:
+        full_file_path = self._get_file_path(key=key, version=version)
+        with timing(name=FILE_IO_TIMING):
+            with NamedTemporaryFile(mode='w', dir=self.directory, suffix='.tmp', delete=False) as json_file:
+                json.dump(data, json_file)
+
+            os.replace(json_file.name, full_file_path)
+            for file_path in self.directory.glob(f'{key}.*.json'):
+                if file_path != full_file_path:
+                    file_path.unlink(missing_ok=True)
+
+    def prune(self, keys: Iterable[str]) -> None:
+        keys = set(keys)
+        with timing(name=FILE_IO_TIMING):
+            for file_path in self.directory.glob('*.json'):
+                if file_path.name.split('.', 1)[0] not in keys:
+                    file_path.unlink(missing_ok=True)
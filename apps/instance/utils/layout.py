@@ -0,0 +1,170 @@
+from hashlib import blake2b
+from typing import Iterable, Optional
+
+from django.db.models import Count
+
+from apps.instance.models import RelationTable, RelationTableField
+from apps.instance.utils.graph import RelationTableGraphUtil
+from apps.instance.utils.json_cache import JsonFileCache
+
+
+_LAYOUT_VERSION = 1
+_CROSSING_SWEEPS = 8
+
+_NODE_WIDTH = 240
+_NODE_HEADER_HEIGHT = 40
+_NODE_ROW_HEIGHT = 28
+_LAYER_GAP = 120
+_NODE_GAP = 40
+
+layout_cache = JsonFileCache(directory_setting='RELATION_TABLE_LAYOUTS_DIR')
+
+
+class RelationTableLayoutUtil:
+
+    @staticmethod
+    def get_component(
+        graph: set[int],
+    ) -> tuple[dict[int, int], list[tuple[int, int, int]]]:
+        fields_counts = dict(
+            RelationTable.objects.filter(id__in=graph)
+            .annotate(fields_count=Count('relationtablefield'))
+            .values_list('id', 'fields_count')
+        )
+        relations = list(
+            RelationTableField.objects.filter(relation_table_id__in=graph, field__relation_table_id__in=graph)
+            .order_by('id')
+            .values_list('id', 'relation_table_id', 'field__relation_table_id')
+        )
+        return fields_counts, relations
+
+    @staticmethod
+    def make_schema_version(fields_counts: dict[int, int], relations: Iterable[tuple[int, int, int]]) -> str:
+        black_object = blake2b(digest_size=16)
+        black_object.update(str(_LAYOUT_VERSION).encode(encoding='utf-8'))
+        black_object.update(str(sorted(fields_counts.items())).encode(encoding='utf-8'))
+        black_object.update(str(sorted(relations)).encode(encoding='utf-8'))
+        return black_object.hexdigest()
+
+    @staticmethod
+    def _get_layers(nodes: list[int], relations: Iterable[tuple[int, int, int]]) -> dict[int, int]:
+        targets: dict[int, set[int]] = {node: set() for node in nodes}
+        for _, source_table_id, destination_table_id in relations:
+            if source_table_id != destination_table_id:
+                targets[source_table_id].add(destination_table_id)
+
+        # Reverse DFS back edges so that FK cycles do not block layering.
+        states: dict[int, int] = {}
+        for root in nodes:
+            if root in states:
+                continue
+
+            states[root] = 1
+            stack = [(root, iter(sorted(targets[root])))]
+            while stack:
+                node, children = stack[-1]
+                for child in children:
+                    child_state = states.get(child)
+                    if child_state is None:
+                        states[child] = 1
+                        stack.append((child, iter(sorted(targets[child]))))
+                        break
+
+                    if child_state == 1:
+                        targets[node].discard(child)
+                        targets[child].add(node)
+                else:
+                    states[node] = 2
+                    stack.pop()
+
+        sources: dict[int, set[int]] = {node: set() for node in nodes}
+        for node, node_targets in targets.items():
+            for target in node_targets:
+                sources[target].add(node)
+
+        layers = {}
+        pending = {node: len(node_targets) for node, node_targets in targets.items()}
+        ready = [node for node in nodes if not pending[node]]
+        while ready:
+            node = ready.pop()
+            layers[node] = max((layers[target] + 1 for target in targets[node]), default=0)
+            for source in sources[node]:
+                pending[source] -= 1
+                if not pending[source]:
+                    ready.append(source)
+
+        return layers
+
+    @staticmethod
+    def _order_layers(
+        layers: dict[int, int],
+        relations: Iterable[tuple[int, int, int]],
+    ) -> list[list[int]]:
+        ordered_layers: list[list[int]] = [[] for _ in range(max(layers.values(), default=-1) + 1)]
+        for node in sorted(layers):
+            ordered_layers[layers[node]].append(node)
+
+        neighbours: dict[int, set[int]] = {node: set() for node in layers}
+        for _, source_table_id, destination_table_id in relations:
+            if source_table_id != destination_table_id:
+                neighbours[source_table_id].add(destination_table_id)
+                neighbours[destination_table_id].add(source_table_id)
+
+        for sweep in range(_CROSSING_SWEEPS):
+            step = 1 if sweep % 2 == 0 else -1
+            layer_numbers = range(1, len(ordered_layers)) if step == 1 else range(len(ordered_layers) - 2, -1, -1)
+            for layer_number in layer_numbers:
+                fixed_layer = ordered_layers[layer_number - step]
+                positions = {node: position for position, node in enumerate(fixed_layer)}
+                barycenters = {}
+                for position, node in enumerate(ordered_layers[layer_number]):
+                    adjacent = [positions[neighbour] for neighbour in neighbours[node] if neighbour in positions]
+                    barycenters[node] = sum(adjacent) / len(adjacent) if adjacent else position
+
+                ordered_layers[layer_number].sort(key=barycenters.__getitem__)
+
+        return ordered_layers
+
+    @classmethod
+    def compute_layout(cls, fields_counts: dict[int, int], relations: list[tuple[int, int, int]]) -> dict:
+        layers = cls._get_layers(nodes=sorted(fields_counts), relations=relations)
+        ordered_layers = cls._order_layers(layers=layers, relations=relations)
+
+        heights = {
+            node: _NODE_HEADER_HEIGHT + _NODE_ROW_HEIGHT * fields_count for node, fields_count in fields_counts.items()
+        }
+        layer_heights = [
+            sum(heights[node] for node in layer) + _NODE_GAP * (len(layer) - 1) for layer in ordered_layers
+        ]
+        max_layer_height = max(layer_heights, default=0)
+
+        nodes = []
+        for layer_number, (layer, layer_height) in enumerate(zip(ordered_layers, layer_heights)):
+            y = (max_layer_height - layer_height) // 2
+            for node in layer:
+                nodes.append({'id': node, 'position': {'x': layer_number * (_NODE_WIDTH + _LAYER_GAP), 'y': y}})
+                y += heights[node] + _NODE_GAP
+
+        return {
+            'nodes': nodes,
+            'edges': [
+                {'id': field_id, 'source': source_table_id, 'target': destination_table_id}
+                for field_id, source_table_id, destination_table_id in relations
+            ],
+        }
+
+    @classmethod
+    def get_layout(cls, relation_table_id: int) -> Optional[dict]:
+        graph = RelationTableGraphUtil.get_graph(relation_table_id=relation_table_id)
+        if not graph:
+            return None
+
+        fields_counts, relations = cls.get_component(graph=graph)
+        schema_version = cls.make_schema_version(fields_counts=fields_counts, relations=relations)
+        graph_key = RelationTableGraphUtil.get_graph_key(graph=graph)
+        layout = layout_cache.get(key=graph_key, version=schema_version)
+        if layout is None:
+            layout = cls.compute_layout(fields_counts=fields_counts, relations=relations)
+            layout_cache.set(key=graph_key, version=schema_version, data=layout)
+
+        return layout
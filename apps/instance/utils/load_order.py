@@ -0,0 +1,134 @@
+from hashlib import blake2b
+from heapq import heapify, heappop, heappush
+from typing import Iterable, Optional
+
+from apps.instance.models import RelationTableField
+from apps.instance.utils.graph import RelationTableGraphUtil
+from apps.instance.utils.json_cache import JsonFileCache
+
+
+_LOAD_ORDER_VERSION = 1
+
+load_order_cache = JsonFileCache(directory_setting='RELATION_TABLE_LOAD_ORDERS_DIR')
+
+
+class RelationTableLoadOrderUtil:
+
+    @staticmethod
+    def get_relations(graph: set[int]) -> list[tuple[int, int, int]]:
+        return list(
+            RelationTableField.objects.filter(relation_table_id__in=graph, field__relation_table_id__in=graph)
+            .order_by('id')
+            .values_list('id', 'relation_table_id', 'field__relation_table_id')
+        )
+
+    @staticmethod
+    def make_schema_version(nodes: Iterable[int], relations: Iterable[tuple[int, int, int]]) -> str:
+        black_object = blake2b(digest_size=16)
+        black_object.update(str(_LOAD_ORDER_VERSION).encode(encoding='utf-8'))
+        black_object.update(str(sorted(nodes)).encode(encoding='utf-8'))
+        black_object.update(str(sorted(relations)).encode(encoding='utf-8'))
+        return black_object.hexdigest()
+
+    @staticmethod
+    def _get_components(nodes: list[int], targets: dict[int, list[int]]) -> dict[int, int]:
+        components: dict[int, int] = {}
+        indexes: dict[int, int] = {}
+        low_links: dict[int, int] = {}
+        component_stack: list[int] = []
+        on_stack: set[int] = set()
+        for root in nodes:
+            if root in indexes:
+                continue
+
+            indexes[root] = low_links[root] = len(indexes)
+            component_stack.append(root)
+            on_stack.add(root)
+            stack = [(root, iter(targets[root]))]
+            while stack:
+                node, children = stack[-1]
+                for child in children:
+                    if child not in indexes:
+                        indexes[child] = low_links[child] = len(indexes)
+                        component_stack.append(child)
+                        on_stack.add(child)
+                        stack.append((child, iter(targets[child])))
+                        break
+
+                    if child in on_stack:
+                        low_links[node] = min(low_links[node], indexes[child])
+                else:
+                    stack.pop()
+                    if stack:
+                        parent = stack[-1][0]
+                        low_links[parent] = min(low_links[parent], low_links[node])
+
+                    if low_links[node] == indexes[node]:
+                        component = node
+                        while True:
+                            member = component_stack.pop()
+                            on_stack.discard(member)
+                            components[member] = component
+                            if member == node:
+                                break
+
+        return components
+
+    @classmethod
+    def compute_load_order(cls, nodes: list[int], relations: list[tuple[int, int, int]]) -> dict:
+        targets: dict[int, list[int]] = {node: [] for node in nodes}
+        for _, source_table_id, destination_table_id in relations:
+            targets[source_table_id].append(destination_table_id)
+
+        components = cls._get_components(nodes=nodes, targets=targets)
+        members: dict[int, list[int]] = {}
+        for node in nodes:
+            members.setdefault(components[node], []).append(node)
+
+        component_sources: dict[int, set[int]] = {component: set() for component in members}
+        pending = dict.fromkeys(members, 0)
+        cyclic_components = set()
+        cyclic_fields = []
+        for field_id, source_table_id, destination_table_id in relations:
+            source_component, destination_component = components[source_table_id], components[destination_table_id]
+            if source_component == destination_component:
+                cyclic_components.add(source_component)
+                cyclic_fields.append(field_id)
+            elif source_component not in component_sources[destination_component]:
+                component_sources[destination_component].add(source_component)
+                pending[source_component] += 1
+
+        groups = []
+        ready = [(min(group), component) for component, group in members.items() if not pending[component]]
+        heapify(ready)
+        while ready:
+            _, component = heappop(ready)
+            groups.append(members[component])
+            for source_component in component_sources[component]:
+                pending[source_component] -= 1
+                if not pending[source_component]:
+                    heappush(ready, (min(members[source_component]), source_component))
+
+        return {
+            'order': [node for group in groups for node in group],
+            'groups': groups,
+            'cycles': [group for group in groups if components[group[0]] in cyclic_components],
+            'cyclic_fields': cyclic_fields,
+        }
+
+    @classmethod
+    def get_load_order(cls, relation_table_id: int) -> Optional[dict]:
+        graph = RelationTableGraphUtil.get_graph(relation_table_id=relation_table_id)
+        if not graph:
+            return None
+
+        nodes = sorted(graph)
+        relations = cls.get_relations(graph=graph)
+        schema_version = cls.make_schema_version(nodes=nodes, relations=relations)
+        graph_key = RelationTableGraphUtil.get_graph_key(graph=graph)
+        load_order = load_order_cache.get(key=graph_key, version=schema_version)
+        if load_order is None:
+            load_order = {'schema_version': schema_version, **cls.compute_load_order(nodes=nodes, relations=relations)}
+            load_order_cache.set(key=graph_key, version=schema_version, data=load_order)
+
+        return load_order
@@ -0,0 +1,131 @@
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from time import perf_counter
+from typing import Iterator, Optional
+
+
+SQL_TIMING = 'sql'
+SERIALIZATION_TIMING = 'serialization'
+RENDER_TIMING = 'render'
+FILE_IO_TIMING = 'file_io'
+
+_DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+class RequestTimings:
+
+    def __init__(self):
+        self.durations: dict[str, float] = {}
+        self.sql_queries: int = 0
+
+    def add(self, name: str, duration: float) -> None:
+        self.durations[name] = self.durations.get(name, 0.0) + duration
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_queries += 1
+            self.add(name=SQL_TIMING, duration=perf_counter() - started)
+
+    def server_timing(self, total: float) -> str:
+        entries = [f'total;dur={total * 1000:.3f}']
+        for name, duration in self.durations.items():
+            description = f';desc="{self.sql_queries} queries"' if name == SQL_TIMING else ''
+            entries.append(f'{name};dur={duration * 1000:.3f}{description}')
+
+        return ', '.join(entries)
+
+
+current_timings: ContextVar[Optional[RequestTimings]] = ContextVar('current_timings', default=None)
+
+
+@contextmanager
+def timing(name: str) -> Iterator[None]:
+    timings = current_timings.get()
+    if timings is None:
+        yield
+        return
+
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name=name, duration=perf_counter() - started)
+
+
+class Histogram:
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+
+    _metrics = (
+        ('docs_flow_request_duration_seconds', 'Request duration in seconds', _DURATION_BUCKETS),
+        ('docs_flow_sql_queries', 'SQL queries per request', _COUNT_BUCKETS),
+        ('docs_flow_sql_duration_seconds', 'SQL time per request in seconds', _DURATION_BUCKETS),
+        ('docs_flow_serialization_duration_seconds', 'Serialization time per request in seconds', _DURATION_BUCKETS),
+        ('docs_flow_render_duration_seconds', 'Response rendering time per request in seconds', _DURATION_BUCKETS),
+        ('docs_flow_file_io_duration_seconds', 'Stash and snapshot file I/O per request in seconds', _DURATION_BUCKETS),
+    )
+
+    def __init__(self):
+        self._lock = Lock()
+        self._histograms: dict[tuple[str, str], Histogram] = {}
+
+    def _observe(self, metric_name: str, buckets: tuple, view: str, value: float) -> None:
+        histogram = self._histograms.get((metric_name, view))
+        if histogram is None:
+            histogram = self._histograms.setdefault((metric_name, view), Histogram(buckets=buckets))
+
+        histogram.observe(value=value)
+
+    def observe(self, view: str, timings: RequestTimings, total: float) -> None:
+        values = (
+            total,
+            timings.sql_queries,
+            timings.durations.get(SQL_TIMING, 0.0),
+            timings.durations.get(SERIALIZATION_TIMING, 0.0),
+            timings.durations.get(RENDER_TIMING, 0.0),
+            timings.durations.get(FILE_IO_TIMING, 0.0),
+        )
+        with self._lock:
+            for (metric_name, _, buckets), value in zip(self._metrics, values):
+                self._observe(metric_name=metric_name, buckets=buckets, view=view, value=value)
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for metric_name, description, buckets in self._metrics:
+                lines.append(f'# HELP {metric_name} {description}')
+                lines.append(f'# TYPE {metric_name} histogram')
+                for (histogram_name, view), histogram in sorted(self._histograms.items()):
+                    if histogram_name != metric_name:
+                        continue
+
+                    cumulative_count = 0
+                    for bucket, count in zip((*buckets, '+Inf'), histogram.counts):
+                        cumulative_count += count
+                        lines.append(f'{metric_name}_bucket{{view="{view}",le="{bucket}"}} {cumulative_count}')
+
+                    lines.append(f'{metric_name}_sum{{view="{view}"}} {histogram.sum}')
+                    lines.append(f'{metric_name}_count{{view="{view}"}} {histogram.count}')
+
+        return '\n'.join(lines) + '\n'
+
+
+metrics_registry = MetricsRegistry()
@@ -0,0 +1,75 @@
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Callable, Iterator
+
+
+PARSE_PHASE = 'parse'
+CHECK_PHASE = 'check'
+EXECUTE_PHASE = 'execute'
+STREAM_PHASE = 'stream'
+
+
+class ModelStats:
+
+    def __init__(self):
+        self.operations: int = 0
+        self.duration: float = 0.0
+        self.queries: int = 0
+
+
+class PhaseStats:
+
+    def __init__(self, phase: str):
+        self.phase = phase
+        self.duration: float = 0.0
+        self.queries: int = 0
+        self.models: dict[str, ModelStats] = {}
+
+    @property
+    def operations(self) -> int:
+        return sum(model_stats.operations for model_stats in self.models.values())
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+    def add(self, model: str, operations: int = 1, duration: float = 0.0, queries: int = 0) -> None:
+        model_stats = self.models.setdefault(model, ModelStats())
+        model_stats.operations += operations
+        model_stats.duration += duration
+        model_stats.queries += queries
+
+    @contextmanager
+    def track(self, model: str, operations: int = 1) -> Iterator[None]:
+        started, queries = perf_counter(), self.queries
+        try:
+            yield
+        finally:
+            self.add(
+                model=model,
+                operations=operations,
+                duration=perf_counter() - started,
+                queries=self.queries - queries,
+            )
+
+
+class ProcessorHook:
+
+    def phase_finished(self, stats: PhaseStats) -> None:
+        pass
+
+
+class WriterProcessorHook(ProcessorHook):
+
+    def __init__(self, write: Callable[[str], None]):
+        self.write = write
+
+    def phase_finished(self, stats: PhaseStats) -> None:
+        self.write(
+            f'{stats.phase}: {stats.duration * 1000:.3f} ms, {stats.operations} operations, {stats.queries} queries',
+        )
+        for model, model_stats in stats.models.items():
+            self.write(
+                f'  {model}: {model_stats.duration * 1000:.3f} ms, {model_stats.operations} operations, '
+                f'{model_stats.queries} queries',
+            )
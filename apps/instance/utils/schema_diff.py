@@ -0,0 +1,164 @@
+from typing import Iterable, Optional
+
+from apps.instance.utils.catalog_index import CatalogIndex
+from apps.instance.utils.instance_processor import (
+    InstanceProcessor,
+    Operation,
+    OperationError,
+    _CREATE_OPERATION,
+    _DELETE_OPERATION,
+    _UPDATE_OPERATION,
+)
+from apps.instance.utils.instance_tree import (
+    InstanceError,
+    PROJECT_MODEL,
+    RELATION_STORE_MODEL,
+    RELATION_TABLE_MODEL,
+    RELATION_TABLE_FIELD_MODEL,
+)
+
+
+def make_instance_row(model: str, name: str) -> str:
+    parts = name.split('.')
+    if model == PROJECT_MODEL:
+        return name
+
+    return '.'.join([parts[0], 'stores', 'relation', *parts[1:]])
+
+
+class SchemaDiff:
+
+    def __init__(self, operations: Iterable[list[int, str, Optional[None | dict]]]):
+        self._project_names: list[str] = []
+        self._store_names: list[str] = []
+        self._relation_table_names: list[str] = []
+        self._relation_table_fields: dict[str, dict] = {}
+        self._rows: dict[str, list] = {}
+        self.errors: list[dict] = []
+        for order, op in enumerate(operations, start=1):
+            try:
+                operation = InstanceProcessor._parse_operation(order=order, op=self._copy_operation(op=op))
+            except InstanceError as e:
+                self.errors.append({'order': order, 'model': None, 'message': str(e), 'caused_by': None})
+                continue
+
+            self._add_operation(operation=operation)
+
+    @staticmethod
+    def _copy_operation(op: list[int, str, Optional[None | dict]]) -> list[int, str, Optional[None | dict]]:
+        # parsing writes the name into attrs, so well-formed attrs are copied and anything else is left
+        # for _parse_operation to reject
+        if isinstance(op, (list, tuple)) and len(op) == 3 and isinstance(op[2], dict):
+            return [op[0], op[1], dict(op[2]) or None]
+
+        return op
+
+    def _add_operation(self, operation: Operation) -> None:
+        if operation.op_code != _CREATE_OPERATION:
+            raise OperationError(operation=operation, message='schema diff accepts only create operations')
+
+        name = operation.attrs['name']
+        if operation.model == PROJECT_MODEL:
+            self._project_names.append(name)
+        elif operation.model == RELATION_STORE_MODEL:
+            self._store_names.append(name)
+        elif operation.model == RELATION_TABLE_MODEL:
+            self._relation_table_names.append(name)
+        elif operation.model == RELATION_TABLE_FIELD_MODEL:
+            self._relation_table_fields[name] = {
+                'type': operation.attrs['type'],
+                'order': operation.attrs.get('order') or 0,
+                'field': operation.attrs.get('field') or None,
+            }
+
+        self._rows[name] = [operation.op_code, make_instance_row(model=operation.model, name=name)]
+        attrs = {key: value for key, value in operation.attrs.items() if key != 'name'}
+        if operation.model == RELATION_STORE_MODEL:
+            attrs.pop('type')
+
+        if attrs:
+            self._rows[name].append(attrs)
+
+    def _get_scope_project_names(self) -> set[str]:
+        return {
+            name.split('.')[0]
+            for name in (
+                *self._project_names,
+                *self._store_names,
+                *self._relation_table_names,
+                *self._relation_table_fields,
+            )
+        }
+
+    def get_operations(self) -> list[list]:
+        index = CatalogIndex.load(project_names=self._get_scope_project_names(), with_field_attrs=True)
+        store_names = set(self._store_names)
+        relation_table_names = set(self._relation_table_names)
+
+        delete_relation_table_names = [
+            name
+            for name in index.relation_table_ids
+            if name.rsplit('.', 1)[0] in store_names and name not in relation_table_names
+        ]
+        changed_field_attrs = {
+            name: {
+                key: value
+                for key, value in attrs.items()
+                if index.relation_table_field_attrs[name][key] != value
+            }
+            for name, attrs in self._relation_table_fields.items()
+            if name in index.relation_table_field_attrs and index.relation_table_field_attrs[name] != attrs
+        }
+        delete_field_names = [
+            name
+            for name in index.relation_table_field_ids
+            if name.rsplit('.', 1)[0] in relation_table_names
+            and name not in self._relation_table_fields
+        ]
+
+        operations = [
+            [
+                _DELETE_OPERATION,
+                make_instance_row(model=RELATION_TABLE_FIELD_MODEL, name=name),
+                {'type': index.relation_table_field_attrs[name]['type']},
+            ]
+            for name in delete_field_names
+        ]
+        operations.extend(
+            [_DELETE_OPERATION, make_instance_row(model=RELATION_TABLE_MODEL, name=name)]
+            for name in delete_relation_table_names
+        )
+        operations.extend(self._rows[name] for name in self._project_names if name not in index.project_ids)
+        operations.extend(self._rows[name] for name in self._store_names if name not in index.store_ids)
+        operations.extend(
+            self._rows[name] for name in self._relation_table_names if name not in index.relation_table_ids
+        )
+
+        create_field_names = [
+            name
+            for name in self._relation_table_fields
+            if name not in index.relation_table_field_ids
+        ]
+        operations.extend(self._rows[name] for name in self._order_by_fk(field_names=create_field_names))
+        operations.extend(
+            [_UPDATE_OPERATION, make_instance_row(model=RELATION_TABLE_FIELD_MODEL, name=name), attrs]
+            for name, attrs in changed_field_attrs.items()
+        )
+        return operations
+
+    def _order_by_fk(self, field_names: list[str]) -> list[str]:
+        pending_names = set(field_names)
+        ordered_names: list[str] = []
+        while pending_names:
+            ready_names = [
+                name
+                for name in field_names
+                if name in pending_names and self._relation_table_fields[name]['field'] not in pending_names
+            ]
+            if not ready_names:
+                ready_names = [name for name in field_names if name in pending_names]
+
+            ordered_names.extend(ready_names)
+            pending_names.difference_update(ready_names)
+
+        return ordered_names
@@ -0,0 +1,215 @@
+from bisect import bisect_left
+from heapq import merge, nsmallest
+from threading import RLock
+from typing import Optional
+import re
+
+from apps.instance.models import CatalogChange
+from apps.instance.utils.catalog_changes import get_catalog_version
+from apps.instance.utils.catalog_index import CatalogIndex
+from apps.instance.utils.instance_tree import (
+    PROJECT_MODEL,
+    RELATION_STORE_MODEL,
+    RELATION_TABLE_MODEL,
+    RELATION_TABLE_FIELD_MODEL,
+)
+
+
+_TOKEN_SEPARATOR = re.compile(r'[^0-9a-z]+')
+
+_MAX_CANDIDATES = 2000
+_RUN_GROWTH = 2
+_REFRESH_LIMIT = 10000
+
+_MODEL_RANKS = {
+    RELATION_TABLE_MODEL: 0,
+    RELATION_TABLE_FIELD_MODEL: 1,
+    RELATION_STORE_MODEL: 2,
+    PROJECT_MODEL: 3,
+}
+
+
+class SearchIndex:
+
+    def __init__(self):
+        self._lock = RLock()
+        self._loaded = False
+        self._version = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        self._names: list[str] = []
+        self._models: list[str] = []
+        self._object_ids: list[int] = []
+        self._entry_ids: dict[str, int] = {}
+        self._deleted: set[int] = set()
+        self._runs: list[tuple[list[str], list[int]]] = []
+        self._pending: list[tuple[str, int]] = []
+
+    @staticmethod
+    def _make_tokens(name: str) -> set[str]:
+        segments = name.lower().rsplit('.', 2)
+        tokens = {segments[-1]}
+        tokens.update(token for token in _TOKEN_SEPARATOR.split(segments[-1]) if token)
+        if len(segments) > 1:
+            tokens.add(f'{segments[-2]}.{segments[-1]}')
+
+        return tokens
+
+    def _add(self, model: str, name: str, object_id: int) -> None:
+        entry = len(self._names)
+        self._names.append(name)
+        self._models.append(model)
+        self._object_ids.append(object_id)
+        previous_entry = self._entry_ids.get(name)
+        if previous_entry is not None:
+            self._deleted.add(previous_entry)
+
+        self._entry_ids[name] = entry
+        self._pending.extend((token, entry) for token in self._make_tokens(name=name))
+
+    def _discard(self, name: str) -> None:
+        entry = self._entry_ids.pop(name, None)
+        if entry is None:
+            return
+
+        self._deleted.add(entry)
+
+    def _merge(self) -> None:
+        # Sorted token runs shrink geometrically, so each token is merged O(log n) times and a
+        # refresh only pays for the small runs; the largest run is rewritten once the rest catch up
+        # or once deleted entries outnumber live ones.
+        self._pending.sort()
+        self._runs.append(([token for token, _ in self._pending], [entry for _, entry in self._pending]))
+        self._pending = []
+        compact = len(self._deleted) > len(self._entry_ids)
+        while len(self._runs) > 1 and (compact or len(self._runs[-2][0]) <= len(self._runs[-1][0]) * _RUN_GROWTH):
+            self._merge_last_runs()
+
+        if len(self._runs) == 1:
+            self._deleted = set()
+
+    def _merge_last_runs(self) -> None:
+        deleted = self._deleted
+        newer_tokens, newer_entries = self._runs.pop()
+        older_tokens, older_entries = self._runs.pop()
+        pairs = [
+            pair for pair in merge(zip(older_tokens, older_entries), zip(newer_tokens, newer_entries))
+            if pair[1] not in deleted
+        ]
+        self._runs.append(([token for token, _ in pairs], [entry for _, entry in pairs]))
+
+    def load(self) -> None:
+        version = get_catalog_version()
+        catalog_index = CatalogIndex.load()
+        with self._lock:
+            self._reset()
+            self._version = version
+            for model, ids in (
+                (PROJECT_MODEL, catalog_index.project_ids),
+                (RELATION_STORE_MODEL, catalog_index.store_ids),
+                (RELATION_TABLE_MODEL, catalog_index.relation_table_ids),
+                (RELATION_TABLE_FIELD_MODEL, catalog_index.relation_table_field_ids),
+            ):
+                for name, object_id in ids.items():
+                    self._add(model=model, name=name, object_id=object_id)
+
+            self._merge()
+            self._loaded = True
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._reset()
+            self._loaded = False
+
+    def refresh(self) -> None:
+        with self._lock:
+            if not self._loaded:
+                return
+
+            changes = list(
+                CatalogChange.objects.filter(
+                    version__gt=self._version,
+                    action__in=[CatalogChange.CREATE_ACTION, CatalogChange.DELETE_ACTION, CatalogChange.SYNC_ACTION],
+                )
+                .order_by('version')
+                .values_list('version', 'action', 'model', 'name', 'object_id')[:_REFRESH_LIMIT + 1]
+            )
+            if len(changes) > _REFRESH_LIMIT or any(change[1] == CatalogChange.SYNC_ACTION for change in changes):
+                self.load()
+                return
+
+            for version, action, model, name, object_id in changes:
+                if action == CatalogChange.CREATE_ACTION:
+                    self._add(model=model, name=name, object_id=object_id)
+                else:
+                    self._discard(name=name)
+
+                self._version = version
+
+            if self._pending or len(self._deleted) > len(self._entry_ids):
+                self._merge()
+
+    def _get_relation_table_id(self, entry: int) -> Optional[int]:
+        model = self._models[entry]
+        if model == RELATION_TABLE_MODEL:
+            return self._object_ids[entry]
+
+        if model == RELATION_TABLE_FIELD_MODEL:
+            relation_table_entry = self._entry_ids.get(self._names[entry].rsplit('.', 1)[0])
+            return self._object_ids[relation_table_entry] if relation_table_entry is not None else None
+
+        return None
+
+    def search(self, query: str, limit: int = 20) -> list[dict]:
+        segments = query.strip().lower().split('.')
+        head, term = '.'.join(segments[:-1]), segments[-1]
+        if not term:
+            return []
+
+        key = '.'.join(segments[-2:])
+
+        with self._lock:
+            if self._loaded:
+                self.refresh()
+            else:
+                self.load()
+
+            candidates = set()
+            for tokens, token_entries in self._runs:
+                position = bisect_left(tokens, key)
+                end = min(position + _MAX_CANDIDATES, len(tokens))
+                while position < end and tokens[position].startswith(key):
+                    candidates.add(token_entries[position])
+                    position += 1
+
+            candidates.difference_update(self._deleted)
+
+            ranked = []
+            for entry in candidates:
+                name = self._names[entry]
+                parent_name, _, segment = name.lower().rpartition('.')
+                if head and parent_name != head and not parent_name.endswith(f'.{head}'):
+                    continue
+
+                if segment == term:
+                    match_rank = 0
+                elif segment.startswith(term):
+                    match_rank = 1
+                else:
+                    match_rank = 2
+
+                ranked.append((match_rank, _MODEL_RANKS[self._models[entry]], len(name), name, entry))
+
+            return [
+                {
+                    'model': self._models[entry],
+                    'id': self._object_ids[entry],
+                    'name': name,
+                    'relation_table_id': self._get_relation_table_id(entry=entry),
+                }
+                for *_, name, entry in nsmallest(limit, ranked)
+            ]
+
+
+search_index = SearchIndex()
@@ -0,0 +1,296 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Optional
+
+import django
+from django.db import connection, connections, transaction
+
+from apps.instance.utils.catalog_index import CatalogIndex
+from apps.instance.utils.instance_processor import (
+    InstanceProcessor,
+    OperationError,
+    _DELETE_OPERATION,
+    _UPDATE_OPERATION,
+)
+from apps.instance.utils.instance_tree import PROJECT_MODEL, RELATION_TABLE_FIELD_MODEL, InstanceError
+
+
+def _get_project_name(name: str) -> str:
+    return name.split('.', 1)[0]
+
+
+def _get_store_name(name: str) -> str:
+    return '.'.join(name.split('.', 2)[:2])
+
+
+def _copy_operation(op: list) -> list:
+    return [op[0], op[1], dict(op[2])] if len(op) == 3 and op[2] else [op[0], op[1]]
+
+
+def _validate_shard(project_operations: list[list], orders: list[int], operations: list[list]) -> list[dict]:
+    project_names = {_get_project_name(op[1]) for op in operations}
+    processor = InstanceProcessor(catalog_index=CatalogIndex.load(project_names=project_names))
+    errors = processor.validate(operations=[*project_operations, *operations])
+    offset = len(project_operations)
+    return [
+        {
+            **error,
+            'order': orders[error['order'] - 1],
+            'caused_by': orders[error['caused_by'] - 1] if error['caused_by'] else None,
+        }
+        for error in errors
+        if error['order'] > offset
+    ]
+
+
+def _execute_shard(operations: list[list], project_names: set[str]) -> Optional[str]:
+    processor = InstanceProcessor(catalog_index=CatalogIndex.load(project_names=project_names))
+    try:
+        processor.process(operations=operations)
+    except (InstanceError, OperationError) as e:
+        return str(e)
+
+    return None
+
+
+class Shard:
+
+    def __init__(self):
+        self.project_names: set[str] = set()
+        self.store_names: set[str] = set()
+        self.orders: list[int] = []
+        self.operations: list[list] = []
+
+    def add(self, order: int, op: list) -> None:
+        self.orders.append(order)
+        self.operations.append(op)
+
+
+class ShardedImport:
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.project_operations: list[tuple[int, str, list]] = []
+        self.shards: list[Shard] = []
+        self.final_operations: list[tuple[int, list]] = []
+        self._created_relation_table_field_orders: dict[str, int] = {}
+
+    def _partition(self, operations: list[list]) -> bool:
+        self.project_operations, self.shards, self.final_operations = [], [], []
+        self._created_relation_table_field_orders = {}
+        parsed_operations = InstanceProcessor.parse(operations=[_copy_operation(op) for op in operations])
+
+        store_parents: dict[str, str] = {}
+
+        def _find(store_name: str) -> str:
+            root = store_parents.setdefault(store_name, store_name)
+            while root != store_parents[root]:
+                root = store_parents[root]
+
+            while store_name != root:
+                store_parents[store_name], store_name = root, store_parents[store_name]
+
+            return root
+
+        started_project_names = set()
+        for operation in parsed_operations:
+            project_name = _get_project_name(operation.attrs['name'])
+            if operation.model == PROJECT_MODEL:
+                if project_name in started_project_names:
+                    return False
+
+                continue
+
+            started_project_names.add(project_name)
+            store_root = _find(_get_store_name(operation.attrs['name']))
+            fk_field = operation.attrs.get('field')
+            if fk_field and _get_project_name(fk_field) == project_name:
+                fk_store_root = _find(_get_store_name(fk_field))
+                if fk_store_root != store_root:
+                    store_parents[fk_store_root] = store_root
+
+        shards: dict[str, Shard] = {}
+        for operation, op in zip(parsed_operations, operations):
+            name = operation.attrs['name']
+            project_name = _get_project_name(name)
+            if operation.model == PROJECT_MODEL:
+                self.project_operations.append((operation.order, project_name, op))
+                continue
+
+            store_name = _get_store_name(name)
+            shard = shards.setdefault(_find(store_name), Shard())
+            shard.project_names.add(project_name)
+            shard.store_names.add(store_name)
+            if operation.model != RELATION_TABLE_FIELD_MODEL or operation.op_code == _DELETE_OPERATION:
+                shard.add(order=operation.order, op=op)
+                continue
+
+            if operation.op_code != _UPDATE_OPERATION:
+                self._created_relation_table_field_orders[name] = operation.order
+
+            fk_field = operation.attrs.get('field')
+            if not fk_field or _get_project_name(fk_field) == project_name:
+                shard.add(order=operation.order, op=op)
+                continue
+
+            attrs = {attr_name: value for attr_name, value in op[2].items() if attr_name != 'field'}
+            if operation.op_code != _UPDATE_OPERATION or attrs:
+                shard.add(order=operation.order, op=[op[0], op[1], attrs])
+
+            self.final_operations.append((operation.order, [_UPDATE_OPERATION, op[1], {'field': fk_field}]))
+
+        self.shards = [shard for shard in shards.values() if shard.operations]
+        return True
+
+    def _is_parallel(self) -> bool:
+        return self.workers > 1 and len(self.shards) > 1 and connection.vendor == 'postgresql'
+
+    def _map(self, func: Callable, *iterables: Iterable) -> list:
+        if not self._is_parallel():
+            return list(map(func, *iterables))
+
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=django.setup) as executor:
+            return list(executor.map(func, *iterables))
+
+    def _get_shard_project_operations(self, shard: Shard) -> list[tuple[int, list]]:
+        return [
+            (order, _copy_operation(op))
+            for order, project_name, op in self.project_operations
+            if project_name in shard.project_names
+        ]
+
+    def _validate_final_operations(self, failed_orders: dict[int, int]) -> list[dict]:
+        errors = []
+        fk_fields = {}
+        for order, op in self.final_operations:
+            created_order = self._created_relation_table_field_orders.get(op[2]['field'])
+            if created_order is None:
+                fk_fields[order] = op[2]['field']
+            elif created_order in failed_orders:
+                errors.append(
+                    {
+                        'order': order,
+                        'model': RELATION_TABLE_FIELD_MODEL,
+                        'message': f'field with name {op[2]["field"]} not exists',
+                        'caused_by': failed_orders[created_order],
+                    },
+                )
+
+        if fk_fields:
+            catalog_index = CatalogIndex.load(project_names={_get_project_name(name) for name in fk_fields.values()})
+            errors.extend(
+                {
+                    'order': order,
+                    'model': RELATION_TABLE_FIELD_MODEL,
+                    'message': f'field with name {fk_field} not exists',
+                    'caused_by': None,
+                }
+                for order, fk_field in fk_fields.items()
+                if fk_field not in catalog_index.relation_table_field_ids
+            )
+
+        return errors
+
+    def validate(self, operations: Iterable[list[int, str, Optional[None | dict]]]) -> list[dict]:
+        operations = list(operations)
+        if not self._partition(operations=operations):
+            return InstanceProcessor().validate(operations=operations)
+
+        project_names = {project_name for _, project_name, _ in self.project_operations}
+        project_orders = [order for order, _, _ in self.project_operations]
+        errors = [
+            {
+                **error,
+                'order': project_orders[error['order'] - 1],
+                'caused_by': project_orders[error['caused_by'] - 1] if error['caused_by'] else None,
+            }
+            for error in InstanceProcessor(catalog_index=CatalogIndex.load(project_names=project_names)).validate(
+                operations=[_copy_operation(op) for _, _, op in self.project_operations],
+            )
+        ]
+        shard_project_operations = [self._get_shard_project_operations(shard=shard) for shard in self.shards]
+        for shard_errors in self._map(
+            _validate_shard,
+            [[op for _, op in project_operations] for project_operations in shard_project_operations],
+            [
+                [*(order for order, _ in project_operations), *shard.orders]
+                for project_operations, shard in zip(shard_project_operations, self.shards)
+            ],
+            [[_copy_operation(op) for op in shard.operations] for shard in self.shards],
+        ):
+            errors.extend(shard_errors)
+
+        failed_orders = {error['order']: error['caused_by'] or error['order'] for error in errors}
+        errors.extend(self._validate_final_operations(failed_orders=failed_orders))
+        return sorted(errors, key=lambda error: error['order'])
+
+    def process(self, operations: Iterable[list[int, str, Optional[None | dict]]]) -> None:
+        operations = list(operations)
+        errors = self.validate(operations=operations)
+        if errors:
+            error = errors[0]
+            raise InstanceError(
+                f'operation_order: {error["order"]}, model: {error["model"]}, message: {error["message"]}',
+            )
+
+        if not self.shards and not self.project_operations:
+            InstanceProcessor().process(operations=operations)
+            return
+
+        if self._is_parallel():
+            self._execute(parallel=True)
+            return
+
+        with transaction.atomic():
+            self._execute(parallel=False)
+
+    def _get_committed_messages(self, shard_errors: list[Optional[str]]) -> list[str]:
+        committed_project_names = sorted({project_name for _, project_name, _ in self.project_operations})
+        committed_store_names = sorted(
+            store_name
+            for shard, error in zip(self.shards, shard_errors)
+            if not error
+            for store_name in shard.store_names
+        )
+        return [
+            f'committed projects: {", ".join(committed_project_names) or "-"}',
+            f'committed stores: {", ".join(committed_store_names) or "-"}',
+        ]
+
+    def _execute(self, parallel: bool) -> None:
+        if self.project_operations:
+            project_names = {project_name for _, project_name, _ in self.project_operations}
+            InstanceProcessor(catalog_index=CatalogIndex.load(project_names=project_names)).process(
+                operations=[_copy_operation(op) for _, _, op in self.project_operations],
+            )
+
+        shard_errors = self._map(
+            _execute_shard,
+            [[_copy_operation(op) for op in shard.operations] for shard in self.shards],
+            [shard.project_names for shard in self.shards],
+        )
+        if any(shard_errors):
+            messages = [
+                f'stores {", ".join(sorted(shard.store_names))} failed: {error}'
+                for shard, error in zip(self.shards, shard_errors)
+                if error
+            ]
+            if parallel:
+                messages.extend(self._get_committed_messages(shard_errors=shard_errors))
+
+            raise InstanceError('; '.join(messages))
+
+        if not self.final_operations:
+            return
+
+        project_names = {_get_project_name(name) for _, op in self.final_operations for name in (op[1], op[2]['field'])}
+        try:
+            InstanceProcessor(catalog_index=CatalogIndex.load(project_names=project_names)).process(
+                operations=[op for _, op in self.final_operations],
+            )
+        except (InstanceError, OperationError) as e:
+            if not parallel:
+                raise
+
+            messages = [f'cross project fields failed: {e}', *self._get_committed_messages(shard_errors=shard_errors)]
+            raise InstanceError('; '.join(messages)) from None
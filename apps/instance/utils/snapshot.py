@@ -1,7 +1,143 @@
+from concurrent.futures import ThreadPoolExecutor
 from hashlib import blake2b
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Optional
+import json
+import os
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from apps.instance.models import RelationTableGraph, RelationTableGraphSnapshot
+from apps.instance.utils.metrics import FILE_IO_TIMING, timing
+
+
+_fsync_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='snapshot_fsync')
+
+_SNAPSHOT_FILES_LOCK_ID = 3601
 
 
 def make_snapshot_file_name(body) -> str:
     black_object = blake2b(digest_size=16)
     black_object.update(str(body).encode(encoding='utf-8'))
     return f'{black_object.hexdigest()}.json'
+
+
+def _fsync_file(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def save_snapshot_file(body: dict) -> Path:
+    full_file_path = Path(settings.RELATION_TABLE_SNAPSHOTS_DIR, make_snapshot_file_name(body=body))
+    if full_file_path.exists():
+        return full_file_path
+
+    with NamedTemporaryFile(
+        mode='w',
+        dir=settings.RELATION_TABLE_SNAPSHOTS_DIR,
+        suffix='.tmp',
+        delete=False,
+    ) as json_file:
+        json.dump(body, json_file)
+
+    os.replace(json_file.name, full_file_path)
+    _fsync_executor.submit(_fsync_file, full_file_path)
+    return full_file_path
+
+
+def _get_snapshot_file_path(snapshot_hash: str) -> Path:
+    return Path(settings.RELATION_TABLE_SNAPSHOTS_DIR, f'{snapshot_hash}.json')
+
+
+def _lock_snapshot_files() -> None:
+    # SQLite transactions begin IMMEDIATE, so they are already serialized.
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_xact_lock(%s)', [_SNAPSHOT_FILES_LOCK_ID])
+
+
+def delete_unreferenced_snapshot_files(hashes: Optional[set[str]] = None) -> None:
+    with transaction.atomic():
+        _lock_snapshot_files()
+        if hashes is None:
+            hashes = {file_path.stem for file_path in settings.RELATION_TABLE_SNAPSHOTS_DIR.glob('*.json')}
+            referenced_hashes = set(RelationTableGraphSnapshot.objects.values_list('hash', flat=True))
+            referenced_snapshots_qs = RelationTableGraph.objects.filter(snapshot__isnull=False)
+        else:
+            referenced_hashes = set(
+                RelationTableGraphSnapshot.objects.filter(hash__in=hashes).values_list('hash', flat=True),
+            )
+            referenced_snapshots_qs = RelationTableGraph.objects.filter(
+                snapshot__in=[str(_get_snapshot_file_path(snapshot_hash=snapshot_hash)) for snapshot_hash in hashes],
+            )
+
+        referenced_hashes.update(
+            Path(snapshot).stem for snapshot in referenced_snapshots_qs.values_list('snapshot', flat=True)
+        )
+        for snapshot_hash in hashes.difference(referenced_hashes):
+            _get_snapshot_file_path(snapshot_hash=snapshot_hash).unlink(missing_ok=True)
+
+
+def restore_snapshot_files(files: dict[str, bytes]) -> set[str]:
+    with transaction.atomic():
+        _lock_snapshot_files()
+        with timing(name=FILE_IO_TIMING):
+            for snapshot_hash, body in files.items():
+                full_file_path = _get_snapshot_file_path(snapshot_hash=snapshot_hash)
+                if full_file_path.exists():
+                    continue
+
+                with NamedTemporaryFile(
+                    mode='wb',
+                    dir=settings.RELATION_TABLE_SNAPSHOTS_DIR,
+                    suffix='.tmp',
+                    delete=False,
+                ) as json_file:
+                    json_file.write(body)
+
+                os.replace(json_file.name, full_file_path)
+
+            return {file_path.stem for file_path in settings.RELATION_TABLE_SNAPSHOTS_DIR.glob('*.json')}
+
+
+def _trim_snapshot_history(graph_id: int) -> None:
+    expired_snapshots = list(
+        RelationTableGraphSnapshot.objects.filter(graph_id=graph_id)
+        .order_by('-created_at', '-id')
+        .values_list('id', 'hash')[settings.RELATION_TABLE_SNAPSHOT_HISTORY_LIMIT:]
+    )
+    if not expired_snapshots:
+        return
+
+    RelationTableGraphSnapshot.objects.filter(id__in=[snapshot_id for snapshot_id, _ in expired_snapshots]).delete()
+    expired_hashes = {snapshot_hash for _, snapshot_hash in expired_snapshots}
+    transaction.on_commit(lambda: delete_unreferenced_snapshot_files(hashes=expired_hashes))
+
+
+def save_snapshot(graph_id: int, body: dict) -> None:
+    with transaction.atomic():
+        _lock_snapshot_files()
+        with timing(name=FILE_IO_TIMING):
+            full_file_path = save_snapshot_file(body=body)
+
+        attach_snapshot(graph_id=graph_id, full_file_path=full_file_path)
+
+
+def attach_snapshot(graph_id: int, full_file_path: Path) -> None:
+    with transaction.atomic():
+        _lock_snapshot_files()
+        RelationTableGraph.objects.filter(id=graph_id).update(snapshot=str(full_file_path))
+        last_hash = (
+            RelationTableGraphSnapshot.objects.filter(graph_id=graph_id)
+            .order_by('-created_at', '-id')
+            .values_list('hash', flat=True)
+            .first()
+        )
+        if last_hash != full_file_path.stem:
+            RelationTableGraphSnapshot.objects.create(graph_id=graph_id, hash=full_file_path.stem)
+            _trim_snapshot_history(graph_id=graph_id)
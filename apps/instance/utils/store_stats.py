@@ -0,0 +1,74 @@
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import Count, F
+
+from apps.instance.models import Store, StoreStats, RelationTable, RelationTableField
+
+
+_TABLES_COUNT = 0
+_FIELDS_COUNT = 1
+_FK_COUNT = 2
+
+_BULK_BATCH_SIZE = 1000
+
+
+class StoreStatsDeltas:
+
+    def __init__(self):
+        self._deltas: dict[int, list[int]] = {}
+
+    def _add(self, store_id: int, column: int, delta: int) -> None:
+        self._deltas.setdefault(store_id, [0, 0, 0])[column] += delta
+
+    def add_tables(self, store_id: int, delta: int = 1) -> None:
+        self._add(store_id=store_id, column=_TABLES_COUNT, delta=delta)
+
+    def add_fields(self, store_id: int, delta: int = 1) -> None:
+        self._add(store_id=store_id, column=_FIELDS_COUNT, delta=delta)
+
+    def add_fks(self, store_id: int, delta: int = 1) -> None:
+        self._add(store_id=store_id, column=_FK_COUNT, delta=delta)
+
+    def flush(self) -> None:
+        deltas, self._deltas = self._deltas, {}
+        stores_by_deltas: dict[tuple[int, ...], list[int]] = {}
+        for store_id, store_deltas in deltas.items():
+            if any(store_deltas):
+                stores_by_deltas.setdefault(tuple(store_deltas), []).append(store_id)
+
+        for (tables_delta, fields_delta, fk_delta), store_ids in stores_by_deltas.items():
+            StoreStats.objects.filter(store_id__in=store_ids).update(
+                tables_count=F('tables_count') + tables_delta,
+                fields_count=F('fields_count') + fields_delta,
+                fk_count=F('fk_count') + fk_delta,
+            )
+
+
+def recompute_store_stats(graphs: Iterable[Iterable[int]]) -> None:
+    stats = {store_id: StoreStats(store_id=store_id) for store_id in Store.objects.values_list('id', flat=True)}
+    store_ids = dict(RelationTable.objects.values_list('id', 'store_id'))
+    for store_id, tables_count in (
+        RelationTable.objects.values('store_id')
+        .annotate(tables_count=Count('id'))
+        .values_list('store_id', 'tables_count')
+    ):
+        stats[store_id].tables_count = tables_count
+
+    for store_id, fields_count, fk_count in (
+        RelationTableField.objects.values('relation_table__store_id')
+        .annotate(fields_count=Count('id'), fk_count=Count('field_id'))
+        .values_list('relation_table__store_id', 'fields_count', 'fk_count')
+    ):
+        stats[store_id].fields_count = fields_count
+        stats[store_id].fk_count = fk_count
+
+    for graph in graphs:
+        graph = list(graph)
+        for store_id in {store_ids[relation_table_id] for relation_table_id in graph if relation_table_id in store_ids}:
+            stats[store_id].components_count += 1
+            stats[store_id].largest_component_size = max(stats[store_id].largest_component_size, len(graph))
+
+    with transaction.atomic():
+        StoreStats.objects.all().delete()
+        StoreStats.objects.bulk_create(stats.values(), batch_size=_BULK_BATCH_SIZE)
@@ -0,0 +1,48 @@
+from typing import Iterable, Iterator
+import json
+
+
+JSON_STREAM = 'json'
+NDJSON_STREAM = 'ndjson'
+
+STREAM_CONTENT_TYPES = {
+    JSON_STREAM: 'application/json',
+    NDJSON_STREAM: 'application/x-ndjson',
+}
+
+_CHUNK_ROWS = 1000
+
+
+def iter_json_array(rows: Iterable[dict]) -> Iterator[str]:
+    separator = '['
+    chunk = []
+    for row in rows:
+        chunk.append(separator)
+        chunk.append(json.dumps(row))
+        separator = ','
+        if len(chunk) >= _CHUNK_ROWS * 2:
+            yield ''.join(chunk)
+            chunk = []
+
+    chunk.append('[]' if separator == '[' else ']')
+    yield ''.join(chunk)
+
+
+def iter_ndjson(rows: Iterable[dict]) -> Iterator[str]:
+    chunk = []
+    for row in rows:
+        chunk.append(json.dumps(row))
+        chunk.append('\n')
+        if len(chunk) >= _CHUNK_ROWS * 2:
+            yield ''.join(chunk)
+            chunk = []
+
+    if chunk:
+        yield ''.join(chunk)
+
+
+def iter_stream(rows: Iterable[dict], stream: str) -> Iterator[str]:
+    if stream == NDJSON_STREAM:
+        return iter_ndjson(rows=rows)
+
+    return iter_json_array(rows=rows)
@@ -0,0 +1,66 @@
+from time import perf_counter
+import logging
+
+from django.conf import settings
+from django.db import connection, connections
+
+from apps.instance.utils.graph import RelationTableGraphUtil
+from apps.instance.utils.graph_data import get_relation_table_graph_data
+from apps.instance.utils.layout import RelationTableLayoutUtil
+from apps.instance.utils.search_index import search_index
+
+
+logger = logging.getLogger(__name__)
+
+
+class WarmStart:
+
+    def __init__(self, time_budget: float):
+        self.time_budget = time_budget
+        self.report: dict = {'graphs': 0, 'search_index': False, 'layouts': 0, 'graph_responses': 0, 'exhausted': False}
+
+    def _remaining(self) -> float:
+        return self.time_budget - (perf_counter() - self._started)
+
+    def run(self) -> dict:
+        self._started = perf_counter()
+        connection.ensure_connection()
+
+        graphs = []
+        if settings.STASH_FILE_PATH.exists():
+            graphs = RelationTableGraphUtil.get_graphs()
+            self.report['graphs'] = len(graphs)
+
+        if self._remaining() > 0:
+            search_index.load()
+            self.report['search_index'] = True
+
+        for graph in sorted(graphs, key=len, reverse=True):
+            if self._remaining() <= 0:
+                break
+
+            RelationTableLayoutUtil.get_layout(relation_table_id=min(graph))
+            self.report['layouts'] += 1
+            if self._remaining() <= 0:
+                break
+
+            get_relation_table_graph_data(graph=graph)
+            self.report['graph_responses'] += 1
+
+        self.report['exhausted'] = self._remaining() <= 0
+        self.report['duration'] = round(perf_counter() - self._started, 3)
+        return self.report
+
+
+def warm_start_on_boot() -> None:
+    if not settings.WARM_START_ON_BOOT:
+        return
+
+    try:
+        report = WarmStart(time_budget=settings.WARM_START_TIME_BUDGET).run()
+    except Exception:
+        logger.exception('warm start failed')
+    else:
+        logger.info('warm start finished: %s', report)
+    finally:
+        connections.close_all()
@@ -3,6 +3,7 @@ import json
 
 from django.conf import settings
 from django.db.models import F
+from django.http import HttpResponse, StreamingHttpResponse
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.status import (
@@ -11,20 +12,52 @@ from rest_framework.status import (
     HTTP_204_NO_CONTENT,
     HTTP_400_BAD_REQUEST,
     HTTP_404_NOT_FOUND,
+    HTTP_409_CONFLICT,
 )
 
-from apps.instance.models import Project, Store, RelationTable, RelationTableField
+from apps.instance.models import (
+    CatalogChange,
+    Project,
+    Store,
+    StoreStats,
+    RelationTable,
+    RelationTableGraphSnapshot,
+)
 from apps.instance.serializers import (
     ProjectsListAPIResponseSerializer,
     StoresListAPIResponseSerializer,
+    StoreStatsListAPIResponseSerializer,
     RelationTablesListAPIResponseSerializer,
+    RelationTableGraphAPIRequestSerializer,
     RelationTableGraphAPIResponseSerializer,
+    RelationTableGraphsAPIRequestSerializer,
+    RelationTableGraphsAPIResponseSerializer,
     RelationTableSaveSnapshotAPIRequestSerializer,
+    RelationTableSnapshotsListAPIResponseSerializer,
+    SearchAPIRequestSerializer,
+    ChangesAPIRequestSerializer,
+    ChangesAPIResponseSerializer,
+    SearchAPIResponseSerializer,
+    OperationsValidateAPIRequestSerializer,
+    OperationsValidateAPIResponseSerializer,
 )
+from apps.instance.utils.catalog_changes import record_catalog_changes
 from apps.instance.utils.graph import RelationTableGraphUtil
-from apps.instance.utils.snapshot import make_snapshot_file_name
+from apps.instance.utils.graph_data import (
+    get_relation_table_fields_qs,
+    get_relation_table_graph_data,
+    relation_table_graph_cache,
+)
+from apps.instance.utils.layout import RelationTableLayoutUtil, layout_cache
+from apps.instance.utils.load_order import RelationTableLoadOrderUtil, load_order_cache
+from apps.instance.utils.metrics import FILE_IO_TIMING, SERIALIZATION_TIMING, metrics_registry, timing
+from apps.instance.utils.search_index import search_index
+from apps.instance.utils.streaming import STREAM_CONTENT_TYPES, iter_stream
+from apps.instance.utils.snapshot import attach_snapshot, delete_unreferenced_snapshot_files, save_snapshot
+from apps.instance.utils.store_stats import recompute_store_stats
 from apps.instance.utils.instance_tree import InstanceError
 from apps.instance.utils.instance_processor import InstanceProcessor, OperationError
+from apps.instance.utils.schema_diff import SchemaDiff
 
 
 class ProjectsListAPI(APIView):
@@ -32,8 +65,11 @@ class ProjectsListAPI(APIView):
     response_serializer = ProjectsListAPIResponseSerializer
 
     def get(self, request):
-        projects_qs = Project.objects.all()
-        return Response(status=HTTP_200_OK, data=self.response_serializer(instance=projects_qs, many=True).data)
+        projects = list(Project.objects.all())
+        with timing(name=SERIALIZATION_TIMING):
+            data = self.response_serializer(instance=projects, many=True).data
+
+        return Response(status=HTTP_200_OK, data=data)
 
 
 class StoresListAPI(APIView):
@@ -41,8 +77,25 @@ class StoresListAPI(APIView):
     response_serializer = StoresListAPIResponseSerializer
 
     def get(self, request, project_id: int):
-        stores_qs = Store.objects.filter(project_id=project_id)
-        return Response(status=HTTP_200_OK, data=self.response_serializer(instance=stores_qs, many=True).data)
+        stores = list(Store.objects.filter(project_id=project_id))
+        with timing(name=SERIALIZATION_TIMING):
+            data = self.response_serializer(instance=stores, many=True).data
+
+        return Response(status=HTTP_200_OK, data=data)
+
+
+class StoreStatsListAPI(APIView):
+
+    response_serializer = StoreStatsListAPIResponseSerializer
+
+    def get(self, request, project_id: int):
+        store_stats = list(
+            StoreStats.objects.filter(store__project_id=project_id).annotate(store_name=F('store__name')),
+        )
+        with timing(name=SERIALIZATION_TIMING):
+            data = self.response_serializer(instance=store_stats, many=True).data
+
+        return Response(status=HTTP_200_OK, data=data)
 
 
 class RelationTablesListAPI(APIView):
@@ -50,40 +103,97 @@ class RelationTablesListAPI(APIView):
     response_serializer = RelationTablesListAPIResponseSerializer
 
     def get(self, request, store_id: int):
-        relation_tables_qs = RelationTable.objects.filter(store_id=store_id)
-        return Response(status=HTTP_200_OK, data=self.response_serializer(instance=relation_tables_qs, many=True).data)
+        relation_tables = list(RelationTable.objects.filter(store_id=store_id))
+        with timing(name=SERIALIZATION_TIMING):
+            data = self.response_serializer(instance=relation_tables, many=True).data
+
+        return Response(status=HTTP_200_OK, data=data)
 
 
 class RelationTableGraphAPI(APIView):
 
+    request_serializer = RelationTableGraphAPIRequestSerializer
     response_serializer = RelationTableGraphAPIResponseSerializer
 
+    stream_chunk_size = 2000
+
     def get(self, request, relation_table_id: int):
+        serializer = self.request_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
         graph = RelationTableGraphUtil.get_graph(relation_table_id=relation_table_id)
-        relation_table_fields_qs = (
-            RelationTableField.objects.filter(relation_table_id__in=graph)
-            .annotate(
-                table_id=F('relation_table_id'),
-                table_name=F('relation_table__name'),
-                store_id=F('relation_table__store_id'),
-                store_name=F('relation_table__store__name'),
+        relation_table_fields_qs = get_relation_table_fields_qs(relation_table_ids=graph)
+        stream = serializer.validated_data.get('stream')
+        if stream:
+            rows = relation_table_fields_qs.values(*self.response_serializer().fields).iterator(
+                chunk_size=self.stream_chunk_size,
             )
-            .order_by('table_name', 'order')
-        )
-        return Response(
-            status=HTTP_200_OK,
-            data=self.response_serializer(instance=relation_table_fields_qs, many=True).data,
+            return StreamingHttpResponse(
+                iter_stream(rows=rows, stream=stream),
+                status=HTTP_200_OK,
+                content_type=STREAM_CONTENT_TYPES[stream],
+            )
+
+        return Response(status=HTTP_200_OK, data=get_relation_table_graph_data(graph=graph))
+
+
+class RelationTableGraphsAPI(APIView):
+
+    request_serializer = RelationTableGraphsAPIRequestSerializer
+    response_serializer = RelationTableGraphsAPIResponseSerializer
+
+    def get(self, request):
+        serializer = self.request_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        graphs = RelationTableGraphUtil.get_graphs_by_relation_table_ids(
+            relation_table_ids=serializer.validated_data['relation_table_ids'],
         )
+        graph_numbers = {
+            relation_table_id: graph_number
+            for graph_number, (_, graph) in enumerate(graphs)
+            for relation_table_id in graph
+        }
+        graphs_data = [
+            {'relation_table_ids': relation_table_ids, 'fields': []} for relation_table_ids, _ in graphs
+        ]
+        for relation_table_field in get_relation_table_fields_qs(relation_table_ids=graph_numbers):
+            graphs_data[graph_numbers[relation_table_field.table_id]]['fields'].append(relation_table_field)
+
+        with timing(name=SERIALIZATION_TIMING):
+            data = self.response_serializer(instance=graphs_data, many=True).data
+
+        return Response(status=HTTP_200_OK, data=data)
+
+
+class RelationTableLayoutAPI(APIView):
+
+    def get(self, request, relation_table_id: int):
+        layout = RelationTableLayoutUtil.get_layout(relation_table_id=relation_table_id)
+        if layout is None:
+            return Response(status=HTTP_404_NOT_FOUND)
+
+        return Response(status=HTTP_200_OK, data=layout)
+
+
+class RelationTableLoadOrderAPI(APIView):
+
+    def get(self, request, relation_table_id: int):
+        load_order = RelationTableLoadOrderUtil.get_load_order(relation_table_id=relation_table_id)
+        if load_order is None:
+            return Response(status=HTTP_404_NOT_FOUND)
+
+        return Response(status=HTTP_200_OK, data=load_order)
 
 
 class RelationTableLoadSnapshotAPI(APIView):
 
     def get(self, request, relation_table_id: int):
-        relation_table = RelationTable.objects.filter(id=relation_table_id).first()
-        if not relation_table or not relation_table.snapshot:
+        snapshot = (
+            RelationTable.objects.filter(id=relation_table_id).values_list('graph__snapshot', flat=True).first()
+        )
+        if not snapshot:
             return Response(status=HTTP_404_NOT_FOUND)
 
-        with open(relation_table.snapshot) as json_file:
+        with timing(name=FILE_IO_TIMING), open(snapshot) as json_file:
             snapshot_data = json.load(json_file)
 
         return Response(status=HTTP_200_OK, data=snapshot_data)
@@ -94,34 +204,174 @@ class RelationTableSaveSnapshotAPI(APIView):
     request_serializer = RelationTableSaveSnapshotAPIRequestSerializer
 
     def post(self, request, relation_table_id: int):
-        if not RelationTable.objects.filter(id=relation_table_id).exists():
+        relation_table = RelationTable.objects.filter(id=relation_table_id).values('graph_id').first()
+        if not relation_table:
             return Response(status=HTTP_404_NOT_FOUND)
 
+        if relation_table['graph_id'] is None:
+            return Response(status=HTTP_409_CONFLICT, data={'detail': 'relation table graph is not synced'})
+
         serializer = self.request_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        filename = make_snapshot_file_name(body=serializer.validated_data)
-        full_file_path = Path(settings.RELATION_TABLE_SNAPSHOTS_DIR, filename)
-        with full_file_path.open(mode='w') as json_file:
-            json.dump(serializer.validated_data, json_file)
+        save_snapshot(graph_id=relation_table['graph_id'], body=serializer.validated_data)
+        return Response(status=HTTP_204_NO_CONTENT)
 
-        graph = RelationTableGraphUtil.get_graph(relation_table_id=relation_table_id)
-        RelationTable.objects.filter(id__in=graph).update(snapshot=str(full_file_path))
+
+class RelationTableSnapshotsListAPI(APIView):
+
+    response_serializer = RelationTableSnapshotsListAPIResponseSerializer
+
+    def get(self, request, relation_table_id: int):
+        relation_table = (
+            RelationTable.objects.filter(id=relation_table_id).values('graph_id', 'graph__snapshot').first()
+        )
+        if not relation_table:
+            return Response(status=HTTP_404_NOT_FOUND)
+
+        current_hash = Path(relation_table['graph__snapshot']).stem if relation_table['graph__snapshot'] else None
+        snapshots = [
+            {
+                'id': snapshot_id,
+                'hash': snapshot_hash,
+                'created_at': created_at,
+                'is_current': snapshot_hash == current_hash,
+            }
+            for snapshot_id, snapshot_hash, created_at in RelationTableGraphSnapshot.objects.filter(
+                graph_id=relation_table['graph_id'],
+            )
+            .order_by('-created_at', '-id')
+            .values_list('id', 'hash', 'created_at')
+        ]
+        with timing(name=SERIALIZATION_TIMING):
+            data = self.response_serializer(instance=snapshots, many=True).data
+
+        return Response(status=HTTP_200_OK, data=data)
+
+
+class RelationTableSnapshotAPI(APIView):
+
+    @staticmethod
+    def _get_snapshot(relation_table_id: int, snapshot_id: int) -> RelationTableGraphSnapshot | None:
+        return RelationTableGraphSnapshot.objects.filter(
+            id=snapshot_id,
+            graph__relationtable__id=relation_table_id,
+        ).first()
+
+    def get(self, request, relation_table_id: int, snapshot_id: int):
+        snapshot = self._get_snapshot(relation_table_id=relation_table_id, snapshot_id=snapshot_id)
+        if not snapshot:
+            return Response(status=HTTP_404_NOT_FOUND)
+
+        with timing(name=FILE_IO_TIMING), open(snapshot.snapshot) as json_file:
+            snapshot_data = json.load(json_file)
+
+        return Response(status=HTTP_200_OK, data=snapshot_data)
+
+    def post(self, request, relation_table_id: int, snapshot_id: int):
+        snapshot = self._get_snapshot(relation_table_id=relation_table_id, snapshot_id=snapshot_id)
+        if not snapshot:
+            return Response(status=HTTP_404_NOT_FOUND)
+
+        attach_snapshot(graph_id=snapshot.graph_id, full_file_path=Path(snapshot.snapshot))
         return Response(status=HTTP_204_NO_CONTENT)
 
 
+class SearchAPI(APIView):
+
+    request_serializer = SearchAPIRequestSerializer
+    response_serializer = SearchAPIResponseSerializer
+
+    def get(self, request):
+        serializer = self.request_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        results = search_index.search(query=serializer.validated_data['q'], limit=serializer.validated_data['limit'])
+        with timing(name=SERIALIZATION_TIMING):
+            data = self.response_serializer(instance=results, many=True).data
+
+        return Response(status=HTTP_200_OK, data=data)
+
+
+class ChangesAPI(APIView):
+
+    request_serializer = ChangesAPIRequestSerializer
+    response_serializer = ChangesAPIResponseSerializer
+
+    def get(self, request):
+        serializer = self.request_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        since, limit = serializer.validated_data['since'], serializer.validated_data['limit']
+        changes = list(CatalogChange.objects.filter(version__gt=since).order_by('version')[:limit + 1])
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        with timing(name=SERIALIZATION_TIMING):
+            data = self.response_serializer(
+                instance={
+                    'version': changes[-1].version if changes else since,
+                    'has_more': has_more,
+                    'changes': changes,
+                },
+            ).data
+
+        return Response(status=HTTP_200_OK, data=data)
+
+
 class SyncAPI(APIView):
 
     def post(self, request):
-        RelationTable.objects.update(snapshot=None)
-        for snapshot_file in settings.RELATION_TABLE_SNAPSHOTS_DIR.iterdir():
-            snapshot_file.unlink(missing_ok=True)
-
-        with settings.STASH_FILE_PATH.open() as json_file:
+        with timing(name=FILE_IO_TIMING), settings.STASH_FILE_PATH.open() as json_file:
             data = json.load(json_file)
 
-        data['relation_table_graphs'] = [list(graph) for graph in RelationTableGraphUtil.get_actual_graphs()]
+        search_index.invalidate()
+        graphs = RelationTableGraphUtil.get_actual_graphs()
+        RelationTableGraphUtil.save_graphs(graphs=graphs)
+        with timing(name=FILE_IO_TIMING):
+            delete_unreferenced_snapshot_files()
+
+        graph_keys = {RelationTableGraphUtil.get_graph_key(graph=graph) for graph in graphs}
+        layout_cache.prune(keys=graph_keys)
+        relation_table_graph_cache.prune(keys=graph_keys)
+        load_order_cache.prune(keys=graph_keys)
+
+        recompute_store_stats(graphs=graphs)
+        data['relation_table_graphs'] = [list(graph) for graph in graphs]
         data['is_actual'] = True
-        with settings.STASH_FILE_PATH.open(mode='w') as json_file:
+        with timing(name=FILE_IO_TIMING), settings.STASH_FILE_PATH.open(mode='w') as json_file:
             json.dump(data, json_file)
 
+        record_catalog_changes(changes=[(CatalogChange.SYNC_ACTION, 'relation_table_graph', '', None)])
+
         return Response(status=HTTP_204_NO_CONTENT)
+
+
+class OperationsValidateAPI(APIView):
+
+    request_serializer = OperationsValidateAPIRequestSerializer
+    response_serializer = OperationsValidateAPIResponseSerializer
+
+    def post(self, request):
+        serializer = self.request_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        operations = serializer.validated_data['operations']
+        errors = None
+        if serializer.validated_data['sync']:
+            try:
+                schema_diff = SchemaDiff(operations=operations)
+                errors = schema_diff.errors or None
+                if errors is None:
+                    operations = schema_diff.get_operations()
+            except (InstanceError, OperationError) as e:
+                return Response(status=HTTP_400_BAD_REQUEST, data={'detail': str(e)})
+
+        if errors is None:
+            errors = InstanceProcessor().validate(operations=operations)
+
+        with timing(name=SERIALIZATION_TIMING):
+            data = self.response_serializer(instance={'errors': errors}).data
+
+        return Response(status=HTTP_200_OK, data=data)
+
+
+class MetricsAPI(APIView):
+
+    def get(self, request):
+        return HttpResponse(content=metrics_registry.render(), content_type='text/plain; version=0.0.4')
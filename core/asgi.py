@@ -5,3 +5,7 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
 application = get_asgi_application()
+
+from apps.instance.utils.warm_start import warm_start_on_boot  # noqa: E402
+
+warm_start_on_boot()
@@ -27,6 +27,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'apps.instance.middleware.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -57,12 +58,47 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'core.wsgi.application'
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+DB_ENGINE = os.getenv('DB_ENGINE') or 'sqlite3'
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('DB_NAME'),
+            'USER': os.getenv('DB_USER'),
+            'PASSWORD': os.getenv('DB_PASSWORD'),
+            'HOST': os.getenv('DB_HOST') or 'localhost',
+            'PORT': os.getenv('DB_PORT') or '5432',
+            'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE') or 60),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {},
+        }
+    }
+    if os.getenv('DB_POOL') in ('True', 'true', '1', 'on', 'yes'):
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE') or 2),
+            'max_size': int(os.getenv('DB_POOL_MAX_SIZE') or 10),
+            'timeout': int(os.getenv('DB_POOL_TIMEOUT') or 30),
+        }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv('DB_NAME') or BASE_DIR / 'db.sqlite3',
+            'OPTIONS': {
+                'timeout': 20,
+                'transaction_mode': 'IMMEDIATE',
+                'init_command': (
+                    'PRAGMA journal_mode=WAL;'
+                    'PRAGMA synchronous=NORMAL;'
+                    'PRAGMA cache_size=-64000;'
+                    'PRAGMA temp_store=MEMORY;'
+                    'PRAGMA mmap_size=268435456'
+                ),
+            },
+        }
     }
-}
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -101,4 +137,19 @@ Path(MEDIA_ROOT, 'snapshots')
 RELATION_TABLE_SNAPSHOTS_DIR = Path(MEDIA_ROOT, 'relation_table')
 RELATION_TABLE_SNAPSHOTS_DIR.mkdir(exist_ok=True)
 
+RELATION_TABLE_LAYOUTS_DIR = Path(MEDIA_ROOT, 'relation_table_layout')
+RELATION_TABLE_LAYOUTS_DIR.mkdir(exist_ok=True)
+
+RELATION_TABLE_LOAD_ORDERS_DIR = Path(MEDIA_ROOT, 'relation_table_load_order')
+RELATION_TABLE_LOAD_ORDERS_DIR.mkdir(exist_ok=True)
+
+RELATION_TABLE_GRAPHS_DIR = Path(MEDIA_ROOT, 'relation_table_graph')
+RELATION_TABLE_GRAPHS_DIR.mkdir(exist_ok=True)
+
+RELATION_TABLE_SNAPSHOT_HISTORY_LIMIT = int(os.getenv('RELATION_TABLE_SNAPSHOT_HISTORY_LIMIT') or 20)
+
 STASH_FILE_PATH = Path(BASE_DIR, 'stash.json')
+
+WARM_START_ON_BOOT = os.getenv('WARM_START_ON_BOOT') in ('True', 'true', '1', 'on', 'yes')
+
+WARM_START_TIME_BUDGET = float(os.getenv('WARM_START_TIME_BUDGET') or 10)
@@ -5,3 +5,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
 application = get_wsgi_application()
+
+from apps.instance.utils.warm_start import warm_start_on_boot  # noqa: E402
+
+warm_start_on_boot()
@@ -1,3 +1,7 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, Optional
+
+import django
 from django.apps import apps
 from django.db import connection
 from django.db.models import Model, Field
@@ -5,20 +9,55 @@ from django.db.models.fields.related import ForeignKey, OneToOneField, ManyToMan
 from django.db.models.fields.reverse_related import ForeignObjectRel, OneToOneRel, ManyToOneRel, ManyToManyRel
 
 
-def parse_django_models(project_name: str, store_name: str) -> list:
-    store_row = f'{project_name}.stores.relation.{store_name}'
-    operations = [
-        [1, project_name],
-        [1, store_row],
-    ]
+_DB_TYPE_IGNORED_KWARGS = (
+    'verbose_name',
+    'help_text',
+    'default',
+    'db_default',
+    'blank',
+    'null',
+    'editable',
+    'choices',
+    'validators',
+    'error_messages',
+    'db_comment',
+    'db_column',
+    'db_index',
+    'unique',
+    'primary_key',
+    'related_name',
+    'related_query_name',
+    'on_delete',
+    'db_constraint',
+)
+
+_db_type_cache: dict[tuple, str] = {}
+
+
+def get_field_db_type(field: Field) -> str:
+    _, _, args, kwargs = field.deconstruct()
+    cache_key = (
+        field.__class__,
+        repr(args),
+        repr(sorted((key, value) for key, value in kwargs.items() if key not in _DB_TYPE_IGNORED_KWARGS)),
+    )
+    if cache_key not in _db_type_cache:
+        _db_type_cache[cache_key] = field.db_type(connection)
+
+    return _db_type_cache[cache_key]
+
+
+def get_ordered_models() -> list[tuple[type[Model], bool]]:
+    ordered_models: list[tuple[type[Model], bool]] = []
     parsed_models: set[str] = set()
     m2m_model_names = set()
     m2m_models = []
 
-    def _parse_model(django_model: Model, is_m2m_model: bool = False):
+    def _walk_model(django_model: type[Model], is_m2m_model: bool = False):
         if django_model.__name__ in parsed_models:
             return
 
+        parsed_models.add(django_model.__name__)
         for field in django_model._meta.get_fields():
             field: Field
             if (
@@ -27,40 +66,141 @@ def parse_django_models(project_name: str, store_name: str) -> list:
                 and field.related_model.__name__ not in parsed_models
                 and not is_m2m_model
             ):
-                _parse_model(django_model=field.related_model)
+                _walk_model(django_model=field.related_model)
+
+        ordered_models.append((django_model, is_m2m_model))
+        if is_m2m_model:
+            return
 
-        operations.append([1, f'{store_row}.{django_model.__name__}'])
         for field in django_model._meta.get_fields():
-            field: Field
-            if isinstance(field, (ForeignObjectRel, OneToOneRel, ManyToOneRel, ManyToManyRel)):
-                continue
-            elif isinstance(field, (ForeignKey, OneToOneField)):
-                related_field_row = (
-                    f'{project_name}.{store_name}.{field.related_model.__name__}.{field.target_field.attname}'
-                )
-                operations.append(
-                    [
-                        1,
-                        f'{store_row}.{django_model.__name__}.{field.attname}',
-                        {'type': field.db_type(connection), 'field': related_field_row},
-                    ]
-                )
-            elif isinstance(field, ManyToManyField) and not is_m2m_model:
+            if isinstance(field, ManyToManyField):
                 through_model = field.remote_field.through
                 if through_model.__name__ not in m2m_model_names:
                     m2m_model_names.add(through_model.__name__)
                     m2m_models.append(through_model)
-            else:
-                operations.append(
-                    [1, f'{store_row}.{django_model.__name__}.{field.attname}', {'type': field.db_type(connection)}]
-                )
-
-        parsed_models.add(django_model.__name__)
 
     for model in apps.get_models():
-        _parse_model(django_model=model)
+        _walk_model(django_model=model)
 
     for m2m_model in m2m_models:
-        _parse_model(django_model=m2m_model, is_m2m_model=True)
+        _walk_model(django_model=m2m_model, is_m2m_model=True)
+
+    return ordered_models
+
+
+def get_model_operations(project_name: str, store_name: str, django_model: type[Model], is_m2m_model: bool) -> list:
+    store_row = f'{project_name}.stores.relation.{store_name}'
+    operations = [[1, f'{store_row}.{django_model.__name__}']]
+    for field in django_model._meta.get_fields():
+        field: Field
+        if isinstance(field, (ForeignObjectRel, OneToOneRel, ManyToOneRel, ManyToManyRel)):
+            continue
+        elif isinstance(field, (ForeignKey, OneToOneField)):
+            related_field_row = (
+                f'{project_name}.{store_name}.{field.related_model.__name__}.{field.target_field.attname}'
+            )
+            operations.append(
+                [
+                    1,
+                    f'{store_row}.{django_model.__name__}.{field.attname}',
+                    {'type': get_field_db_type(field=field), 'field': related_field_row},
+                ]
+            )
+        elif isinstance(field, ManyToManyField) and not is_m2m_model:
+            continue
+        else:
+            operations.append(
+                [1, f'{store_row}.{django_model.__name__}.{field.attname}', {'type': get_field_db_type(field=field)}]
+            )
 
     return operations
+
+
+def _get_model_group_operations(project_name: str, store_name: str, model_group: list[tuple[str, bool]]) -> list:
+    operations = []
+    for model_label, is_m2m_model in model_group:
+        operations.extend(
+            get_model_operations(
+                project_name=project_name,
+                store_name=store_name,
+                django_model=apps.get_model(model_label),
+                is_m2m_model=is_m2m_model,
+            )
+        )
+
+    return operations
+
+
+def iter_django_models(
+    project_name: str,
+    store_name: str,
+    workers: Optional[int] = None,
+    group_size: int = 64,
+) -> Iterator[list]:
+    yield [1, project_name]
+    yield [1, f'{project_name}.stores.relation.{store_name}']
+
+    ordered_models = get_ordered_models()
+    if not workers or workers < 2:
+        for django_model, is_m2m_model in ordered_models:
+            yield from get_model_operations(
+                project_name=project_name,
+                store_name=store_name,
+                django_model=django_model,
+                is_m2m_model=is_m2m_model,
+            )
+
+        return
+
+    model_groups = [
+        [(django_model._meta.label, is_m2m_model) for django_model, is_m2m_model in ordered_models[i:i + group_size]]
+        for i in range(0, len(ordered_models), group_size)
+    ]
+    with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as executor:
+        group_operations = executor.map(
+            _get_model_group_operations,
+            [project_name] * len(model_groups),
+            [store_name] * len(model_groups),
+            model_groups,
+        )
+        for operations in group_operations:
+            yield from operations
+
+
+def parse_django_models(project_name: str, store_name: str, workers: Optional[int] = None) -> list:
+    return list(iter_django_models(project_name=project_name, store_name=store_name, workers=workers))
+
+
+def load_django_models(
+    project_name: str,
+    store_name: str,
+    workers: Optional[int] = None,
+    hooks: Optional[list] = None,
+) -> None:
+    from apps.instance.utils.instance_processor import InstanceProcessor
+
+    processor = InstanceProcessor(hooks=hooks)
+    processor.process_stream(
+        operations=iter_django_models(project_name=project_name, store_name=store_name, workers=workers),
+    )
+
+
+def sync_django_models(
+    project_name: str,
+    store_name: str,
+    workers: Optional[int] = None,
+    hooks: Optional[list] = None,
+) -> None:
+    from apps.instance.utils.instance_processor import InstanceProcessor
+    from apps.instance.utils.instance_tree import InstanceError
+    from apps.instance.utils.schema_diff import SchemaDiff
+
+    schema_diff = SchemaDiff(
+        operations=iter_django_models(project_name=project_name, store_name=store_name, workers=workers),
+    )
+    if schema_diff.errors:
+        error = schema_diff.errors[0]
+        raise InstanceError(f'operation_order: {error["order"]}, message: {error["message"]}')
+
+    processor = InstanceProcessor(hooks=hooks)
+    processor.process(operations=schema_diff.get_operations())